@@ -0,0 +1,65 @@
+"""
+Tiempo de exportación a TCL de OpenSees: escritura entidad a entidad frente
+a escritura por bloques (OpenSeesExporter.export_to_tcl con buffered=False/True).
+
+Crea una malla de N nodos con barras entre nodos consecutivos y shells de 4
+nodos, exporta con cada escritor (con y sin comentarios) y comprueba que los
+ficheros son idénticos byte a byte.
+
+Uso: python benchmarks/export_tcl.py [N]
+"""
+import filecmp
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.project import Project
+from core.export_opensees import OpenSeesExporter
+
+
+def build(n):
+    project = Project()
+    material = project.add_material("Acero", "steel")
+    section = project.add_section("IPE200", "I", material=material)
+    side = int(np.ceil(np.sqrt(n)))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), -1).reshape(-1, 2)[:n]
+    ids = project.add_nodes(grid * 0.5)
+    project.add_bars(np.column_stack([ids[:-1], ids[1:]]), section, material)
+    quads = np.column_stack([ids[:-side - 1], ids[1:-side], ids[side + 1:], ids[side:-1]])
+    project.add_shells(quads, material=material)
+    with project.batch():
+        for node in list(project.nodes)[:side]:
+            project.add_support(node)
+            project.add_nodal_load(node, fz=-1.0)
+    return project
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main(n=500_000):
+    project = build(n)
+    exporter = OpenSeesExporter(project)
+    entities = len(project.nodes) + len(project.bars) + len(project.shells)
+    print(f"{entities} entidades ({len(project.nodes)} nodos)")
+    print(f"{'comentarios':<12} {'entidad (s)':>12} {'bloques (s)':>12} {'x':>6} {'MB':>8}  idéntico")
+    with tempfile.TemporaryDirectory() as tmp:
+        slow, fast = os.path.join(tmp, "entidades.tcl"), os.path.join(tmp, "bloques.tcl")
+        for comments in (True, False):
+            t_slow = timed(lambda: exporter.export_to_tcl(slow, comments=comments, buffered=False))
+            t_fast = timed(lambda: exporter.export_to_tcl(fast, comments=comments, buffered=True))
+            same = filecmp.cmp(slow, fast, shallow=False)
+            size = os.path.getsize(fast) / 2 ** 20
+            print(f"{str(comments):<12} {t_slow:>12.2f} {t_fast:>12.2f} {t_slow / t_fast:>6.1f} {size:>8.1f}  {same}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,48 @@
+"""
+Memoria por entidad del modelo (bytes/entidad).
+
+Crea N entidades de cada tipo con las altas masivas del Project y mide con
+tracemalloc la memoria retenida en total (objetos, índices, conectividad
+inversa e historial) junto al tamaño de una instancia (sys.getsizeof).
+
+Uso: python benchmarks/memory_entities.py [N]
+"""
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.project import Project
+
+
+def measure(project, kind, count, fn):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    fn()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    sample = getattr(project, Project.COLLECTIONS[kind])[-1]
+    print(f"{kind:<12} {count:>9} {(after - before) / count:>10.1f} {sys.getsizeof(sample):>9}")
+
+
+def main(n=500_000):
+    project = Project()
+    side = int(np.ceil(np.sqrt(n)))
+    grid = np.stack(np.meshgrid(np.arange(side), np.arange(side)), -1).reshape(-1, 2)[:n]
+    print(f"{'entidad':<12} {'N':>9} {'bytes/ent':>10} {'objeto':>9}")
+    measure(project, "node", n, lambda: project.add_nodes(grid))
+    ids = project.nodes.ids.copy()
+    # Barras entre nodos consecutivos y shells de 4 nodos sobre la malla
+    measure(project, "bar", n - 1, lambda: project.add_bars(np.column_stack([ids[:-1], ids[1:]])))
+    quads = np.column_stack([ids[:-side - 1], ids[1:-side], ids[side + 1:], ids[side:-1]])
+    measure(project, "shell", len(quads), lambda: project.add_shells(quads))
+    with project.batch():
+        measure(project, "nodal_load", n, lambda: [project.add_nodal_load(node, fz=-1.0) for node in project.nodes])
+        measure(project, "support", n, lambda: [project.add_support(node) for node in project.nodes])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
@@ -0,0 +1,351 @@
+import json
+import os
+import queue
+import threading
+
+import numpy as np
+
+from model.binary_io import project_columns, write_columns, read_columns
+from model.json_stream import json_reference
+from model.serialization import to_dict, json_default
+
+
+AUTOSAVE_DIR = os.path.join(os.path.expanduser("~"), ".struktix", "autosave")
+
+
+def encode_delta(delta, reverse=False):
+    """
+    Operaciones de un Delta como listas serializables en JSON, con las entidades
+    por id. Con reverse=True se codifica la operación inversa (deshacer).
+    Las altas guardan el estado de la entidad en el momento de codificarlas.
+    """
+    ops = []
+    for op in (reversed(delta.ops) if reverse else delta.ops):
+        action, kind = op[0], op[1]
+        if reverse and action in ("add", "remove"):
+            action = "remove" if action == "add" else "add"
+        if action == "add":
+            ops.append(["add", kind, [to_dict(o) for o in op[2]]])
+        elif action == "remove":
+            ops.append(["remove", kind, [o.id for o in op[2]]])
+        elif action == "transform":
+            matrix = np.linalg.inv(op[3]) if reverse else op[3]
+            ops.append(["transform", kind, [n.id for n in op[2]], matrix.tolist()])
+        elif action == "coords":
+            ops.append(["coords", kind, [n.id for n in op[2]], (op[3] if reverse else op[4]).tolist()])
+        else:
+            ops.append(["set", kind, op[2].id, op[3], op[4] if reverse else op[5]])
+    return ops
+
+
+# Orden de dependencias para reañadir entidades: lo referenciado antes que lo que lo usa
+ADD_ORDER = {"node": 0, "material": 0, "section": 1, "bar": 2, "shell": 2, "solid": 2,
+             "nodal_load": 3, "bar_load": 3, "shell_load": 3, "support": 3}
+
+
+def _dependency_order(ops):
+    """
+    Reordena cada tramo de altas consecutivas según ADD_ORDER. Al deshacer un
+    borrado en cascada las altas llegan en orden inverso (barras antes que sus
+    nodos); altas de tipos distintos no dependen de su orden relativo salvo por
+    las referencias, así que basta con ordenarlas.
+    """
+    result, run = [], []
+    for op in ops:
+        if op[0] == "add":
+            run.append(op)
+            continue
+        result.extend(sorted(run, key=lambda o: ADD_ORDER.get(o[1], 0)))
+        run = []
+        result.append(op)
+    result.extend(sorted(run, key=lambda o: ADD_ORDER.get(o[1], 0)))
+    return result
+
+
+def apply_ops(project, ops):
+    """Aplica al proyecto operaciones codificadas con encode_delta (sin pasar por el historial)."""
+    for action, kind, *args in _dependency_order(ops):
+        index = project._index[kind]
+        if action == "add":
+            objs = [project._from_dict(kind, d) for d in args[0]]
+            for o in objs:
+                project._resolve_loaded(kind, o)
+            op = ("add", kind, objs)
+        elif action == "remove":
+            op = ("remove", kind, [index[i] for i in args[0] if i in index])
+        elif action == "transform":
+            op = ("transform", kind, [index[i] for i in args[0]], np.array(args[1], dtype=np.float64))
+        elif action == "coords":
+            op = ("coords", kind, [index[i] for i in args[0]], None,
+                  np.array(args[1], dtype=np.float64).reshape(-1, 3))
+        else:
+            id_, prop, value = args
+            if prop in ("material", "section"):
+                value = project._loaded_ref(prop, value)
+            else:
+                value = project._resolve_reference(prop, value)
+            op = ("set", kind, index[id_], prop, None, value)
+        project._apply([op])
+
+
+class Autosave:
+    """
+    Autoguardado incremental a prueba de cierres inesperados.
+    Cada cambio confirmado del proyecto (también deshacer y rehacer) se añade
+    como una línea a un diario en disco, de modo que su coste es proporcional
+    al tamaño de la edición. Cuando el diario supera max_journal_bytes, el
+    hilo de escritura lo compacta: carga el último punto de control en un
+    proyecto propio, le reaplica el diario y escribe el resultado como punto
+    de control nuevo, sin leer el proyecto de la interfaz. En el hilo de la
+    interfaz solo se codifican los cambios; la única copia completa del
+    modelo se hace al empezar la sesión y tras sustituirse el modelo (abrir
+    un fichero).
+    Tras un cierre inesperado, recover() carga el punto de control y reaplica
+    el diario. El fichero de bloqueo guarda el pid de la sesión: start() no
+    pisa el autoguardado de otro proceso vivo ni el de una sesión cerrada
+    mal cuya recuperación no se ha ofrecido todavía.
+    """
+
+    CHECKPOINT = "checkpoint.femb"
+    JOURNAL = "journal.jsonl"
+    LOCK = "autosave.lock"
+
+    def __init__(self, project, directory=AUTOSAVE_DIR, max_journal_bytes=64 * 1024 * 1024):
+        self.project = project
+        self.directory = directory
+        self.max_journal_bytes = max_journal_bytes  # Tamaño del diario que dispara su compactación
+        self.error = None                           # Última excepción del hilo de escritura
+        self._seq = 0
+        self._journal_bytes = 0
+        self._stale = False  # Modelo sustituido sin punto de control todavía
+        self._queue = queue.Queue()
+        self._thread = None
+        self._encode = json.JSONEncoder(separators=(",", ":"), default=json_reference).encode
+
+    @staticmethod
+    def _file(directory, name):
+        return os.path.join(directory, name)
+
+    def _path(self, name):
+        return self._file(self.directory, name)
+
+    # Ciclo de vida
+    def start(self, discard=False):
+        """
+        Empieza una sesión de autoguardado nueva con un punto de control inicial.
+        Lanza RuntimeError si el directorio lo usa otro proceso vivo, o si queda
+        el autoguardado de una sesión que no se cerró bien y no se ha pedido
+        descartarlo (discard=True, una vez ofrecida la recuperación).
+        """
+        owner = self.lock_owner(self.directory)
+        if owner is not None:
+            raise RuntimeError(f"El autoguardado de {self.directory} lo usa otro proceso (pid {owner})")
+        if self.needs_recovery(self.directory) and not discard:
+            raise RuntimeError(f"Hay un autoguardado sin recuperar en {self.directory}")
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(self.LOCK), "w") as f:
+            f.write(str(os.getpid()))
+        for name in (self.JOURNAL, self.CHECKPOINT):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+        self.checkpoint()
+        self.project.entities_changed.connect(self._on_changes)
+
+    def stop(self, discard=True):
+        """
+        Termina la sesión esperando a que se escriba lo pendiente. Con discard=True
+        (cierre normal) se borran el diario, el punto de control y el bloqueo.
+        """
+        if self._thread is None:
+            return
+        self.project.entities_changed.disconnect(self._on_changes)
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        if discard:
+            for name in (self.JOURNAL, self.CHECKPOINT, self.LOCK):
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
+
+    def flush(self):
+        """Espera a que el hilo haya escrito todo lo pendiente."""
+        self._queue.join()
+
+    # Hilo de la interfaz
+    def _on_changes(self, changes):
+        if changes.full:
+            # Modelo sustituido (p. ej. al abrir un fichero): el diario deja de servir.
+            # El punto de control se aplaza al primer cambio para no forzar la
+            # materialización de un proyecto abierto en modo perezoso.
+            self._stale = True
+            self._queue.put(("reset",))
+            return
+        if changes.delta is None:
+            return
+        self._seq += 1
+        if self._stale:
+            self.checkpoint()  # Ya incluye este cambio
+            return
+        line = self._encode({"seq": self._seq, "ops": encode_delta(changes.delta, changes.reverse)}) + "\n"
+        self._journal_bytes += len(line)
+        self._queue.put(("append", line))
+        if self._journal_bytes > self.max_journal_bytes:
+            self._queue.put(("compact",))
+            self._journal_bytes = 0
+
+    def checkpoint(self):
+        """
+        Encola un punto de control con una copia del estado actual del proyecto.
+        Recorre el modelo entero en el hilo que lo llama: durante la sesión las
+        compactaciones del diario lo sustituyen (ver _compact).
+        """
+        header, blocks = project_columns(self.project)
+        # Copias: el hilo escribe mientras el modelo sigue cambiando
+        blocks = {name: np.array(arr) for name, arr in blocks.items()}
+        header = json.loads(json.dumps(header, default=json_default))
+        header["journal_seq"] = self._seq
+        self._queue.put(("checkpoint", header, blocks))
+        self._stale = False
+        self._journal_bytes = 0
+
+    # Hilo de escritura
+    def _run(self):
+        journal = open(self._path(self.JOURNAL), "a", encoding="utf-8")
+        try:
+            while True:
+                # Agrupa lo pendiente en una sola sincronización con el disco
+                tasks = [self._queue.get()]
+                while True:
+                    try:
+                        tasks.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    for task in tasks:
+                        if task is None:
+                            return
+                        if task[0] == "append":
+                            journal.write(task[1])
+                        elif task[0] == "reset":
+                            journal.truncate(0)
+                            if os.path.exists(self._path(self.CHECKPOINT)):
+                                os.remove(self._path(self.CHECKPOINT))
+                        elif task[0] == "compact":
+                            journal.flush()
+                            if self.error is None and self._compact():
+                                journal.truncate(0)
+                        elif self.error is None:
+                            write_columns(self._path(self.CHECKPOINT), task[1], task[2])
+                            # Todo lo anotado hasta aquí ya está en el punto de control
+                            journal.truncate(0)
+                    journal.flush()
+                    os.fsync(journal.fileno())
+                except Exception as e:
+                    # Se conserva el último punto de control válido; el diario sigue creciendo
+                    self.error = e
+                finally:
+                    for _ in tasks:
+                        self._queue.task_done()
+        finally:
+            journal.close()
+
+    def _compact(self):
+        """
+        Nuevo punto de control = último punto de control + diario, calculado en
+        el hilo de escritura sobre un proyecto propio. Devuelve False si no hay
+        punto de control del que partir (el diario sigue creciendo).
+        """
+        if not os.path.exists(self._path(self.CHECKPOINT)):
+            return False
+        from model.project import Project
+        shadow = Project()
+        seq = self._replay(shadow, self.directory, background=True)[1]
+        header, blocks = project_columns(shadow)
+        header = json.loads(json.dumps(header, default=json_default))
+        header["journal_seq"] = seq
+        write_columns(self._path(self.CHECKPOINT), header, blocks)
+        return True
+
+    # Recuperación
+    @classmethod
+    def lock_owner(cls, directory=AUTOSAVE_DIR):
+        """Pid de otro proceso vivo que tiene el bloqueo del directorio, o None."""
+        try:
+            with open(cls._file(directory, cls.LOCK)) as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+        if pid == os.getpid():
+            return None
+        try:
+            os.kill(pid, 0)  # Solo comprueba que el proceso existe
+        except ProcessLookupError:
+            return None
+        except PermissionError:
+            pass  # Existe, pero es de otro usuario
+        except OSError:
+            return None
+        return pid
+
+    @classmethod
+    def needs_recovery(cls, directory=AUTOSAVE_DIR):
+        """True si quedó un autoguardado de una sesión que no se cerró correctamente (y no sigue viva)."""
+        journal = cls._file(directory, cls.JOURNAL)
+        return (os.path.exists(cls._file(directory, cls.LOCK)) and cls.lock_owner(directory) is None and
+                (os.path.exists(cls._file(directory, cls.CHECKPOINT)) or
+                 (os.path.exists(journal) and os.path.getsize(journal) > 0)))
+
+    @classmethod
+    def recover(cls, project, directory=AUTOSAVE_DIR):
+        """
+        Restaura en `project` el último punto de control y le reaplica el diario.
+        Devuelve el número de cambios del diario recuperados.
+        """
+        return cls._replay(project, directory)[0]
+
+    @classmethod
+    def _replay(cls, project, directory, background=False):
+        """
+        recover(); devuelve (cambios reaplicados, número de secuencia del último).
+        Con background=True (compactación en el hilo de escritura) no se usa
+        Project.load: desactiva el recolector de basura, que es global al
+        proceso, y avisa del cambio de modelo. Se leen las columnas y se
+        reconstruyen los índices directamente.
+        """
+        seq = 0
+        checkpoint = cls._file(directory, cls.CHECKPOINT)
+        if os.path.exists(checkpoint):
+            if background:
+                project._load_binary(checkpoint)
+                project._reindex()
+            else:
+                project.load(checkpoint)
+            # El punto de control se reescribirá: los nodos no pueden seguir mapeados desde él
+            project.nodes.own_buffers()
+            seq = read_columns(checkpoint)[0].get("journal_seq", 0)
+        count = 0
+        for record in cls._read_journal(cls._file(directory, cls.JOURNAL)):
+            if record["seq"] > seq:
+                apply_ops(project, record["ops"])
+                seq = record["seq"]
+                count += 1
+        if count:
+            if background:
+                project._reindex()
+            else:
+                project._reloaded()
+        return count, seq
+
+    @staticmethod
+    def _read_journal(path):
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return  # Última línea a medio escribir en el momento del cierre
+                yield record
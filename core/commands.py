@@ -1,12 +1,268 @@
-from struktix.core.undo_redo_manager import Command
+from core.undo_redo_manager import Command
 
-class AddNodeCommand(Command):
-    def __init__(self, project, node):
+
+class ProjectCommand(Command):
+    """
+    Comando que ejecuta una operación del proyecto en una sola transacción.
+    Su delta (lo añadido, eliminado o modificado; en transformaciones, la
+    matriz) queda como un paso del historial del proyecto, que es el único
+    historial y tiene tope de memoria (Project.history_max_bytes).
+    Las subclases implementan execute().
+    """
+    def __init__(self, project):
         self.project = project
-        self.node = node
+        self.delta = None
+        self.result = None
+
+    def execute(self):
+        raise NotImplementedError
 
     def do(self):
-        self.project.add_node(self.node)
+        history = self.project.history
+        if self.delta is not None:
+            if not self.project.future or self.project.future[-1] is not self.delta:
+                raise RuntimeError("Solo se puede rehacer el último paso deshecho del historial")
+            self.project.redo()
+            return
+        last = history[-1] if history else None
+        with self.project.batch():
+            self.result = self.execute()
+        history = self.project.history
+        if history and history[-1] is not last:
+            self.delta = history[-1]
 
     def undo(self):
-        self.project.remove_node(self.node)
\ No newline at end of file
+        if self.delta is None:
+            return
+        if not self.project.history or self.project.history[-1] is not self.delta:
+            raise RuntimeError("Solo se puede deshacer el último paso del historial")
+        self.project.undo()
+
+
+# Altas
+class AddNodeCommand(ProjectCommand):
+    def __init__(self, project, x, y, z=0.0):
+        super().__init__(project)
+        self.coords = (x, y, z)
+
+    def execute(self):
+        return self.project.add_node(*self.coords)
+
+
+class AddBarCommand(ProjectCommand):
+    def __init__(self, project, n1, n2, section=None, material=None):
+        super().__init__(project)
+        self.args = (n1, n2, section, material)
+
+    def execute(self):
+        return self.project.add_bar(*self.args)
+
+
+class AddShellCommand(ProjectCommand):
+    def __init__(self, project, nodes, thickness=0.2, material=None):
+        super().__init__(project)
+        self.args = (nodes, thickness, material)
+
+    def execute(self):
+        return self.project.add_shell(*self.args)
+
+
+class AddSolidCommand(ProjectCommand):
+    def __init__(self, project, nodes, material=None):
+        super().__init__(project)
+        self.args = (nodes, material)
+
+    def execute(self):
+        return self.project.add_solid(*self.args)
+
+
+class AddMaterialCommand(ProjectCommand):
+    def __init__(self, project, name, type_, params=None):
+        super().__init__(project)
+        self.args = (name, type_, params)
+
+    def execute(self):
+        return self.project.add_material(*self.args)
+
+
+class AddSectionCommand(ProjectCommand):
+    def __init__(self, project, name, type_, params=None, material=None):
+        super().__init__(project)
+        self.args = (name, type_, params, material)
+
+    def execute(self):
+        return self.project.add_section(*self.args)
+
+
+# Bajas
+class DeleteCommand(ProjectCommand):
+    """Elimina una selección (en cascada). El delta conserva los objetos eliminados."""
+    def __init__(self, project, objs):
+        super().__init__(project)
+        self.objs = list(objs)
+
+    def execute(self):
+        return self.project.delete_many(self.objs)
+
+
+# Transformaciones: el delta solo guarda la matriz afín
+class MoveCommand(ProjectCommand):
+    def __init__(self, project, objs, dx, dy, dz):
+        super().__init__(project)
+        self.objs = list(objs)
+        self.offset = (dx, dy, dz)
+
+    def execute(self):
+        self.project.move_objects(self.objs, *self.offset)
+
+
+class RotateCommand(ProjectCommand):
+    def __init__(self, project, objs, cx, cy, cz, angle, axis=(0.0, 0.0, 1.0)):
+        super().__init__(project)
+        self.objs = list(objs)
+        self.args = (cx, cy, cz, angle, axis)
+
+    def execute(self):
+        self.project.rotate_objects(self.objs, *self.args)
+
+
+class ScaleCommand(ProjectCommand):
+    def __init__(self, project, objs, sx, sy, sz, cx=0.0, cy=0.0, cz=0.0):
+        super().__init__(project)
+        self.objs = list(objs)
+        self.args = (sx, sy, sz, cx, cy, cz)
+
+    def execute(self):
+        self.project.scale_objects(self.objs, *self.args)
+
+
+class CopyCommand(ProjectCommand):
+    def __init__(self, project, objs, dx, dy, dz, n=1):
+        super().__init__(project)
+        self.objs = list(objs)
+        self.args = (dx, dy, dz, n)
+
+    def execute(self):
+        return self.project.copy_objects(self.objs, *self.args)
+
+
+class ExtrudeCommand(ProjectCommand):
+    """Extruye un nodo, barra o shell según el tipo de `base`."""
+    def __init__(self, project, base, ndivs, length, direction):
+        super().__init__(project)
+        self.base = base
+        self.args = (ndivs, length, direction)
+
+    def execute(self):
+        kind = self.project.kind_of(self.base)
+        if kind == "node":
+            return self.project.extrude_node_to_bars(self.base, *self.args)
+        if kind == "bar":
+            return self.project.extrude_bar_to_shells(self.base, *self.args)
+        if kind == "shell":
+            return self.project.extrude_shell_to_solids(self.base, *self.args)
+        raise ValueError(f"No se puede extruir {self.base!r}")
+
+
+class MergeNodesCommand(ProjectCommand):
+    """Fusiona los nodos coincidentes (tolerancia `tol`) y reasigna su conectividad."""
+    def __init__(self, project, tol=1e-6, nodes=None):
+        super().__init__(project)
+        self.tol = tol
+        self.nodes = None if nodes is None else list(nodes)
+
+    def execute(self):
+        return self.project.merge_nodes(self.tol, self.nodes)
+
+
+class RemoveDuplicatesCommand(ProjectCommand):
+    """Elimina barras, shells y sólidos duplicados (mismo conjunto de nodos)."""
+    def __init__(self, project, kinds=("bar", "shell", "solid"), tol=None):
+        super().__init__(project)
+        self.kinds = tuple(kinds)
+        self.tol = tol
+
+    def execute(self):
+        return self.project.remove_duplicate_elements(self.kinds, self.tol)
+
+
+# Propiedades y cargas
+class SetPropertyCommand(ProjectCommand):
+    """Cambia uno o varios atributos de una entidad ({prop: valor}) en un solo paso."""
+    def __init__(self, project, obj, values):
+        super().__init__(project)
+        self.obj = obj
+        self.values = dict(values)
+
+    def execute(self):
+        key = (self.project.kind_of(self.obj), self.obj.id)
+        for prop, value in self.values.items():
+            self.project.set_property(key, prop, value)
+
+
+class AssignLoadCommand(ProjectCommand):
+    """
+    Asigna una carga al objetivo: nodal si es un nodo, distribuida si es una barra
+    y superficial si es una shell. Los argumentos se pasan a add_*_load.
+    """
+    def __init__(self, project, target, *args, **kwargs):
+        super().__init__(project)
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+
+    def execute(self):
+        add = {
+            "node": self.project.add_nodal_load,
+            "bar": self.project.add_bar_load,
+            "shell": self.project.add_shell_load,
+        }.get(self.project.kind_of(self.target))
+        if add is None:
+            raise ValueError(f"No se puede asignar una carga a {self.target!r}")
+        return add(self.target, *self.args, **self.kwargs)
+
+
+class AssignSupportCommand(ProjectCommand):
+    def __init__(self, project, node, restraints=None, type_="fixed"):
+        super().__init__(project)
+        self.args = (node, restraints, type_)
+
+    def execute(self):
+        return self.project.add_support(*self.args)
+
+
+
+# Importación
+class ImportOpenSeesCommand(ProjectCommand):
+    """Importa un modelo OpenSees (TCL o JSON según la extensión) como un solo paso deshacible."""
+    def __init__(self, project, filepath):
+        super().__init__(project)
+        self.filepath = filepath
+
+    def execute(self):
+        if str(self.filepath).lower().endswith(".json"):
+            return self.project.import_from_opensees_json(self.filepath)
+        return self.project.import_from_opensees_tcl(self.filepath)
+
+
+class ImportTablesCommand(ProjectCommand):
+    """Importa tablas de nodos y conectividad (nodes=, bars=, shells=, solids=) como un solo paso."""
+    def __init__(self, project, progress=None, delimiter=None, **files):
+        super().__init__(project)
+        self.progress = progress
+        self.delimiter = delimiter
+        self.files = files
+
+    def execute(self):
+        return self.project.import_tables(delimiter=self.delimiter, progress=self.progress, **self.files)
+
+
+def run_command(command, manager=None):
+    """Ejecuta un comando a través del UndoRedoManager si hay uno; si no, directamente."""
+    if manager is not None:
+        manager.do(command)
+    else:
+        command.do()
+    return command.result
+
+
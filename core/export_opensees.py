@@ -1,125 +1,282 @@
+import json
 import os
+from operator import attrgetter
+
+import numpy as np
+
+
+def _tag(value):
+    """Tag de OpenSees de una propiedad (sección o material): su id."""
+    return getattr(value, "id", value)
+
 
 class OpenSeesExporter:
     """
     Exportador del modelo a formato OpenSees TCL o JSON.
     """
 
+    BLOCK = 65536           # Entidades formateadas por bloque en la escritura por bloques
+    BUFFER = 1 << 20        # Tamaño del buffer de escritura del fichero
+
     def __init__(self, project):
         self.project = project
+        self.warnings = []       # Avisos de la última exportación
+        self._skipped = set()    # Elementos duplicados que no se exportan
 
-    def export_to_tcl(self, filepath, only_geometry=False, comments=True, groups=False):
+    def _check_duplicates(self):
         """
-        Exporta a script TCL de OpenSees.
+        Antes de exportar detecta elementos duplicados (mismo conjunto de nodos):
+        duplicarían la rigidez, así que se omiten y se avisa de cada uno.
         """
-        with open(filepath, "w", encoding="utf-8") as f:
+        self.warnings = []
+        find = getattr(self.project, "find_duplicate_elements", None)
+        duplicates = find() if find is not None else {}
+        self._skipped = set(duplicates)
+        for dup, keep in duplicates.items():
+            kind = type(dup).__name__
+            self.warnings.append(f"{kind} {dup.id} duplica a {kind} {keep.id}: no se exporta")
+
+    def _elements(self, name):
+        """Elementos de una colección del proyecto, sin los duplicados."""
+        items = getattr(self.project, name, [])
+        if not self._skipped:
+            return items
+        return [e for e in items if e not in self._skipped]
+
+    def _node_rows(self):
+        """Pares (id, (x, y, z)) de todos los nodos, leídos en bloque del NodeStore."""
+        nodes = getattr(self.project, "nodes", [])
+        if hasattr(nodes, "coords"):
+            return zip(nodes.ids.tolist(), nodes.coords.tolist())
+        return ((n.id, (n.x, n.y, n.z)) for n in nodes)
+
+    def export_to_tcl(self, filepath, only_geometry=False, comments=True, groups=False, buffered=True):
+        """
+        Exporta a script TCL de OpenSees. Devuelve la lista de avisos.
+        Con buffered=True nodos y elementos se formatean por bloques a partir de
+        los arrays del proyecto y se escriben en trozos grandes; con
+        buffered=False se escribe entidad a entidad. El fichero es idéntico.
+        """
+        self._check_duplicates()
+        blocks = buffered and hasattr(self.project, "_elements") and hasattr(self.project.nodes, "coords")
+        with open(filepath, "w", encoding="utf-8", buffering=self.BUFFER) as f:
             if comments:
                 f.write("# OpenSees TCL exportado por Struktix\n\n")
-            # Nodos
-            for node in getattr(self.project, "nodes", []):
-                line = f"node {node.id} {node.x:.6f} {node.y:.6f} {node.z:.6f}\n"
-                if comments:
-                    f.write(f"# Nodo {node.id}\n")
-                f.write(line)
-            f.write("\n")
-            # Barras (elementos tipo truss/beam)
-            for bar in getattr(self.project, "bars", []):
-                eid = bar.id
-                n1, n2 = bar.n1.id, bar.n2.id
-                if only_geometry:
-                    line = f"# element bar {eid} {n1} {n2}\n"
-                else:
-                    sec = getattr(bar, "section", 1)
-                    mat = getattr(bar, "material", 1)
-                    line = f"element truss {eid} {n1} {n2} {sec} {mat}\n"
-                if comments:
-                    f.write(f"# Barra {eid}\n")
-                f.write(line)
-            # Shells (elementos tipo Shell)
-            for shell in getattr(self.project, "shells", []):
-                nidstr = " ".join(str(n.id) for n in shell.nodes)
-                eid = shell.id
-                if only_geometry:
-                    line = f"# element shell {eid} {nidstr}\n"
-                else:
-                    sec = getattr(shell, "section", 1)
-                    mat = getattr(shell, "material", 1)
-                    line = f"element ShellMITC4 {eid} {nidstr} {sec} {mat}\n"
-                if comments:
-                    f.write(f"# Shell {eid}\n")
-                f.write(line)
-            # Sólidos (elementos tipo brick)
-            for solid in getattr(self.project, "solids", []):
-                nidstr = " ".join(str(n.id) for n in solid.nodes)
-                eid = solid.id
-                if only_geometry:
-                    line = f"# element solid {eid} {nidstr}\n"
-                else:
-                    mat = getattr(solid, "material", 1)
-                    line = f"element Brick {eid} {nidstr} {mat}\n"
-                if comments:
-                    f.write(f"# Sólido {eid}\n")
-                f.write(line)
-            # Apoyos
-            for support in getattr(self.project, "supports", []):
-                n = support.node.id
-                restr = getattr(support, "restraints", [1, 1, 1, 1, 1, 1])
-                restr_str = " ".join(str(int(r)) for r in restr)
-                if comments:
-                    f.write(f"# Apoyo nodo {n}\n")
-                f.write(f"fix {n} {restr_str}\n")
-            # Cargas nodales
-            for load in getattr(self.project, "node_loads", []):
-                n = load.node.id
-                fx, fy, fz = getattr(load, "fx", 0), getattr(load, "fy", 0), getattr(load, "fz", 0)
-                mx, my, mz = getattr(load, "mx", 0), getattr(load, "my", 0), getattr(load, "mz", 0)
-                if fx or fy or fz or mx or my or mz:
-                    if comments:
-                        f.write(f"# Carga nodo {n}\n")
-                    f.write(f"load {n} {fx} {fy} {fz} {mx} {my} {mz}\n")
-            # Agrupaciones (opcional)
-            if groups and hasattr(self.project, "groups"):
-                for g in self.project.groups:
-                    if hasattr(g, "members"):
-                        ids = " ".join(str(m.id) for m in g.members)
-                        f.write(f"# Grupo {g.name}\n")
-                        f.write(f"set {g.name} {{{ids}}}\n")
+                for w in self.warnings:
+                    f.write(f"# AVISO: {w}\n")
+                if self.warnings:
+                    f.write("\n")
+            if blocks:
+                self._write_tcl_blocks(f, only_geometry, comments)
+                f.write("".join(self._tcl_tail(comments, groups)))
+            else:
+                self._write_tcl_entities(f, only_geometry, comments)
+                for line in self._tcl_tail(comments, groups):
+                    f.write(line)
             f.write("\n# EOF\n")
+        return self.warnings
+
+    def _write_tcl_entities(self, f, only_geometry, comments):
+        """Nodos y elementos entidad a entidad (proyectos sin arrays y referencia del escritor por bloques)."""
+        # Nodos (directamente desde los arrays del NodeStore)
+        for nid, (x, y, z) in self._node_rows():
+            line = f"node {nid} {x:.6f} {y:.6f} {z:.6f}\n"
+            if comments:
+                f.write(f"# Nodo {nid}\n")
+            f.write(line)
+        f.write("\n")
+        # Barras (elementos tipo truss/beam)
+        for bar in self._elements("bars"):
+            eid = bar.id
+            n1, n2 = bar.n1.id, bar.n2.id
+            if only_geometry:
+                line = f"# element bar {eid} {n1} {n2}\n"
+            else:
+                sec = _tag(getattr(bar, "section", 1))
+                mat = _tag(getattr(bar, "material", 1))
+                line = f"element truss {eid} {n1} {n2} {sec} {mat}\n"
+            if comments:
+                f.write(f"# Barra {eid}\n")
+            f.write(line)
+        # Shells (elementos tipo Shell)
+        for shell in self._elements("shells"):
+            nidstr = " ".join(str(n.id) for n in shell.nodes)
+            eid = shell.id
+            if only_geometry:
+                line = f"# element shell {eid} {nidstr}\n"
+            else:
+                sec = _tag(getattr(shell, "section", 1))
+                mat = _tag(getattr(shell, "material", 1))
+                line = f"element ShellMITC4 {eid} {nidstr} {sec} {mat}\n"
+            if comments:
+                f.write(f"# Shell {eid}\n")
+            f.write(line)
+        # Sólidos (elementos tipo brick)
+        for solid in self._elements("solids"):
+            nidstr = " ".join(str(n.id) for n in solid.nodes)
+            eid = solid.id
+            if only_geometry:
+                line = f"# element solid {eid} {nidstr}\n"
+            else:
+                mat = _tag(getattr(solid, "material", 1))
+                line = f"element Brick {eid} {nidstr} {mat}\n"
+            if comments:
+                f.write(f"# Sólido {eid}\n")
+            f.write(line)
 
-    def export_to_json(self, filepath, only_geometry=False, comments=True, groups=False):
+    def _tcl_tail(self, comments, groups):
+        """Líneas de apoyos, cargas nodales y grupos."""
+        # Apoyos
+        for support in getattr(self.project, "supports", []):
+            n = support.node.id
+            restr = getattr(support, "restraints", [1, 1, 1, 1, 1, 1])
+            restr_str = " ".join(str(int(r)) for r in restr)
+            if comments:
+                yield f"# Apoyo nodo {n}\n"
+            yield f"fix {n} {restr_str}\n"
+        # Cargas nodales
+        for load in getattr(self.project, "nodal_loads", []):
+            n = load.node.id
+            fx, fy, fz = getattr(load, "fx", 0), getattr(load, "fy", 0), getattr(load, "fz", 0)
+            mx, my, mz = getattr(load, "mx", 0), getattr(load, "my", 0), getattr(load, "mz", 0)
+            if fx or fy or fz or mx or my or mz:
+                if comments:
+                    yield f"# Carga nodo {n}\n"
+                yield f"load {n} {fx} {fy} {fz} {mx} {my} {mz}\n"
+        # Agrupaciones (opcional)
+        if groups and hasattr(self.project, "groups"):
+            for g in self.project.groups:
+                if hasattr(g, "members"):
+                    ids = " ".join(str(m.id) for m in g.members)
+                    yield f"# Grupo {g.name}\n"
+                    yield f"set {g.name} {{{ids}}}\n"
+
+    def _write_tcl_blocks(self, f, only_geometry, comments):
+        """
+        Nodos y elementos por bloques: ids, coordenadas y conectividad se leen de
+        los arrays del proyecto y cada bloque de filas se formatea con una sola
+        operación de %-formato y se escribe de una vez.
+        """
+        store = self.project.nodes
+        fmt = ("# Nodo %d\n" if comments else "") + "node %d %.6f %.6f %.6f\n"
+        ids, coords = store.ids, store.coords
+        for start in range(0, len(ids), self.BLOCK):
+            block = ids[start:start + self.BLOCK]
+            self._write_rows(f, fmt, ([block] if comments else []) + [block, coords[start:start + self.BLOCK]])
+        f.write("\n")
+        if only_geometry:
+            specs = (("bar", "# Barra", "# element bar", ()), ("shell", "# Shell", "# element shell", ()),
+                     ("solid", "# Sólido", "# element solid", ()))
+        else:
+            specs = (("bar", "# Barra", "element truss", ("section", "material")),
+                     ("shell", "# Shell", "element ShellMITC4", ("section", "material")),
+                     ("solid", "# Sólido", "element Brick", ("material",)))
+        for kind, comment, command, props in specs:
+            self._write_tcl_elements(f, kind, comment if comments else None, command, props)
+
+    def _element_table(self, kind):
+        """
+        Elementos de un tipo sin los duplicados, con sus ids (M,) y su
+        conectividad como ids de nodo (M,k), rellena con -1.
         """
-        Exporta a JSON (para OpenSeesPy o usos avanzados).
+        name = kind + "s"
+        items = getattr(self.project, name, [])
+        if not hasattr(self.project, "_elements"):
+            items = self._elements(name)
+            nodes = [[e.n1, e.n2] if kind == "bar" else list(e.nodes) for e in items]
+            width = max(map(len, nodes), default=2 if kind == "bar" else 4)
+            conn = np.full((len(items), width), -1, dtype=np.int64)
+            for i, row in enumerate(nodes):
+                conn[i, :len(row)] = [n.id for n in row]
+            return items, np.array([e.id for e in items], dtype=np.int64), conn
+        table = self.project._elements(kind)
+        conn = np.where(table["rows"] >= 0, self.project.nodes.ids[table["rows"]], -1)
+        ids = table["ids"]
+        if self._skipped:
+            keep = np.fromiter((e not in self._skipped for e in items), dtype=bool, count=len(items))
+            items = [e for e in items if e not in self._skipped]
+            ids, conn = ids[keep], conn[keep]
+        return items, ids, conn
+
+    def _write_tcl_elements(self, f, kind, comment, command, props):
+        items, ids, conn = self._element_table(kind)
+        # Tags de las propiedades (sección y material) de cada elemento
+        tags = [self._tags(items, prop) for prop in props]
+        # Tramos de filas consecutivas con el mismo número de nodos, partidos en bloques
+        counts = (conn >= 0).sum(axis=1)
+        edges = set(range(0, len(ids), self.BLOCK)) | set((np.flatnonzero(np.diff(counts)) + 1).tolist())
+        edges = sorted(edges) + [len(ids)]
+        for start, stop in zip(edges[:-1], edges[1:]):
+            count = int(counts[start])
+            fmt = ((comment + " %d\n" if comment else "") + command +
+                   " %d" * (count + 1) + " %s" * len(props) + "\n")
+            block = ids[start:stop]
+            columns = ([block] if comment else []) + [block, conn[start:stop, :count]]
+            self._write_rows(f, fmt, columns + [t[start:stop] for t in tags])
+
+    @staticmethod
+    def _tags(items, prop):
+        """Tag de la propiedad `prop` de cada elemento (1 si no la tiene), resuelto una vez por objeto distinto."""
+        try:
+            values = list(map(attrgetter(prop), items))
+        except AttributeError:
+            values = [getattr(e, prop, 1) for e in items]
+        distinct = dict(zip(map(id, values), values))
+        tag = {key: _tag(value) for key, value in distinct.items()}
+        return list(map(tag.__getitem__, map(id, values)))
+
+    @staticmethod
+    def _write_rows(f, fmt, columns):
+        """
+        Escribe `fmt` una vez por fila de `columns` (arrays (n,) o (n,k), o listas)
+        aplicando la plantilla repetida n veces a todos los valores del bloque.
+        """
+        n = len(columns[0])
+        widths = [c.shape[1] if getattr(c, "ndim", 1) == 2 else 1 for c in columns]
+        values = np.empty((n, sum(widths)), dtype=object)
+        col = 0
+        for c, width in zip(columns, widths):
+            values[:, col:col + width] = np.reshape(c, (n, width)) if width > 1 else np.array(c, dtype=object)[:, None]
+            col += width
+        f.write((fmt * n) % tuple(values.ravel().tolist()))
+
+    def export_to_json(self, filepath, only_geometry=False, comments=True, groups=False, columnar=False):
         """
-        import json
+        Exporta a JSON (para OpenSeesPy o usos avanzados). Devuelve la lista de avisos.
+        Con columnar=True se escribe el formato columnar compacto (ver export_to_columnar_json).
+        """
+        if columnar:
+            return self.export_to_columnar_json(filepath, only_geometry, comments, groups)
+        self._check_duplicates()
         data = {"nodes": [], "bars": [], "shells": [], "solids": [], "supports": [], "loads": []}
-        for node in getattr(self.project, "nodes", []):
+        for nid, (x, y, z) in self._node_rows():
             data["nodes"].append({
-                "id": node.id,
-                "x": node.x, "y": node.y, "z": node.z
+                "id": nid,
+                "x": x, "y": y, "z": z
             })
-        for bar in getattr(self.project, "bars", []):
+        for bar in self._elements("bars"):
             d = {"id": bar.id, "n1": bar.n1.id, "n2": bar.n2.id}
             if not only_geometry:
-                d["section"] = getattr(bar, "section", 1)
-                d["material"] = getattr(bar, "material", 1)
+                d["section"] = _tag(getattr(bar, "section", 1))
+                d["material"] = _tag(getattr(bar, "material", 1))
             data["bars"].append(d)
-        for shell in getattr(self.project, "shells", []):
+        for shell in self._elements("shells"):
             d = {"id": shell.id, "nodes": [n.id for n in shell.nodes]}
             if not only_geometry:
-                d["section"] = getattr(shell, "section", 1)
-                d["material"] = getattr(shell, "material", 1)
+                d["section"] = _tag(getattr(shell, "section", 1))
+                d["material"] = _tag(getattr(shell, "material", 1))
             data["shells"].append(d)
-        for solid in getattr(self.project, "solids", []):
+        for solid in self._elements("solids"):
             d = {"id": solid.id, "nodes": [n.id for n in solid.nodes]}
             if not only_geometry:
-                d["material"] = getattr(solid, "material", 1)
+                d["material"] = _tag(getattr(solid, "material", 1))
             data["solids"].append(d)
         for support in getattr(self.project, "supports", []):
             data["supports"].append({
                 "node": support.node.id,
                 "restraints": getattr(support, "restraints", [1,1,1,1,1,1])
             })
-        for load in getattr(self.project, "node_loads", []):
+        for load in getattr(self.project, "nodal_loads", []):
             data["loads"].append({
                 "node": load.node.id,
                 "fx": getattr(load, "fx", 0),
@@ -133,5 +290,112 @@ class OpenSeesExporter:
             data["groups"] = [
                 {"name": g.name, "members": [m.id for m in g.members]} for g in self.project.groups
             ]
+        if comments and self.warnings:
+            data["warnings"] = self.warnings
         with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
\ No newline at end of file
+            json.dump(data, f, indent=2)
+        return self.warnings
+
+    def export_to_columnar_json(self, filepath, only_geometry=False, comments=True, groups=False):
+        """
+        Exporta a JSON columnar compacto: una entrada por tipo de entidad con
+        una lista por columna, p. ej.
+            {"nodes": {"id": [...], "xyz": [[x, y, z], ...]},
+             "bars": {"id": [...], "conn": [[n1, n2], ...], "section": [...], "material": [...]}, ...}
+        La conectividad de shells y sólidos se rellena con -1 hasta el número
+        máximo de nodos y las propiedades sin asignar se escriben como -1, de
+        modo que cada columna se convierte directamente en un array de NumPy
+        (ver load_columnar_json). El ancho de cada conectividad se declara en
+        "widths" ({"bars": {"conn": 2}, ...}) para que una tabla vacía
+        conserve su forma (0,k). Las columnas se escriben por bloques de filas
+        sin construir el documento en memoria. Devuelve la lista de avisos.
+        """
+        self._check_duplicates()
+        nodes = getattr(self.project, "nodes", [])
+        if hasattr(nodes, "coords"):
+            node_ids, xyz = nodes.ids, nodes.coords
+        else:
+            node_ids = np.array([n.id for n in nodes], dtype=np.int64)
+            xyz = np.array([(n.x, n.y, n.z) for n in nodes], dtype=np.float64).reshape(-1, 3)
+        sections = [("nodes", [("id", node_ids), ("xyz", xyz)])]
+        widths = {}
+        for kind, props in (("bar", ("section", "material")), ("shell", ("section", "material")),
+                            ("solid", ("material",))):
+            items, ids, conn = self._element_table(kind)
+            columns = [("id", ids), ("conn", conn)]
+            widths[kind + "s"] = {"conn": conn.shape[1]}
+            if not only_geometry:
+                columns += [(prop, np.array([-1 if t is None else t for t in self._tags(items, prop)]))
+                            for prop in props]
+            sections.append((kind + "s", columns))
+        supports = getattr(self.project, "supports", [])
+        sections.append(("supports", [
+            ("node", np.array([s.node.id for s in supports], dtype=np.int64)),
+            ("restraints", np.array([[int(r) for r in getattr(s, "restraints", [1] * 6)] for s in supports],
+                                    dtype=np.int8).reshape(-1, 6)),
+        ]))
+        loads = getattr(self.project, "nodal_loads", [])
+        sections.append(("loads", [
+            ("node", np.array([l.node.id for l in loads], dtype=np.int64)),
+            ("values", np.array([[getattr(l, c, 0) for c in ("fx", "fy", "fz", "mx", "my", "mz")] for l in loads],
+                                dtype=np.float64).reshape(-1, 6)),
+        ]))
+        if groups and hasattr(self.project, "groups"):
+            sections.append(("groups", [("name", [g.name for g in self.project.groups]),
+                                        ("members", [[m.id for m in g.members] for g in self.project.groups])]))
+        encode = json.JSONEncoder(separators=(",", ":")).encode
+        with open(filepath, "w", encoding="utf-8", buffering=self.BUFFER) as f:
+            f.write('{"format":"columnar","widths":' + encode(widths))
+            for name, columns in sections:
+                f.write("," + encode(name) + ":{")
+                for i, (column, values) in enumerate(columns):
+                    f.write(("," if i else "") + encode(column) + ":")
+                    self._write_json_column(f, values, encode)
+                f.write("}")
+            if comments and self.warnings:
+                f.write(',"warnings":' + encode(self.warnings))
+            f.write("}")
+        return self.warnings
+
+    def _write_json_column(self, f, values, encode):
+        """Escribe una columna (array o lista) como array JSON, convirtiendo y codificando por bloques."""
+        f.write("[")
+        for start in range(0, len(values), self.BLOCK):
+            block = values[start:start + self.BLOCK]
+            if hasattr(block, "tolist"):
+                block = block.tolist()
+            f.write(("," if start else "") + encode(block)[1:-1])
+        f.write("]")
+
+
+def load_columnar_json(filepath):
+    """
+    Lee un fichero de export_to_columnar_json y devuelve un dict
+    entidad -> {columna: np.ndarray}; las columnas de texto y de longitud
+    variable (nombres y miembros de grupos) se quedan como listas. Solo usa
+    json y NumPy, de modo que se puede copiar tal cual a los scripts de OpenSeesPy.
+    Las columnas con ancho conocido o declarado en "widths" son siempre arrays
+    2D (-1, ancho), también cuando están vacías.
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    widths = data.pop("widths", {})
+    # Columna -> (dtype, nº de columnas si es un array 2D de ancho fijo)
+    columns = {"id": (np.int64, None), "node": (np.int64, None), "section": (np.int64, None),
+               "material": (np.int64, None), "conn": (np.int64, None), "xyz": (np.float64, 3),
+               "values": (np.float64, 6), "restraints": (bool, 6)}
+    result = {}
+    for name, value in data.items():
+        if not isinstance(value, dict):
+            result[name] = value
+            continue
+        result[name] = {}
+        for column, values in value.items():
+            if column not in columns:
+                result[name][column] = values
+                continue
+            dtype, width = columns[column]
+            width = widths.get(name, {}).get(column, width)
+            arr = np.array(values, dtype=dtype)
+            result[name][column] = arr.reshape(-1, width) if width else arr
+    return result
@@ -0,0 +1,248 @@
+import numpy as np
+
+from model.json_stream import iter_json
+
+
+class OpenSeesImporter:
+    """
+    Importador de modelos OpenSees en los formatos que escribe OpenSeesExporter
+    (script TCL o JSON). Lee el fichero como un flujo y acumula nodos y
+    elementos en bloques que se dan de alta con las funciones masivas del
+    proyecto (add_nodes, add_bars...). Las entidades reciben ids nuevos del
+    proyecto y los ids de nodo del fichero se traducen con un diccionario
+    (id del fichero -> id nuevo), de modo que se puede importar en un modelo
+    que ya tiene contenido. Todo se importa en una sola transacción: si algo
+    falla, el modelo queda igual.
+    """
+
+    CHUNK = 65536  # Filas acumuladas antes de cada alta masiva
+
+    # Elementos reconocidos: tipo de OpenSees -> (tipo del modelo, propiedades al final de la línea)
+    ELEMENTS = {
+        "truss": ("bar", ("section", "material")),
+        "ShellMITC4": ("shell", ("section", "material")),
+        "Brick": ("solid", ("material",)),
+    }
+    # Líneas de "solo geometría" (# element bar|shell|solid ...)
+    GEOMETRY = {"bar": "bar", "shell": "shell", "solid": "solid"}
+
+    def __init__(self, project):
+        self.project = project
+        self.warnings = []   # Avisos de la última importación
+        self.counts = {}     # Entidades importadas por tipo
+        self._nodes = ([], [])
+        self._elements = {}  # (tipo, ancho, sección, material) -> conectividad
+        self._node_ids = {}  # Id de nodo del fichero -> id en el proyecto
+        self._pending = 0
+
+    def _reset(self):
+        self.warnings = []
+        self.counts = {}
+        self._nodes = ([], [])
+        self._elements = {}
+        self._node_ids = {}
+        self._pending = 0
+        self._ignored = {}
+
+    # Acumulación y altas en bloque
+    def _node(self, id_, x, y, z=0.0):
+        ids, coords = self._nodes
+        ids.append(id_)
+        coords.append((x, y, z))
+        if len(ids) >= self.CHUNK:
+            self._flush_nodes()
+
+    def _element(self, kind, nodes, section=None, material=None):
+        width = max(len(nodes), 4) if kind == "shell" else len(nodes)
+        if kind == "shell":
+            nodes = list(nodes) + [-1] * (width - len(nodes))  # Triángulos rellenos con -1
+        key = (kind, width, section, material)
+        self._elements.setdefault(key, []).append(nodes)
+        self._pending += 1
+        if self._pending >= self.CHUNK:
+            self._flush()
+
+    def _flush_nodes(self):
+        ids, coords = self._nodes
+        if ids:
+            self._add_nodes(ids, np.array(coords, dtype=np.float64))
+            self._nodes = ([], [])
+
+    def _add_nodes(self, ids, coords):
+        """Da de alta los nodos con ids nuevos y registra la traducción de los del fichero."""
+        if len(set(ids)) != len(ids) or not self._node_ids.keys().isdisjoint(ids):
+            raise ValueError("Hay ids de nodo repetidos en el fichero")
+        new_ids = self.project.add_nodes(coords)
+        self._node_ids.update(zip(ids, new_ids.tolist()))
+        self._count("node", len(ids))
+
+    def _translate(self, conn):
+        """Traduce una conectividad con ids del fichero a ids del proyecto (-1 se conserva)."""
+        values, inverse = np.unique(conn, return_inverse=True)
+        mapped = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values.tolist()):
+            if value < 0:
+                mapped[i] = -1
+            elif value in self._node_ids:
+                mapped[i] = self._node_ids[value]
+            else:
+                raise ValueError(f"El nodo {value} no existe en el fichero")
+        return mapped[inverse.ravel()].reshape(conn.shape)
+
+    def _flush(self):
+        # Los nodos van primero: los elementos los buscan por id
+        self._flush_nodes()
+        project = self.project
+        for (kind, width, section, material), conn in self._elements.items():
+            conn = self._translate(np.array(conn, dtype=np.int64).reshape(-1, width))
+            if kind == "bar":
+                project.add_bars(conn, self._ref("section", section), self._ref("material", material))
+            elif kind == "shell":
+                project.add_shells(conn, material=self._ref("material", material))
+            else:
+                project.add_solids(conn, self._ref("material", material))
+            self._count(kind, len(conn))
+        self._elements = {}
+        self._pending = 0
+
+    def _ref(self, kind, tag):
+        """Sección o material del proyecto con ese id; si no existe se conserva el id."""
+        return None if tag is None else self.project._loaded_ref(kind, tag)
+
+    def _count(self, kind, n=1):
+        self.counts[kind] = self.counts.get(kind, 0) + n
+
+    def _support(self, node_id, restraints):
+        node = self._node_obj(node_id)
+        restraints = [bool(r) for r in restraints]
+        if all(restraints):
+            type_ = "fixed"
+        elif restraints[:3] == [True] * 3 and not any(restraints[3:]):
+            type_ = "pinned"
+        else:
+            type_ = "custom"
+        self.project.add_support(node, restraints, type_)
+        self._count("support")
+
+    def _load(self, node_id, values, case=None):
+        self.project.add_nodal_load(self._node_obj(node_id), *values, case=case)
+        self._count("nodal_load")
+
+    def _node_obj(self, node_id):
+        self._flush_nodes()
+        if node_id not in self._node_ids:
+            raise ValueError(f"El nodo {node_id} no existe en el fichero")
+        return self.project.get_node(self._node_ids[node_id])
+
+    def _ignore(self, what):
+        self._ignored[what] = self._ignored.get(what, 0) + 1
+
+    def _finish(self):
+        self._flush()
+        for what, n in self._ignored.items():
+            self.warnings.append(f"{what}: {n} línea(s) no reconocida(s), se ignoran")
+        return self.warnings
+
+    # TCL
+    def import_tcl(self, filepath):
+        """
+        Importa un script TCL: líneas node, element (truss, ShellMITC4, Brick),
+        fix y load (dentro o fuera de un pattern; el tag del pattern se usa como
+        caso de carga). También lee las líneas "# element bar|shell|solid" de
+        las exportaciones de solo geometría. Devuelve la lista de avisos.
+        """
+        self._reset()
+        case = None
+        with self.project.batch():
+            with open(filepath, "r", encoding="utf-8") as f:
+                for lineno, line in enumerate(f, 1):
+                    tokens = line.split()
+                    if not tokens:
+                        continue
+                    try:
+                        if tokens[0].startswith("#"):
+                            if len(tokens) > 3 and tokens[1] == "element" and tokens[2] in self.GEOMETRY:
+                                self._tcl_element(self.GEOMETRY[tokens[2]], (), tokens[3:])
+                            continue
+                        cmd = tokens[0]
+                        if cmd == "node":
+                            self._node(int(tokens[1]), *map(float, tokens[2:5]))
+                        elif cmd == "element":
+                            element = self.ELEMENTS.get(tokens[1])
+                            if element is None:
+                                self._ignore(f"element {tokens[1]}")
+                            else:
+                                self._tcl_element(element[0], element[1], tokens[2:])
+                        elif cmd == "fix":
+                            self._support(int(tokens[1]), [int(t) for t in tokens[2:]])
+                        elif cmd == "load":
+                            self._load(int(tokens[1]), [float(t) for t in tokens[2:8]], case)
+                        elif cmd == "pattern":
+                            case = int(tokens[2]) if tokens[2].lstrip("-").isdigit() else tokens[2]
+                        elif cmd == "}":
+                            case = None
+                        else:
+                            self._ignore(cmd)
+                    except (IndexError, ValueError) as e:
+                        raise ValueError(f"{filepath}:{lineno}: {e}") from None
+            return self._finish()
+
+    # Formato columnar: entidad -> columnas con las que se rehace cada registro
+    COLUMNAR = ("nodes", "bars", "shells", "solids", "supports", "loads")
+
+    def _columnar(self, key, columns):
+        # iter_json devuelve cada sección columnar entera: la memoria pico es la
+        # de la mayor sección decodificada (p. ej. todas las coordenadas de nodos)
+        if key == "nodes":
+            self._flush_nodes()
+            self._add_nodes(list(columns["id"]), np.array(columns["xyz"], dtype=np.float64).reshape(-1, 3))
+            return
+        names = list(columns)
+        for values in zip(*columns.values()):
+            row = dict(zip(names, values))
+            if key == "supports":
+                self._support(row["node"], row["restraints"])
+            elif key == "loads":
+                self._load(row["node"], row["values"])
+            else:
+                props = [None if row.get(p, -1) == -1 else row[p] for p in ("section", "material")]
+                self._element(key[:-1], [n for n in row["conn"] if n >= 0], *props)
+
+    def _tcl_element(self, kind, props, tokens):
+        # tokens: id (se descarta, el proyecto asigna uno nuevo), nodos..., y las
+        # propiedades al final ("None" si no tiene)
+        values = [None if t == "None" else int(t) for t in tokens]
+        count = len(values) - len(props)
+        nodes = values[1:count]
+        extra = dict(zip(props, values[count:]))
+        self._element(kind, nodes, extra.get("section"), extra.get("material"))
+
+    # JSON
+    def import_json(self, filepath):
+        """
+        Importa el JSON de OpenSeesExporter.export_to_json en streaming (también
+        el formato columnar). Devuelve la lista de avisos.
+        """
+        self._reset()
+        columnar = False
+        with self.project.batch():
+            with open(filepath, "r", encoding="utf-8") as f:
+                for key, item in iter_json(f):
+                    if key == "format":
+                        columnar = item == "columnar"
+                    elif columnar and key in self.COLUMNAR:
+                        self._columnar(key, item)
+                    elif key == "nodes":
+                        self._node(item["id"], item["x"], item["y"], item.get("z", 0.0))
+                    elif key == "bars":
+                        self._element("bar", (item["n1"], item["n2"]), item.get("section"), item.get("material"))
+                    elif key in ("shells", "solids"):
+                        self._element(key[:-1], item["nodes"], item.get("section"), item.get("material"))
+                    elif key == "supports":
+                        self._support(item["node"], item["restraints"])
+                    elif key == "loads":
+                        self._load(item["node"], [item.get(k, 0) for k in ("fx", "fy", "fz", "mx", "my", "mz")],
+                                   item.get("case"))
+                    elif key == "warnings":
+                        self.warnings.append(f"Aviso del fichero: {item}")
+            return self._finish()
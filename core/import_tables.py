@@ -0,0 +1,190 @@
+import os
+from itertools import islice
+
+import numpy as np
+
+
+class TableImporter:
+    """
+    Importador de tablas de texto delimitado (CSV, ; tabuladores o espacios):
+    tablas de nodos (id, x, y, z) y de conectividad (id, n1, n2, ..., sección,
+    material). Cada fichero se lee por bloques de filas que se convierten con
+    np.loadtxt; las referencias (nodos, secciones y materiales) se validan en
+    bloque y todo se da de alta con las funciones masivas del proyecto en una
+    sola transacción.
+
+    Formato:
+      - Una línea de cabecera opcional (se detecta si no es numérica) y
+        comentarios con '#'.
+      - Nodos: id, x, y y opcionalmente z (z=0 si no está).
+      - Elementos: id, ids de nodo, sección y material. Un id de sección o
+        material <= 0 significa "sin propiedad"; la sección solo se usa en
+        barras. En shells, los nodos que sobran en una fila (triángulos en una
+        tabla de cuadriláteros) se rellenan con -1.
+
+    `progress(done, total)` (opcional) se llama tras cada bloque con los
+    caracteres leídos y el tamaño total; si devuelve False la importación se
+    cancela (InterruptedError) y el modelo queda como estaba.
+    """
+
+    CHUNK_ROWS = 262144  # Filas convertidas con cada llamada a np.loadtxt
+    DELIMITERS = (",", ";", "\t")
+    NODE_COLUMNS = {"bar": (2,), "shell": None, "solid": (4, 8)}
+
+    def __init__(self, project, progress=None):
+        self.project = project
+        self.progress = progress
+        self.counts = {}   # Entidades importadas por tipo
+        self._done = 0
+        self._total = 0
+
+    def import_tables(self, nodes=None, bars=None, shells=None, solids=None, delimiter=None):
+        """
+        Importa en una sola transacción una tabla de nodos y tablas de barras,
+        shells y sólidos (cualquiera puede omitirse). Los nodos se crean antes,
+        de modo que los elementos pueden referirse a ellos. Devuelve self.counts.
+        """
+        files = [(kind, path) for kind, path in (("node", nodes), ("bar", bars), ("shell", shells),
+                                                   ("solid", solids)) if path]
+        self.counts = {}
+        self._done = 0
+        self._total = sum(os.path.getsize(path) for _, path in files)
+        with self.project.batch():
+            for kind, path in files:
+                if kind == "node":
+                    self._import_nodes(path, delimiter)
+                else:
+                    self._import_elements(kind, path, delimiter)
+        return self.counts
+
+    def import_nodes(self, filepath, delimiter=None):
+        """Importa una tabla de nodos. Devuelve el número de nodos creados."""
+        return self.import_tables(nodes=filepath, delimiter=delimiter).get("node", 0)
+
+    def import_elements(self, kind, filepath, delimiter=None):
+        """Importa una tabla de conectividad de barras, shells o sólidos. Devuelve el número de elementos."""
+        if kind not in self.NODE_COLUMNS:
+            raise ValueError(f"Tipo de elemento no válido: {kind!r}")
+        return self.import_tables(delimiter=delimiter, **{kind + "s": filepath}).get(kind, 0)
+
+    # Lectura
+    def _read(self, filepath, delimiter, dtype):
+        """Lee una tabla completa como array 2D de `dtype`, bloque a bloque."""
+        blocks = []
+        with open(filepath, "r", encoding="utf-8") as f:
+            first = self._first_row(f)
+            if first is None:
+                return np.empty((0, 0), dtype=dtype)
+            line, skipped = first
+            if delimiter is None:
+                delimiter = next((d for d in self.DELIMITERS if d in line), None)
+            self._advance(skipped)
+            lines = [line]
+            while True:
+                lines.extend(islice(f, self.CHUNK_ROWS - len(lines)))
+                if not lines:
+                    break
+                try:
+                    block = np.loadtxt(lines, dtype=dtype, delimiter=delimiter, comments="#", ndmin=2)
+                except ValueError as e:
+                    raise ValueError(f"{filepath}: {e}") from None
+                if blocks and block.size and block.shape[1] != blocks[0].shape[1]:
+                    raise ValueError(f"{filepath}: todas las filas deben tener el mismo número de columnas")
+                if block.size:
+                    blocks.append(block)
+                self._advance(sum(map(len, lines)))
+                lines = []
+        if not blocks:
+            return np.empty((0, 0), dtype=dtype)
+        return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+    def _first_row(self, f):
+        """Primera fila de datos (saltando vacías, comentarios y la cabecera) y caracteres saltados."""
+        skipped = 0
+        for line in f:
+            text = line.split("#", 1)[0].strip()
+            if text and self._numeric(text):
+                return line, skipped
+            skipped += len(line)
+        self._advance(skipped)
+        return None
+
+    def _numeric(self, text):
+        tokens = text.replace(",", " ").replace(";", " ").split()
+        try:
+            [float(t) for t in tokens]
+        except ValueError:
+            return False  # Cabecera
+        return True
+
+    def _advance(self, chars):
+        self._done += chars
+        if self.progress is not None and self.progress(min(self._done, self._total), self._total) is False:
+            raise InterruptedError("Importación cancelada")
+
+    # Altas
+    def _import_nodes(self, filepath, delimiter):
+        table = self._read(filepath, delimiter, np.float64)
+        if not table.size:
+            return
+        if table.shape[1] not in (3, 4):
+            raise ValueError(f"{filepath}: una tabla de nodos tiene 3 o 4 columnas (id, x, y[, z])")
+        ids = table[:, 0].astype(np.int64)
+        if not np.array_equal(ids, table[:, 0]):
+            raise ValueError(f"{filepath}: los ids de nodo deben ser enteros")
+        self.project.add_nodes(table[:, 1:], ids=ids)
+        self._count("node", len(ids))
+
+    def _import_elements(self, kind, filepath, delimiter):
+        table = self._read(filepath, delimiter, np.int64)
+        if not table.size:
+            return
+        ids, conn, sections, materials = table[:, 0], table[:, 1:-2], table[:, -2], table[:, -1]
+        sizes = self.NODE_COLUMNS[kind]
+        if conn.shape[1] < (3 if kind == "shell" else 2) or (sizes and conn.shape[1] not in sizes):
+            raise ValueError(f"{filepath}: número de columnas no válido para {kind} ({table.shape[1]})")
+        if kind != "bar":
+            sections = np.zeros_like(sections)
+        self._check_nodes(filepath, conn)
+        section_refs, section_codes = self._references(filepath, "section", sections)
+        material_refs, material_codes = self._references(filepath, "material", materials)
+        # Un alta masiva por cada combinación de propiedades, en el orden en que aparecen
+        keys = section_codes * len(material_refs) + material_codes
+        groups = [(0, slice(None))]
+        if len(section_refs) * len(material_refs) > 1:
+            values, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            groups = [(values[g], np.flatnonzero(inverse.ravel() == g)) for g in np.argsort(first)]
+        for key, rows in groups:
+            section, material = section_refs[key // len(material_refs)], material_refs[key % len(material_refs)]
+            if kind == "bar":
+                self.project.add_bars(conn[rows], section, material, ids=ids[rows])
+            elif kind == "shell":
+                self.project.add_shells(conn[rows], material=material, ids=ids[rows])
+            else:
+                self.project.add_solids(conn[rows], material, ids=ids[rows])
+        self._count(kind, len(ids))
+
+    def _check_nodes(self, filepath, conn):
+        """Comprueba en bloque que todos los nodos referenciados existen."""
+        used = conn[conn >= 0]
+        missing = np.unique(used[~np.isin(used, self.project.nodes.ids)])
+        if len(missing):
+            shown = ", ".join(map(str, missing[:10].tolist())) + (", ..." if len(missing) > 10 else "")
+            raise ValueError(f"{filepath}: {len(missing)} nodo(s) no existen en el modelo: {shown}")
+
+    def _references(self, filepath, kind, values):
+        """
+        Objetos del modelo de los ids de propiedad usados (<= 0: sin propiedad)
+        y, para cada fila, la posición de su objeto en esa lista.
+        """
+        index = self.project._index[kind]
+        ids, codes = np.unique(values, return_inverse=True)
+        refs = []
+        for id_ in ids.tolist():
+            if id_ > 0 and id_ not in index:
+                raise ValueError(f"{filepath}: no existe {kind} con id {id_}")
+            refs.append(index[id_] if id_ > 0 else None)
+        return refs, codes.ravel()
+
+    def _count(self, kind, n):
+        self.counts[kind] = self.counts.get(kind, 0) + n
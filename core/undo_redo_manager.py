@@ -11,18 +11,32 @@ class Command:
 
 class UndoRedoManager:
     """
-    Gestor de historial para deshacer y rehacer acciones.
+    Gestor de deshacer y rehacer de la interfaz.
+    Con un proyecto asociado, los comandos (ProjectCommand) dejan su delta en
+    el historial del propio proyecto, que es el único historial y está
+    limitado en memoria (Project.history_max_bytes), y deshacer y rehacer se
+    delegan en él. Sin proyecto, el gestor usa sus propias pilas de comandos.
     """
-    def __init__(self):
+    def __init__(self, project=None):
+        self.project = project
         self._undo_stack = []
         self._redo_stack = []
 
+    def set_project(self, project):
+        self.project = project
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+
     def do(self, command: Command):
         command.do()
-        self._undo_stack.append(command)
-        self._redo_stack.clear()  # Al hacer una nueva acción, se borra la pila de redo
+        if self.project is None:
+            self._undo_stack.append(command)
+            self._redo_stack.clear()  # Al hacer una nueva acción, se borra la pila de redo
 
     def undo(self):
+        if self.project is not None:
+            self.project.undo()
+            return
         if not self._undo_stack:
             return
         command = self._undo_stack.pop()
@@ -30,6 +44,9 @@ class UndoRedoManager:
         self._redo_stack.append(command)
 
     def redo(self):
+        if self.project is not None:
+            self.project.redo()
+            return
         if not self._redo_stack:
             return
         command = self._redo_stack.pop()
@@ -37,11 +54,13 @@ class UndoRedoManager:
         self._undo_stack.append(command)
 
     def can_undo(self):
-        return bool(self._undo_stack)
+        return bool(self.project.history) if self.project is not None else bool(self._undo_stack)
 
     def can_redo(self):
-        return bool(self._redo_stack)
+        return bool(self.project.future) if self.project is not None else bool(self._redo_stack)
 
     def clear(self):
         self._undo_stack.clear()
-        self._redo_stack.clear()
\ No newline at end of file
+        self._redo_stack.clear()
+        if self.project is not None:
+            self.project.clear_history()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import numpy as np
+
+from utils.geometry import bar_geometry, shell_geometry, solid_geometry
+
+
+class Issue:
+    """Problema detectado en una entidad del modelo."""
+    __slots__ = ("obj", "kind", "code", "message", "severity")
+
+    def __init__(self, obj, kind, code, message, severity="error"):
+        self.obj = obj            # Entidad afectada (para seleccionarla en la GUI)
+        self.kind = kind          # 'bar', 'shell', 'nodal_load'...
+        self.code = code          # Identificador del tipo de problema
+        self.message = message
+        self.severity = severity  # 'error' o 'warning'
+
+    def __repr__(self):
+        return f"Issue({self.severity}, {self.code}, {self.kind} {self.obj.id}: {self.message})"
+
+
+class ModelValidator:
+    """
+    Motor de validación incremental del modelo.
+    Comprobaciones (vectorizadas por tipo de elemento):
+        - barras degeneradas (longitud casi nula)
+        - shells degeneradas (área casi nula) o no coplanares (alabeo > coplanar_tol)
+        - sólidos degenerados (volumen casi nulo)
+        - referencias a nodos que ya no están en el modelo
+        - cargas sobre barras o shells eliminadas
+    Escucha Project.model_delta para saber qué entidades han cambiado: run()
+    solo vuelve a validar esas (y los elementos y cargas que dependen de ellas).
+    close() deja de escuchar al proyecto (al cambiar de proyecto o descartar
+    el validador).
+    """
+
+    def __init__(self, project, tol=1e-10, coplanar_tol=1e-6):
+        self.project = project
+        self.tol = tol
+        self.coplanar_tol = coplanar_tol
+        self._issues = {}     # entidad -> lista de Issue
+        self._dirty = {}      # entidad -> tipo, pendientes de validar
+        self._full = True     # Validar todo el modelo en el próximo run()
+        self._connected = True
+        project.model_delta.connect(self._on_delta)
+
+    def close(self):
+        """Desconecta el validador de Project.model_delta. Se puede llamar varias veces."""
+        if self._connected:
+            self.project.model_delta.disconnect(self._on_delta)
+            self._connected = False
+
+    def _on_delta(self, delta):
+        if delta is None:
+            self._full = True
+        else:
+            self._dirty.update(delta.touched())
+
+    def invalidate(self):
+        """Fuerza una validación completa en el próximo run()."""
+        self._full = True
+
+    @property
+    def issues(self):
+        """Lista de problemas de la última validación."""
+        return [issue for issues in self._issues.values() for issue in issues]
+
+    def run(self):
+        """Valida las entidades cambiadas desde la última ejecución y devuelve la lista de problemas."""
+        p = self.project
+        if self._full:
+            self._issues = {}
+            targets = {}
+            for kind in ("bar", "shell", "solid", "nodal_load", "bar_load", "shell_load", "support"):
+                targets.update(dict.fromkeys(getattr(p, p.COLLECTIONS[kind]), kind))
+        else:
+            targets = self._expand(self._dirty)
+        self._full = False
+        self._dirty = {}
+        for obj in targets:
+            self._issues.pop(obj, None)
+        by_kind = {}
+        for obj, kind in targets.items():
+            # Las entidades eliminadas del modelo no se validan
+            if p.get(kind, obj.id) is obj:
+                by_kind.setdefault(kind, []).append(obj)
+        for kind, objs in by_kind.items():
+            objs = self._check_references(kind, objs)
+            check = getattr(self, f"_check_{kind}s", None)
+            if check is not None and objs:
+                check(objs)
+        return self.issues
+
+    def _expand(self, touched):
+        """Añade a las entidades tocadas las que dependen de ellas (elementos de un nodo, cargas...)."""
+        p = self.project
+        targets = {}
+        stack = list(touched.items())
+        while stack:
+            obj, kind = stack.pop()
+            if obj in targets:
+                continue
+            if kind not in ("node", "material", "section"):
+                targets[obj] = kind
+            for dep in p.dependents(obj):
+                stack.append((dep, p.kind_of(dep)))
+        return targets
+
+    def _add(self, obj, kind, code, message, severity="error"):
+        self._issues.setdefault(obj, []).append(Issue(obj, kind, code, message, severity))
+
+    # Referencias
+    TARGET_KINDS = {"n1": "node", "n2": "node", "nodes": "node", "node": "node", "bar": "bar", "shell": "shell"}
+
+    def _check_references(self, kind, objs):
+        """Detecta referencias colgantes; devuelve los objetos válidos para las comprobaciones geométricas."""
+        p = self.project
+        broken = set()
+        for attr in p.REFERENCES.get(kind, ()):
+            target_kind = self.TARGET_KINDS[attr]
+            index = p._index[target_kind]
+            for obj in objs:
+                value = getattr(obj, attr)
+                for target in (value if isinstance(value, (list, tuple)) else (value,)):
+                    # None: el id leído del fichero no existía (todas estas referencias son obligatorias)
+                    if target is not None and index.get(target.id) is target:
+                        continue
+                    broken.add(obj)
+                    if target_kind == "node":
+                        what = f"al nodo {target.id}, que no está" if target is not None else "a un nodo que no está"
+                        self._add(obj, kind, "dangling_node", f"Referencia {what} en el modelo")
+                    else:
+                        what = f"{target_kind} {target.id}" if target is not None else f"un {target_kind}"
+                        self._add(obj, kind, "orphan_load", f"Carga sobre {what} que no está en el modelo")
+        return [o for o in objs if o not in broken] if broken else objs
+
+    # Comprobaciones geométricas vectorizadas sobre los objetos indicados
+    def _points(self, nodes_per_obj, width):
+        """Coordenadas rellenas (M,width,3) y máscara de vértices válidos (M,width)."""
+        store = self.project.nodes
+        rows = np.full((len(nodes_per_obj), width), -1, dtype=np.intp)
+        for i, nodes in enumerate(nodes_per_obj):
+            rows[i, :len(nodes)] = [n._row for n in nodes]
+        return store.coords[rows], rows >= 0
+
+    def _check_bars(self, bars):
+        if bars == self.project.bars:
+            lengths = self.project.bar_geometry()["lengths"]  # Validación completa: geometría cacheada
+        else:
+            points, _ = self._points([(b.n1, b.n2) for b in bars], 2)
+            lengths, _, _ = bar_geometry(points[:, 0], points[:, 1])
+        for i in np.flatnonzero(lengths < self.tol).tolist():
+            self._add(bars[i], "bar", "bar_degenerate", f"Barra de longitud casi nula ({lengths[i]:.3g})")
+
+    def _check_shells(self, shells):
+        if shells == self.project.shells:
+            g = self.project.shell_geometry()
+        else:
+            width = max(len(s.nodes) for s in shells)
+            points, valid = self._points([s.nodes for s in shells], width)
+            g = shell_geometry(points, valid)
+        for i in np.flatnonzero(g["areas"] < self.tol).tolist():
+            self._add(shells[i], "shell", "shell_degenerate", f"Shell de área casi nula ({g['areas'][i]:.3g})")
+        for i in np.flatnonzero(g["warping"] > self.coplanar_tol).tolist():
+            self._add(shells[i], "shell", "shell_not_coplanar",
+                      f"Shell no coplanar (alabeo {g['warping'][i]:.3g})", "warning")
+
+    def _check_solids(self, solids):
+        if solids == self.project.solids:
+            volumes = self.project.solid_geometry()["volumes"]
+            for i in np.flatnonzero(volumes < self.tol).tolist():
+                self._add(solids[i], "solid", "solid_degenerate", f"Sólido de volumen casi nulo ({volumes[i]:.3g})")
+            return
+        for width in (4, 8):
+            group = [s for s in solids if len(s.nodes) == width]
+            if not group:
+                continue
+            points, _ = self._points([s.nodes for s in group], width)
+            volumes = solid_geometry(points)["volumes"]
+            for i in np.flatnonzero(volumes < self.tol).tolist():
+                self._add(group[i], "solid", "solid_degenerate", f"Sólido de volumen casi nulo ({volumes[i]:.3g})")
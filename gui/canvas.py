@@ -4,6 +4,8 @@ from PySide6.QtGui import QCursor, QPainter, QPen, QColor, QBrush, QMouseEvent,
 from PySide6.QtCore import Qt, Signal, QPoint, QRect, QPointF
 from OpenGL.GL import *
 import math
+import numpy as np
+from core.commands import DeleteCommand, run_command
 from PyQt5.QtWidgets import QOpenGLWidget
 class Canvas(QOpenGLWidget):
     """
@@ -14,11 +16,13 @@ class Canvas(QOpenGLWidget):
     """
     object_selected = Signal(object)     # Cuando se selecciona un objeto
     model_changed = Signal()             # Cuando cambia el modelo (agregar/borrar/editar)
+    entities_changed = Signal(object)    # ChangeSet del proyecto: qué entidades y atributos cambiaron
     selection_changed = Signal(list)     # Cuando cambia la selección
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.project = None
+        self.undo_manager = None  # UndoRedoManager de la ventana principal (si existe)
         self.selected = []
         self.zoom = 1.0
         self.pan = QPoint(0, 0)
@@ -33,7 +37,11 @@ class Canvas(QOpenGLWidget):
         self.cursor_pos = None
 
     def set_project(self, project):
+        if self.project is not None:
+            self.project.entities_changed.disconnect(self._on_entities_changed)
         self.project = project
+        if project is not None:
+            project.entities_changed.connect(self._on_entities_changed)
         self.selected = []
         self.zoom = 1.0
         self.pan = QPoint(0, 0)
@@ -121,20 +129,31 @@ class Canvas(QOpenGLWidget):
             glLineWidth(1)
 
         # --- Dibujo de nodos ---
-        for n in getattr(self.project, "nodes", []):
-            if n in self.selected:
+        # Todos los nodos en una sola llamada desde el array de coordenadas
+        nodes = getattr(self.project, "nodes", [])
+        if len(nodes):
+            xy = np.ascontiguousarray(nodes.coords[:, :2])
+            glColor3f(0, 0, 0)
+            glPointSize(8)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glVertexPointer(2, GL_DOUBLE, 0, xy)
+            glDrawArrays(GL_POINTS, 0, len(xy))
+            glDisableClientState(GL_VERTEX_ARRAY)
+        # Resaltado de seleccionados y nodo bajo el cursor
+        for n in self.selected:
+            if n in nodes:
                 glColor3f(1, 0, 0)
                 glPointSize(12)
-            elif n == self.last_hovered:
-                glColor3f(1, 0.5, 0)
-                glPointSize(14)
-            else:
-                glColor3f(0, 0, 0)
-                glPointSize(8)
+                glBegin(GL_POINTS)
+                glVertex2f(n.x, n.y)
+                glEnd()
+        if self.last_hovered in nodes and self.last_hovered not in self.selected:
+            glColor3f(1, 0.5, 0)
+            glPointSize(14)
             glBegin(GL_POINTS)
-            glVertex2f(n.x, n.y)
+            glVertex2f(self.last_hovered.x, self.last_hovered.y)
             glEnd()
-            glPointSize(1)
+        glPointSize(1)
 
         glPopMatrix()
 
@@ -149,9 +168,11 @@ class Canvas(QOpenGLWidget):
         # Etiquetas de nodos
         if self.project:
             qp.setPen(Qt.gray)
-            for n in getattr(self.project, "nodes", []):
-                p = self.model_to_screen(QPointF(n.x, n.y))
-                qp.drawText(int(p.x())+7, int(p.y())-7, f"#{n.id}")
+            nodes = getattr(self.project, "nodes", [])
+            if len(nodes):
+                screen = nodes.coords[:, :2] * self.zoom + (self.pan.x(), self.pan.y())
+                for nid, (sx, sy) in zip(nodes.ids.tolist(), screen.tolist()):
+                    qp.drawText(int(sx)+7, int(sy)-7, f"#{nid}")
         qp.end()
 
     def mousePressEvent(self, event: QMouseEvent):
@@ -229,8 +250,7 @@ class Canvas(QOpenGLWidget):
         if event.key() in (Qt.Key_Delete, Qt.Key_Backspace):
             if self.selected:
                 if QMessageBox.question(self, "Eliminar", "¿Eliminar los objetos seleccionados?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
-                    for obj in list(self.selected):
-                        self.delete_object(obj)
+                    self.delete_objects(self.selected)
                     self.selected = []
                     self.update()
         if event.key() == Qt.Key_A and (event.modifiers() & Qt.ControlModifier):
@@ -266,9 +286,13 @@ class Canvas(QOpenGLWidget):
     def find_object_at(self, pos: QPoint):
         model_pos = self.screen_to_model(pos)
         # Nodos
-        for n in getattr(self.project, "nodes", []):
-            if math.hypot(model_pos.x() - n.x, model_pos.y() - n.y) < 10 / self.zoom:
-                return n
+        nodes = getattr(self.project, "nodes", [])
+        if len(nodes):
+            xy = nodes.coords[:, :2]
+            dist = np.hypot(xy[:, 0] - model_pos.x(), xy[:, 1] - model_pos.y())
+            hits = np.flatnonzero(dist < 10 / self.zoom)
+            if len(hits):
+                return nodes[int(hits[0])]
         # Barras
         for b in getattr(self.project, "bars", []):
             if self.point_near_segment(model_pos, b.n1, b.n2, tol=7 / self.zoom):
@@ -285,9 +309,12 @@ class Canvas(QOpenGLWidget):
         x_min, x_max = min(top_left.x(), bottom_right.x()), max(top_left.x(), bottom_right.x())
         y_min, y_max = min(top_left.y(), bottom_right.y()), max(top_left.y(), bottom_right.y())
         objs = []
-        for n in getattr(self.project, "nodes", []):
-            if x_min <= n.x <= x_max and y_min <= n.y <= y_max:
-                objs.append(n)
+        nodes = getattr(self.project, "nodes", [])
+        if len(nodes):
+            xy = nodes.coords[:, :2]
+            inside = ((xy[:, 0] >= x_min) & (xy[:, 0] <= x_max) &
+                      (xy[:, 1] >= y_min) & (xy[:, 1] <= y_max))
+            objs.extend(nodes[i] for i in np.flatnonzero(inside).tolist())
         for b in getattr(self.project, "bars", []):
             if (x_min <= b.n1.x <= x_max and y_min <= b.n1.y <= y_max and
                 x_min <= b.n2.x <= x_max and y_min <= b.n2.y <= y_max):
@@ -343,12 +370,11 @@ class Canvas(QOpenGLWidget):
 
     def zoom_fit(self):
         nodes = getattr(self.project, "nodes", [])
-        if not nodes:
+        if not len(nodes):
             return
-        min_x = min(n.x for n in nodes)
-        max_x = max(n.x for n in nodes)
-        min_y = min(n.y for n in nodes)
-        max_y = max(n.y for n in nodes)
+        xy = nodes.coords[:, :2]
+        min_x, min_y = xy.min(axis=0).tolist()
+        max_x, max_y = xy.max(axis=0).tolist()
         w = max_x - min_x + 30
         h = max_y - min_y + 30
         scale_x = self.width() / w
@@ -361,13 +387,17 @@ class Canvas(QOpenGLWidget):
         self.update()
         self.model_changed.emit()
 
+    def _on_entities_changed(self, changes):
+        # Reenvía el ChangeSet para que los paneles actualicen solo lo afectado
+        self.update()
+        self.entities_changed.emit(changes)
+
     def delete_object(self, obj):
-        changed = False
-        for coll in ("nodes", "bars", "shells", "solids"):
-            items = getattr(self.project, coll, [])
-            if obj in items:
-                items.remove(obj)
-                changed = True
+        return self.delete_objects([obj])
+
+    def delete_objects(self, objs):
+        """Elimina una selección (con borrado en cascada) en una sola operación del modelo."""
+        changed = bool(self.project) and bool(run_command(DeleteCommand(self.project, objs), self.undo_manager))
         if changed:
             self.update_model()
-        return changed
\ No newline at end of file
+        return changed
@@ -60,9 +60,9 @@ class AuxArcDialog(QDialog):
         n1_id = self.n1_combo.currentData()
         n2_id = self.n2_combo.currentData()
         n3_id = self.n3_combo.currentData()
-        n1 = next((n for n in self.project.nodes if n.id == n1_id), None)
-        n2 = next((n for n in self.project.nodes if n.id == n2_id), None)
-        n3 = next((n for n in self.project.nodes if n.id == n3_id), None)
+        n1 = self.project.get_node(n1_id)
+        n2 = self.project.get_node(n2_id)
+        n3 = self.project.get_node(n3_id)
         if not n1 or not n2 or not n3 or len({n1.id, n2.id, n3.id}) < 3:
             QMessageBox.warning(self, "Error", "Debes seleccionar tres nodos distintos.")
             return
@@ -62,8 +62,8 @@ class AuxCircleDialog(QDialog):
     def accept(self):
         center_id = self.center_combo.currentData()
         radius_id = self.radius_combo.currentData()
-        center = next((n for n in self.project.nodes if n.id == center_id), None)
-        radius_node = next((n for n in self.project.nodes if n.id == radius_id), None)
+        center = self.project.get_node(center_id)
+        radius_node = self.project.get_node(radius_id)
         if not center or not radius_node or center.id == radius_node.id:
             QMessageBox.warning(self, "Error", "Debes seleccionar dos nodos distintos para centro y radio.")
             return
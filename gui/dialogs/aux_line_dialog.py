@@ -54,8 +54,8 @@ class AuxLineDialog(QDialog):
     def accept(self):
         n1_id = self.n1_combo.currentData()
         n2_id = self.n2_combo.currentData()
-        n1 = next((n for n in self.project.nodes if n.id == n1_id), None)
-        n2 = next((n for n in self.project.nodes if n.id == n2_id), None)
+        n1 = self.project.get_node(n1_id)
+        n2 = self.project.get_node(n2_id)
         if not n1 or not n2 or n1.id == n2.id:
             QMessageBox.warning(self, "Error", "Debes seleccionar dos nodos distintos.")
             return
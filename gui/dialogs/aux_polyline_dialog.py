@@ -49,7 +49,7 @@ class AuxPolylineDialog(QDialog):
 
     def add_node(self):
         node_id = self.node_combo.currentData()
-        node = next((n for n in self.project.nodes if n.id == node_id), None)
+        node = self.project.get_node(node_id)
         if not node:
             return
         # Evita repetir nodos
@@ -72,7 +72,7 @@ class AuxPolylineDialog(QDialog):
         if len(node_ids) < 2:
             QMessageBox.warning(self, "Error", "Debes agregar al menos dos nodos.")
             return
-        nodes = [n for n in self.project.nodes if n.id in node_ids]
+        nodes = [n for n in map(self.project.get_node, node_ids) if n is not None]
         if len(nodes) != len(node_ids):
             QMessageBox.warning(self, "Error", "Algún nodo no es válido.")
             return
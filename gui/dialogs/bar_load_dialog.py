@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import AssignLoadCommand, SetPropertyCommand, run_command
+
 class BarLoadDialog(QDialog):
     def __init__(self, project, bar_load=None, parent=None):
         super().__init__(parent)
@@ -107,7 +109,7 @@ class BarLoadDialog(QDialog):
 
     def accept(self):
         bar_id = self.bar_combo.currentData()
-        bar = next((b for b in self.project.bars if b.id == bar_id), None)
+        bar = self.project.get_bar(bar_id)
         if not bar:
             QMessageBox.warning(self, "Error", "Barra no válida.")
             return
@@ -119,18 +121,16 @@ class BarLoadDialog(QDialog):
         q2 = self.q2_spin.value()
         position = self.pos_spin.value()
         magnitude = self.mag_spin.value()
+        manager = getattr(self.parent(), "undo_manager", None)
         if self.bar_load is not None:
-            self.bar_load.bar = bar
-            self.bar_load.case = case
-            self.bar_load.type = load_type
-            self.bar_load.direction = direction
-            self.bar_load.q1 = q1
-            self.bar_load.q2 = q2
-            self.bar_load.position = position
-            self.bar_load.magnitude = magnitude
+            values = {"bar": bar, "case": case, "type": load_type, "direction": direction,
+                      "q1": q1, "q2": q2, "position": position, "magnitude": magnitude}
+            run_command(SetPropertyCommand(self.project, self.bar_load, values), manager)
         else:
-            self.bar_load = self.project.add_bar_load(bar, q1, q2, load_type, direction, position, magnitude, case)
+            command = AssignLoadCommand(self.project, bar, q1, q2, direction, load_type, case=case,
+                                        position=position, magnitude=magnitude)
+            self.bar_load = run_command(command, manager)
         super().accept()
 
     def get_bar_load(self):
-        return self.bar_load
\ No newline at end of file
+        return self.bar_load
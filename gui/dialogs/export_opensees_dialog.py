@@ -29,7 +29,8 @@ class ExportOpenSeesDialog(QDialog):
         self.format_combo = QComboBox()
         self.format_combo.addItems([
             "Script TCL (OpenSees clásico)",
-            "Script JSON (OpenSeesPy, experimental)"
+            "Script JSON (OpenSeesPy, experimental)",
+            "JSON columnar (OpenSeesPy + NumPy, compacto)"
         ])
         form.addRow("Formato", self.format_combo)
 
@@ -75,23 +76,31 @@ class ExportOpenSeesDialog(QDialog):
         with_comments = self.cb_comments.isChecked()
         with_groups = self.cb_groups.isChecked()
         # Llama al método de exportación del modelo
+        warnings = []
         try:
             if fmt.startswith("Script TCL"):
-                self.project.export_to_opensees_tcl(
+                warnings = self.project.export_to_opensees_tcl(
                     filepath,
                     only_geometry=only_geom,
                     comments=with_comments,
                     groups=with_groups
                 )
-            elif fmt.startswith("Script JSON"):
-                self.project.export_to_opensees_json(
+            elif fmt.startswith("Script JSON") or fmt.startswith("JSON columnar"):
+                warnings = self.project.export_to_opensees_json(
                     filepath,
                     only_geometry=only_geom,
                     comments=with_comments,
-                    groups=with_groups
+                    groups=with_groups,
+                    columnar=fmt.startswith("JSON columnar")
                 )
         except Exception as e:
             from PySide6.QtWidgets import QMessageBox
             QMessageBox.critical(self, "Error de exportación", str(e))
             return
-        super().accept()
\ No newline at end of file
+        if warnings:
+            from PySide6.QtWidgets import QMessageBox
+            shown = "\n".join(warnings[:20])
+            if len(warnings) > 20:
+                shown += f"\n... y {len(warnings) - 20} más"
+            QMessageBox.warning(self, "Elementos duplicados omitidos", shown)
+        super().accept()
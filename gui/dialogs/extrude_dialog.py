@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import ExtrudeCommand, run_command
+
 class ExtrudeDialog(QDialog):
     def __init__(self, project, parent=None):
         super().__init__(parent)
@@ -99,23 +101,28 @@ class ExtrudeDialog(QDialog):
         if length <= 0 or (dir_x == 0 and dir_y == 0 and dir_z == 0):
             QMessageBox.warning(self, "Error", "Debes ingresar una longitud y una dirección válidas.")
             return
-        # Lógica: delega a métodos del modelo
+        # Lógica: delega en el modelo a través de un comando deshacible
+        base = None
         if extrude_type == "Nodo → Barra":
-            base = next((n for n in self.project.nodes if n.id == base_id), None)
+            base = self.project.get_node(base_id)
             if not base:
                 QMessageBox.warning(self, "Error", "Nodo base no válido.")
                 return
-            self.project.extrude_node_to_bars(base, ndivs, length, (dir_x, dir_y, dir_z))
         elif extrude_type == "Barra → Shell":
-            base = next((b for b in self.project.bars if b.id == base_id), None)
+            base = self.project.get_bar(base_id)
             if not base:
                 QMessageBox.warning(self, "Error", "Barra base no válida.")
                 return
-            self.project.extrude_bar_to_shells(base, ndivs, length, (dir_x, dir_y, dir_z))
         elif extrude_type == "Shell → Sólido":
-            base = next((s for s in self.project.shells if s.id == base_id), None)
+            base = self.project.get_shell(base_id)
             if not base:
                 QMessageBox.warning(self, "Error", "Shell base no válido.")
                 return
-            self.project.extrude_shell_to_solids(base, ndivs, length, (dir_x, dir_y, dir_z))
-        super().accept()
\ No newline at end of file
+        if base is not None:
+            command = ExtrudeCommand(self.project, base, ndivs, length, (dir_x, dir_y, dir_z))
+            try:
+                run_command(command, getattr(self.parent(), "undo_manager", None))
+            except ValueError as e:
+                QMessageBox.warning(self, "Error", str(e))
+                return
+        super().accept()
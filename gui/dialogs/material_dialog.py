@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import AddMaterialCommand, SetPropertyCommand, run_command
+
 class MaterialDialog(QDialog):
     def __init__(self, project, material=None, parent=None):
         super().__init__(parent)
@@ -103,13 +105,13 @@ class MaterialDialog(QDialog):
         for k, editor in self.params_editors.items():
             params[k] = editor.value()
         # Crear o editar material
+        manager = getattr(self.parent(), "undo_manager", None)
         if self.material is not None:
-            self.material.name = name
-            self.material.type = mat_type
-            self.material.params = params
+            values = {"name": name, "type": mat_type, "params": params}
+            run_command(SetPropertyCommand(self.project, self.material, values), manager)
         else:
-            self.material = self.project.add_material(name, mat_type, params)
+            self.material = run_command(AddMaterialCommand(self.project, name, mat_type, params), manager)
         super().accept()
 
     def get_material(self):
-        return self.material
\ No newline at end of file
+        return self.material
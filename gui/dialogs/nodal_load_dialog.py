@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import AssignLoadCommand, SetPropertyCommand, run_command
+
 class NodalLoadDialog(QDialog):
     def __init__(self, project, nodal_load=None, parent=None):
         super().__init__(parent)
@@ -65,7 +67,7 @@ class NodalLoadDialog(QDialog):
 
     def accept(self):
         node_id = self.node_combo.currentData()
-        node = next((n for n in self.project.nodes if n.id == node_id), None)
+        node = self.project.get_node(node_id)
         if not node:
             QMessageBox.warning(self, "Error", "Nodo no válido.")
             return
@@ -77,19 +79,15 @@ class NodalLoadDialog(QDialog):
         mx = self.editors["mx"].value()
         my = self.editors["my"].value()
         mz = self.editors["mz"].value()
+        manager = getattr(self.parent(), "undo_manager", None)
         if self.nodal_load is not None:
-            self.nodal_load.node = node
-            self.nodal_load.case = case
-            self.nodal_load.fx = fx
-            self.nodal_load.fy = fy
-            self.nodal_load.fz = fz
-            self.nodal_load.mx = mx
-            self.nodal_load.my = my
-            self.nodal_load.mz = mz
+            values = {"node": node, "case": case, "fx": fx, "fy": fy, "fz": fz,
+                      "mx": mx, "my": my, "mz": mz}
+            run_command(SetPropertyCommand(self.project, self.nodal_load, values), manager)
         else:
-            # Debe haber un método en el modelo para agregar la carga
-            self.nodal_load = self.project.add_nodal_load(node, fx, fy, fz, mx, my, mz, case)
+            command = AssignLoadCommand(self.project, node, fx, fy, fz, mx, my, mz, case)
+            self.nodal_load = run_command(command, manager)
         super().accept()
 
     def get_nodal_load(self):
-        return self.nodal_load
\ No newline at end of file
+        return self.nodal_load
@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import AddSectionCommand, SetPropertyCommand, run_command
+
 class SectionDialog(QDialog):
     def __init__(self, project, section=None, parent=None):
         super().__init__(parent)
@@ -123,14 +125,14 @@ class SectionDialog(QDialog):
         for k, editor in self.params_editors.items():
             params[k] = editor.value()
         # Crear o editar sección
+        manager = getattr(self.parent(), "undo_manager", None)
         if self.section is not None:
-            self.section.name = name
-            self.section.type = sec_type
-            self.section.params = params
-            self.section.material = material
+            values = {"name": name, "type": sec_type, "params": params, "material": material}
+            run_command(SetPropertyCommand(self.project, self.section, values), manager)
         else:
-            self.section = self.project.add_section(name, sec_type, params, material)
+            command = AddSectionCommand(self.project, name, sec_type, params, material)
+            self.section = run_command(command, manager)
         super().accept()
 
     def get_section(self):
-        return self.section
\ No newline at end of file
+        return self.section
@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import AssignLoadCommand, SetPropertyCommand, run_command
+
 class ShellLoadDialog(QDialog):
     def __init__(self, project, shell_load=None, parent=None):
         super().__init__(parent)
@@ -58,7 +60,8 @@ class ShellLoadDialog(QDialog):
         self.q_spin = QDoubleSpinBox()
         self.q_spin.setDecimals(4)
         self.q_spin.setRange(-1e8, 1e8)
-        self.q_spin.setValue(getattr(shell_load, "q", 0.0))
+        q = getattr(shell_load, "q", None) or [0.0]
+        self.q_spin.setValue(q[0])  # La carga se reparte igual en todos los nodos
         form.addRow("q [kN/m²]", self.q_spin)
         self.editors["q"] = self.q_spin
 
@@ -76,7 +79,7 @@ class ShellLoadDialog(QDialog):
 
     def accept(self):
         shell_id = self.shell_combo.currentData()
-        shell = next((s for s in self.project.shells if s.id == shell_id), None)
+        shell = self.project.get_shell(shell_id)
         if not shell:
             QMessageBox.warning(self, "Error", "Shell no válido.")
             return
@@ -84,16 +87,15 @@ class ShellLoadDialog(QDialog):
         case = case_id if case_id is not None else ""
         load_type = self.type_combo.currentText()
         direction = self.dir_combo.currentText()
-        q = self.q_spin.value()
+        q = [self.q_spin.value()] * len(shell.nodes)  # Un valor por nodo del shell
+        manager = getattr(self.parent(), "undo_manager", None)
         if self.shell_load is not None:
-            self.shell_load.shell = shell
-            self.shell_load.case = case
-            self.shell_load.type = load_type
-            self.shell_load.direction = direction
-            self.shell_load.q = q
+            values = {"shell": shell, "case": case, "type": load_type, "direction": direction, "q": q}
+            run_command(SetPropertyCommand(self.project, self.shell_load, values), manager)
         else:
-            self.shell_load = self.project.add_shell_load(shell, q, load_type, direction, case)
+            command = AssignLoadCommand(self.project, shell, q=q, direction=direction, type_=load_type, case=case)
+            self.shell_load = run_command(command, manager)
         super().accept()
 
     def get_shell_load(self):
-        return self.shell_load
\ No newline at end of file
+        return self.shell_load
@@ -1,66 +1,56 @@
 from PySide6.QtWidgets import (
-    QDialog, QVBoxLayout, QFormLayout, QComboBox, QDoubleSpinBox,
-    QPushButton, QLabel, QHBoxLayout, QMessageBox
+    QDialog, QVBoxLayout, QFormLayout, QComboBox, QCheckBox,
+    QPushButton, QHBoxLayout, QMessageBox
 )
-from PySide6.QtCore import Qt
 
-class ShellLoadDialog(QDialog):
-    def __init__(self, project, shell_load=None, parent=None):
+from core.commands import AssignSupportCommand, SetPropertyCommand, run_command
+
+class SupportDialog(QDialog):
+    # Tipo de apoyo -> restricciones [Tx, Ty, Tz, Rx, Ry, Rz] (None: las que se marquen)
+    TYPES = {
+        "fixed": [True] * 6,
+        "pinned": [True, True, True, False, False, False],
+        "custom": None,
+    }
+    DOFS = ("Tx", "Ty", "Tz", "Rx", "Ry", "Rz")
+
+    def __init__(self, project, support=None, parent=None):
         super().__init__(parent)
-        self.setWindowTitle("Carga en Shell")
+        self.setWindowTitle("Apoyo")
         self.project = project
-        self.shell_load = shell_load
+        self.support = support  # Puede ser None para nuevo apoyo
 
         self.layout = QVBoxLayout(self)
         form = QFormLayout()
-        self.editors = {}
-
-        # Shell asociado
-        self.shell_combo = QComboBox()
-        for s in self.project.shells:
-            nids = "-".join(str(n.id) for n in s.nodes)
-            self.shell_combo.addItem(f"#{s.id} [{nids}]", s.id)
-        if shell_load is not None:
-            idx = self.shell_combo.findData(shell_load.shell.id)
-            if idx >= 0:
-                self.shell_combo.setCurrentIndex(idx)
-        form.addRow("Shell", self.shell_combo)
 
-        # Caso de carga
-        self.case_combo = QComboBox()
-        for lc in getattr(self.project, "load_cases", []):
-            self.case_combo.addItem(f"{lc.name} (#{lc.id})", lc.id)
-        if shell_load is not None and hasattr(shell_load, "case"):
-            idx = self.case_combo.findData(shell_load.case)
+        # Nodo asociado
+        self.node_combo = QComboBox()
+        for n in self.project.nodes:
+            self.node_combo.addItem(f"#{n.id} ({n.x:.2f},{n.y:.2f},{n.z:.2f})", n.id)
+        if support is not None:
+            idx = self.node_combo.findData(support.node.id)
             if idx >= 0:
-                self.case_combo.setCurrentIndex(idx)
-        form.addRow("Caso de carga", self.case_combo)
+                self.node_combo.setCurrentIndex(idx)
+        form.addRow("Nodo", self.node_combo)
 
-        # Tipo de carga (uniforme, trapezoidal, puntual, etc.)
+        # Tipo de apoyo
         self.type_combo = QComboBox()
-        self.type_combo.addItems(["Uniforme", "Trapezoidal", "Puntual"])
-        if shell_load is not None and hasattr(shell_load, "type"):
-            idx = self.type_combo.findText(shell_load.type)
-            if idx >= 0:
-                self.type_combo.setCurrentIndex(idx)
+        self.type_combo.addItems(list(self.TYPES))
+        if support is not None:
+            idx = self.type_combo.findText(support.type)
+            self.type_combo.setCurrentIndex(idx if idx >= 0 else self.type_combo.findText("custom"))
         form.addRow("Tipo", self.type_combo)
 
-        # Dirección (Global Z, Local Z, etc.)
-        self.dir_combo = QComboBox()
-        self.dir_combo.addItems(["Global Z", "Local Z"])
-        if shell_load is not None and hasattr(shell_load, "direction"):
-            idx = self.dir_combo.findText(shell_load.direction)
-            if idx >= 0:
-                self.dir_combo.setCurrentIndex(idx)
-        form.addRow("Dirección", self.dir_combo)
-
-        # Magnitud (q)
-        self.q_spin = QDoubleSpinBox()
-        self.q_spin.setDecimals(4)
-        self.q_spin.setRange(-1e8, 1e8)
-        self.q_spin.setValue(getattr(shell_load, "q", 0.0))
-        form.addRow("q [kN/m²]", self.q_spin)
-        self.editors["q"] = self.q_spin
+        # Restricciones por grado de libertad
+        restraints = list(support.restraints) if support is not None else self.TYPES["fixed"]
+        self.restraint_checks = []
+        for dof, fixed in zip(self.DOFS, restraints):
+            check = QCheckBox()
+            check.setChecked(bool(fixed))
+            form.addRow(dof, check)
+            self.restraint_checks.append(check)
+        self.type_combo.currentTextChanged.connect(self._update_restraints)
+        self._update_restraints(self.type_combo.currentText())
 
         self.layout.addLayout(form)
 
@@ -74,26 +64,30 @@ class ShellLoadDialog(QDialog):
         btns.addWidget(self.cancel_btn)
         self.layout.addLayout(btns)
 
+    def _update_restraints(self, type_):
+        # Los tipos predefinidos fijan las casillas; "custom" deja editarlas
+        restraints = self.TYPES.get(type_)
+        for i, check in enumerate(self.restraint_checks):
+            if restraints is not None:
+                check.setChecked(restraints[i])
+            check.setEnabled(restraints is None)
+
     def accept(self):
-        shell_id = self.shell_combo.currentData()
-        shell = next((s for s in self.project.shells if s.id == shell_id), None)
-        if not shell:
-            QMessageBox.warning(self, "Error", "Shell no válido.")
+        node_id = self.node_combo.currentData()
+        node = self.project.get_node(node_id)
+        if not node:
+            QMessageBox.warning(self, "Error", "Nodo no válido.")
             return
-        case_id = self.case_combo.currentData()
-        case = case_id if case_id is not None else ""
-        load_type = self.type_combo.currentText()
-        direction = self.dir_combo.currentText()
-        q = self.q_spin.value()
-        if self.shell_load is not None:
-            self.shell_load.shell = shell
-            self.shell_load.case = case
-            self.shell_load.type = load_type
-            self.shell_load.direction = direction
-            self.shell_load.q = q
+        type_ = self.type_combo.currentText()
+        restraints = [check.isChecked() for check in self.restraint_checks]
+        manager = getattr(self.parent(), "undo_manager", None)
+        if self.support is not None:
+            values = {"node": node, "type": type_, "restraints": restraints}
+            run_command(SetPropertyCommand(self.project, self.support, values), manager)
         else:
-            self.shell_load = self.project.add_shell_load(shell, q, load_type, direction, case)
+            command = AssignSupportCommand(self.project, node, restraints, type_)
+            self.support = run_command(command, manager)
         super().accept()
 
-    def get_shell_load(self):
-        return self.shell_load
\ No newline at end of file
+    def get_support(self):
+        return self.support
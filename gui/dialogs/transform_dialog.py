@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from core.commands import MoveCommand, CopyCommand, RotateCommand, ScaleCommand, run_command
+
 class TransformDialog(QDialog):
     """
     Diálogo para transformaciones geométricas: mover, copiar, rotar, escalar.
@@ -126,19 +128,21 @@ class TransformDialog(QDialog):
         if not self.selection:
             QMessageBox.warning(self, "Error", "No hay objetos seleccionados.")
             return
+        # Cada transformación es un comando deshacible (guarda solo la matriz)
+        manager = getattr(self.parent(), "undo_manager", None)
         if t == "Mover":
             dx, dy, dz = self.dx_spin.value(), self.dy_spin.value(), self.dz_spin.value()
-            self.project.move_objects(self.selection, dx, dy, dz)
+            run_command(MoveCommand(self.project, self.selection, dx, dy, dz), manager)
         elif t == "Copiar":
             dx, dy, dz = self.dx_spin.value(), self.dy_spin.value(), self.dz_spin.value()
             n = self.ncopies_spin.value()
-            self.project.copy_objects(self.selection, dx, dy, dz, n)
+            run_command(CopyCommand(self.project, self.selection, dx, dy, dz, n), manager)
         elif t == "Rotar":
             cx, cy, cz = self.cx_spin.value(), self.cy_spin.value(), self.cz_spin.value()
             angle = self.angle_spin.value()
-            self.project.rotate_objects(self.selection, cx, cy, cz, angle)
+            run_command(RotateCommand(self.project, self.selection, cx, cy, cz, angle), manager)
         elif t == "Escalar":
             sx, sy, sz = self.sx_spin.value(), self.sy_spin.value(), self.sz_spin.value()
             cx, cy, cz = self.s_cx_spin.value(), self.s_cy_spin.value(), self.s_cz_spin.value()
-            self.project.scale_objects(self.selection, sx, sy, sz, cx, cy, cz)
-        super().accept()
\ No newline at end of file
+            run_command(ScaleCommand(self.project, self.selection, sx, sy, sz, cx, cy, cz), manager)
+        super().accept()
@@ -1,12 +1,15 @@
 from PySide6.QtGui import QAction
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QToolBar, QMessageBox, QSizePolicy,
-    QSplitter, QFileDialog, QMenuBar, QMenu
+    QSplitter, QFileDialog, QMenuBar, QMenu, QInputDialog, QProgressDialog
 )
 from PySide6.QtGui import QIcon, QKeySequence
 from PySide6.QtCore import QSize, Qt
 
 from core.undo_redo_manager import UndoRedoManager
+from core.autosave import Autosave
+from model.project import Project
+from core.commands import MergeNodesCommand, ImportOpenSeesCommand, ImportTablesCommand, run_command
 from gui.dialogs.export_opensees_dialog import ExportOpenSeesDialog
 from gui.dialogs.snapping_dialog import SnappingDialog
 from gui.dialogs.object_selector_dialog import ObjectSelectorDialog
@@ -21,6 +24,7 @@ from gui.dialogs.extrude_dialog import ExtrudeDialog
 from gui import canvas
 from gui.widgets.properties_panel import PropertiesPanel
 from gui.widgets.navigation_tree import NavigationTree
+from gui.widgets.issues_panel import IssuesPanel
 
 class MainWindow(QMainWindow):
     def __init__(self, parent=None):
@@ -34,9 +38,30 @@ class MainWindow(QMainWindow):
         self.canvas = canvas(self)
         self.properties_panel = PropertiesPanel(self.canvas)
         self.tree = NavigationTree(self.canvas, self.properties_panel, parent=self)
+        self.issues_panel = IssuesPanel(self.canvas)
+        self.issues_panel.issue_selected.connect(self.properties_panel.show_properties)
+        # Cambios finos del modelo: cada panel actualiza solo lo afectado
+        self.canvas.entities_changed.connect(self.tree.apply_changes)
+        self.canvas.entities_changed.connect(self.properties_panel.apply_changes)
 
         # --- Undo/Redo Manager ---
         self.undo_manager = UndoRedoManager()
+        self.canvas.undo_manager = self.undo_manager
+
+        # --- Proyecto y autoguardado (con recuperación si la sesión anterior no se cerró bien) ---
+        project = Project()
+        offered = self.recover_autosave(project)
+        self.canvas.set_project(project)
+        self.undo_manager.set_project(project)
+        self.issues_panel.set_project(project)
+        self.tree.refresh()
+        self.autosave = Autosave(project)
+        try:
+            # Una vez ofrecida la recuperación, el autoguardado anterior se puede descartar
+            self.autosave.start(discard=offered)
+        except RuntimeError as e:
+            self.autosave = None
+            QMessageBox.warning(self, "Autoguardado", f"El autoguardado queda desactivado en esta sesión:\n{e}")
 
         # --- Panel izquierdo: árbol + propiedades ---
         left_widget = QWidget()
@@ -45,6 +70,7 @@ class MainWindow(QMainWindow):
         left_widget.setMinimumWidth(80)
         left_layout.addWidget(self.tree, stretch=1)
         left_layout.addWidget(self.properties_panel, stretch=0)
+        left_layout.addWidget(self.issues_panel, stretch=0)
         left_widget.setLayout(left_layout)
 
         # --- Panel derecho: barra de herramientas + canvas ---
@@ -192,10 +218,26 @@ class MainWindow(QMainWindow):
         transformar_action.triggered.connect(self.open_transform_dialog)
         herramientas_menu.addAction(transformar_action)
 
+        fusionar_action = QAction("Fusionar nodos coincidentes...", self)
+        fusionar_action.triggered.connect(self.merge_coincident_nodes)
+        herramientas_menu.addAction(fusionar_action)
+
+        validar_action = QAction("Validar modelo", self)
+        validar_action.triggered.connect(self.issues_panel.validate)
+        herramientas_menu.addAction(validar_action)
+
         exportar_action = QAction("Exportar a OpenSees...", self)
         exportar_action.triggered.connect(self.open_export_opensees_dialog)
         herramientas_menu.addAction(exportar_action)
 
+        importar_action = QAction("Importar de OpenSees...", self)
+        importar_action.triggered.connect(self.import_opensees)
+        herramientas_menu.addAction(importar_action)
+
+        tablas_action = QAction("Importar tabla de nodos/elementos...", self)
+        tablas_action.triggered.connect(self.import_table)
+        herramientas_menu.addAction(tablas_action)
+
     # --- Métodos de integración Undo/Redo y diálogos avanzados ---
 
     def on_undo(self):
@@ -235,11 +277,77 @@ class MainWindow(QMainWindow):
         if dlg.exec():
             self.canvas.update()
 
+    def merge_coincident_nodes(self):
+        project = self.canvas.project
+        if project is None:
+            return
+        tol, ok = QInputDialog.getDouble(self, "Fusionar nodos", "Tolerancia:", 1e-3, 0.0, 1e6, 6)
+        if not ok or tol <= 0:
+            return
+        # Si hay nodos seleccionados solo se fusionan esos
+        nodes = [o for o in self.selected if project.kind_of(o) == "node"] or None
+        merged = run_command(MergeNodesCommand(project, tol, nodes), self.undo_manager)
+        self.canvas.update()
+        QMessageBox.information(self, "Fusionar nodos", f"Nodos fusionados: {len(merged)}")
+
     def open_export_opensees_dialog(self):
         dlg = ExportOpenSeesDialog(self.canvas.project, self)
         if dlg.exec():
             QMessageBox.information(self, "Exportación", "Exportación completada con éxito.")
 
+    def import_opensees(self):
+        project = self.canvas.project
+        if project is None:
+            return
+        filepath, _ = QFileDialog.getOpenFileName(self, "Importar de OpenSees", "",
+                                                  "OpenSees (*.tcl *.json);;Todos los archivos (*)")
+        if not filepath:
+            return
+        try:
+            warnings = run_command(ImportOpenSeesCommand(project, filepath), self.undo_manager)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Importación", f"No se pudo importar el modelo:\n{e}")
+            return
+        self.canvas.update()
+        if warnings:
+            QMessageBox.warning(self, "Importación", "Importación completada con avisos:\n" + "\n".join(warnings))
+        else:
+            QMessageBox.information(self, "Importación", "Importación completada con éxito.")
+
+    def import_table(self):
+        project = self.canvas.project
+        if project is None:
+            return
+        tables = {"Nodos": "nodes", "Barras": "bars", "Shells": "shells", "Sólidos": "solids"}
+        label, ok = QInputDialog.getItem(self, "Importar tabla", "Contenido de la tabla:", list(tables), 0, False)
+        if not ok:
+            return
+        filepath, _ = QFileDialog.getOpenFileName(self, "Importar tabla", "",
+                                                  "Tablas (*.csv *.txt *.dat);;Todos los archivos (*)")
+        if not filepath:
+            return
+        dlg = QProgressDialog("Importando...", "Cancelar", 0, 1000, self)
+        dlg.setWindowModality(Qt.WindowModal)
+        dlg.setMinimumDuration(500)
+
+        def progress(done, total):
+            dlg.setValue(int(1000 * done / total) if total else 1000)
+            return not dlg.wasCanceled()
+
+        try:
+            counts = run_command(ImportTablesCommand(project, progress, **{tables[label]: filepath}),
+                                 self.undo_manager)
+        except InterruptedError:
+            return
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Importar tabla", f"No se pudo importar la tabla:\n{e}")
+            return
+        finally:
+            dlg.close()
+        self.canvas.update()
+        QMessageBox.information(self, "Importar tabla", "Importados: " +
+                                ", ".join(f"{n} {kind}" for kind, n in counts.items()))
+
     # --- Métodos de barra de herramientas, integrando tus diálogos clásicos y nuevos ---
     def set_mode(self, modo):
         if hasattr(self.canvas, "set_mode"):
@@ -312,6 +420,25 @@ class MainWindow(QMainWindow):
         if dlg.exec():
             self.canvas.update()
 
+    def recover_autosave(self, project):
+        """
+        Ofrece recuperar el autoguardado de una sesión que no se cerró bien.
+        Devuelve False si la recuperación falló: el autoguardado se conserva.
+        """
+        if not Autosave.needs_recovery():
+            return True
+        res = QMessageBox.question(self, "Recuperar",
+                                   "La sesión anterior no se cerró correctamente.\n"
+                                   "¿Desea recuperar el autoguardado?")
+        if res != QMessageBox.Yes:
+            return True
+        try:
+            Autosave.recover(project)
+        except Exception as e:
+            QMessageBox.warning(self, "Recuperar", f"No se pudo recuperar el autoguardado:\n{e}")
+            return False
+        return True
+
     # --- Manejo de cierre de la ventana ---
     def closeEvent(self, event):
         # Si tienes control de cambios, puedes preguntar aquí si guardar antes de salir
@@ -322,4 +449,6 @@ class MainWindow(QMainWindow):
         #     elif res == QMessageBox.Cancel:
         #         event.ignore()
         #         return
-        event.accept()
\ No newline at end of file
+        if self.autosave is not None:
+            self.autosave.stop()
+        event.accept()
@@ -0,0 +1,73 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem
+)
+from PySide6.QtCore import Qt, Signal
+
+from core.validation import ModelValidator
+
+
+class IssuesPanel(QWidget):
+    """
+    Lista de problemas del modelo (validación incremental).
+    Al hacer clic en un problema se selecciona la entidad afectada en el canvas.
+    """
+    issue_selected = Signal(object)  # Entidad del problema seleccionado
+
+    LABELS = {"node": "Nodo", "bar": "Barra", "shell": "Shell", "solid": "Sólido",
+              "nodal_load": "Carga nodal", "bar_load": "Carga en barra",
+              "shell_load": "Carga en shell", "support": "Apoyo"}
+
+    def __init__(self, canvas, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.validator = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        header = QHBoxLayout()
+        self.summary_label = QLabel("Validación")
+        header.addWidget(self.summary_label, stretch=1)
+        self.validate_btn = QPushButton("Validar")
+        self.validate_btn.clicked.connect(self.validate)
+        header.addWidget(self.validate_btn)
+        layout.addLayout(header)
+        self.list = QListWidget()
+        self.list.itemClicked.connect(self.on_item_clicked)
+        layout.addWidget(self.list)
+
+    def set_project(self, project):
+        """Descarta el validador del proyecto anterior (deja de escuchar sus cambios) y vacía la lista."""
+        if self.validator is not None and self.validator.project is not project:
+            self.validator.close()
+            self.validator = None
+            self.list.clear()
+            self.summary_label.setText("Validación")
+
+    def validate(self):
+        project = getattr(self.canvas, "project", None)
+        if project is None:
+            return
+        # El validador vive mientras no cambie el proyecto: solo revalida lo modificado
+        self.set_project(project)
+        if self.validator is None:
+            self.validator = ModelValidator(project)
+        self.show_issues(self.validator.run())
+
+    def show_issues(self, issues):
+        self.list.clear()
+        errors = sum(1 for i in issues if i.severity == "error")
+        self.summary_label.setText(f"Errores: {errors}  Avisos: {len(issues) - errors}")
+        for issue in issues:
+            label = self.LABELS.get(issue.kind, issue.kind)
+            prefix = "⚠" if issue.severity == "warning" else "✖"
+            item = QListWidgetItem(f"{prefix} {label} #{issue.obj.id}: {issue.message}")
+            item.setData(Qt.UserRole, issue.obj)
+            self.list.addItem(item)
+
+    def on_item_clicked(self, item):
+        obj = item.data(Qt.UserRole)
+        if obj is None:
+            return
+        self.issue_selected.emit(obj)
+        if hasattr(self.canvas, "set_selected"):
+            self.canvas.set_selected([obj])
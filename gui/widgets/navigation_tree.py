@@ -10,10 +10,15 @@ class NavigationTree(QTreeWidget):
     """
     object_selected = Signal(object)
 
+    # Tipos de entidad del proyecto que se muestran (y se actualizan de forma incremental)
+    KIND_CATEGORIES = {"node": "Nodos", "bar": "Barras", "shell": "Shells", "solid": "Sólidos"}
+
     def __init__(self, canvas, properties_panel, parent=None):
         super().__init__(parent)
         self.canvas = canvas
         self.properties_panel = properties_panel
+        self._items = {}       # (tipo, id) -> QTreeWidgetItem
+        self._categories = {}  # tipo -> QTreeWidgetItem de su categoría
         self.setColumnCount(1)
         self.setHeaderLabels(["Modelo"])
         self.setSelectionMode(QTreeWidget.ExtendedSelection)
@@ -27,9 +32,12 @@ class NavigationTree(QTreeWidget):
         Reconstruye el árbol a partir del contenido actual del modelo.
         """
         self.clear()
+        self._items = {}
+        self._categories = {}
         project = getattr(self.canvas, "project", None)
         if project is None:
             return
+        kinds = {name: kind for kind, name in self.KIND_CATEGORIES.items()}
 
         # Categorías principales
         categorias = [
@@ -47,12 +55,49 @@ class NavigationTree(QTreeWidget):
         for cat_name, objs in categorias:
             cat_item = QTreeWidgetItem(self, [cat_name])
             cat_item.setFlags(cat_item.flags() & ~Qt.ItemIsSelectable)
+            kind = kinds.get(cat_name)
+            if kind is not None:
+                self._categories[kind] = cat_item
             for obj in objs:
                 label = self.get_object_label(obj)
                 obj_item = QTreeWidgetItem(cat_item, [label])
                 obj_item.setData(0, Qt.UserRole, obj)
+                if kind is not None:
+                    self._items[(kind, obj.id)] = obj_item
         self.expandAll()
 
+    def apply_changes(self, changes):
+        """
+        Actualiza solo los elementos del árbol afectados por un ChangeSet:
+        añade, quita o reetiqueta items sin reconstruir el árbol completo.
+        """
+        project = getattr(self.canvas, "project", None)
+        if project is None or changes.full or not self._categories:
+            self.refresh()
+            return
+        for kind, ids in changes.removed.items():
+            for id_ in ids:
+                item = self._items.pop((kind, id_), None)
+                if item is not None:
+                    item.parent().removeChild(item)
+        for kind, ids in changes.added.items():
+            cat_item = self._categories.get(kind)
+            if cat_item is None:
+                continue
+            for id_ in sorted(ids):
+                obj = project.get(kind, id_)
+                if obj is not None:
+                    obj_item = QTreeWidgetItem(cat_item, [self.get_object_label(obj)])
+                    obj_item.setData(0, Qt.UserRole, obj)
+                    self._items[(kind, id_)] = obj_item
+        for kind, ids in changes.modified.items():
+            for id_ in ids:
+                item = self._items.get((kind, id_))
+                obj = project.get(kind, id_)
+                if item is not None and obj is not None:
+                    item.setText(0, self.get_object_label(obj))
+                    item.setData(0, Qt.UserRole, obj)
+
     def get_object_label(self, obj):
         """
         Devuelve una etiqueta amigable para el objeto.
@@ -100,9 +145,7 @@ class NavigationTree(QTreeWidget):
         # Lógica de borrado: delega en el modelo/canvas
         if hasattr(self.canvas, "delete_object"):
             ok = self.canvas.delete_object(obj)
-            if ok:
-                self.refresh()
-            else:
+            if not ok:
                 QMessageBox.warning(self, "Eliminar", "No fue posible eliminar el objeto.")
         else:
-            QMessageBox.warning(self, "Eliminar", "La acción no está implementada.")
\ No newline at end of file
+            QMessageBox.warning(self, "Eliminar", "La acción no está implementada.")
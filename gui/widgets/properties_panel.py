@@ -4,6 +4,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 
+from core.commands import SetPropertyCommand, run_command
+
 class PropertiesPanel(QWidget):
     property_changed = Signal(object, str, object)  # (objeto, nombre_prop, valor_nuevo)
 
@@ -40,6 +42,20 @@ class PropertiesPanel(QWidget):
         self.layout.addWidget(self.node_list_btn)
         self.node_list_btn.setVisible(False)
 
+    def apply_changes(self, changes):
+        """Refresca el panel solo si el ChangeSet afecta al objeto mostrado."""
+        obj = self.current_object
+        project = getattr(self.canvas, "project", None)
+        if obj is None or project is None:
+            return
+        kind = project.kind_of(obj)
+        if kind is None:
+            return
+        if changes.full or obj.id in changes.removed.get(kind, ()):
+            self.show_properties(project.get(kind, obj.id) if changes.full else None)
+        elif obj.id in changes.modified.get(kind, ()):
+            self.show_properties(obj)
+
     def show_properties(self, obj):
         self.current_object = obj
         self.error_label.setVisible(False)
@@ -91,8 +107,8 @@ class PropertiesPanel(QWidget):
 
         # Material y sección (combo si posible)
         if hasattr(obj, "material"):
+            values = self.get_materials()  # Antes de leer el valor: materializa una carga perezosa
             mat_val = getattr(obj, "material", "")
-            values = self.get_materials()
             if values:
                 combo = QComboBox()
                 combo.addItems(values)
@@ -106,8 +122,8 @@ class PropertiesPanel(QWidget):
                 self.form.addRow("Material", le_mat)
                 self.editors["material"] = le_mat
         if hasattr(obj, "section"):
-            sec_val = getattr(obj, "section", "")
             values = self.get_sections()
+            sec_val = getattr(obj, "section", "")
             if values:
                 combo = QComboBox()
                 combo.addItems(values)
@@ -202,9 +218,8 @@ class PropertiesPanel(QWidget):
         # Validación de nodos (si existen)
         if "nodes" in data and isinstance(data["nodes"], list):
             project = getattr(self.canvas, "project", None)
-            all_node_ids = set(n.id for n in getattr(project, "nodes", []))
             for nid in data["nodes"]:
-                if nid not in all_node_ids:
+                if project is None or project.get_node(nid) is None:
                     errors.append(f"Nodo con ID {nid} no existe.")
         return errors
 
@@ -247,12 +262,21 @@ class PropertiesPanel(QWidget):
         else:
             self.error_label.setVisible(False)
 
-        for name, value in data.items():
-            if hasattr(obj, name):
-                if getattr(obj, name) != value:
+        # Los cambios pasan por el proyecto (un solo comando deshacible por edición)
+        project = getattr(self.canvas, "project", None)
+        kind = project.kind_of(obj) if project is not None else None
+        changes = {name: value for name, value in data.items()
+                   if hasattr(obj, name) and getattr(obj, name) != value}
+        if changes:
+            if kind:
+                command = SetPropertyCommand(project, obj, changes)
+                run_command(command, getattr(self.canvas, "undo_manager", None))
+            else:
+                for name, value in changes.items():
                     setattr(obj, name, value)
-                    updated = True
-                    self.property_changed.emit(obj, name, value)
+            updated = True
+            for name, value in changes.items():
+                self.property_changed.emit(obj, name, value)
 
         # Actualizar pertenencia a grupos
         for g, cb in self.group_checkboxes.items():
@@ -328,4 +352,5 @@ class NodeListEditorDialog(QMessageBox):
     def get_selected_ids(self):
         return [self.list_widget.item(i).data(Qt.UserRole)
                 for i in range(self.list_widget.count())
-                if self.list_widget.item(i).checkState() == Qt.Checked]
\ No newline at end of file
+                if self.list_widget.item(i).checkState() == Qt.Checked]
+
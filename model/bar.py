@@ -1,16 +1,14 @@
 import numpy as np
 
 class Bar:
-    _id_seq = 1
+    __slots__ = ("n1", "n2", "section", "material", "id")
 
-    def __init__(self, n1, n2, section=None, material=None):
+    def __init__(self, n1, n2, section=None, material=None, id_=None):
         self.n1 = n1  # Node object
         self.n2 = n2  # Node object
         self.section = section  # Section object or ID
         self.material = material  # Material object or ID
-        self.id = Bar._id_seq
-        Bar._id_seq += 1
-        self.selected = False
+        self.id = id_
 
     def as_tuple(self):
         return (self.n1.id, self.n2.id)
@@ -0,0 +1,194 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from model.serialization import to_dict, json_default
+
+
+# Formato binario columnar del proyecto (.femb):
+#   MAGIC (8 bytes) | longitud de la cabecera (uint64 LE) | cabecera JSON | bloques
+# La cabecera describe cada bloque (dtype, forma y desplazamiento) y guarda lo
+# que no es masivo (materiales, secciones, combinaciones y vocabularios de las
+# columnas de texto). Los bloques son arrays en crudo alineados a 64 bytes, de
+# modo que se pueden mapear en memoria sin copiarlos.
+BINARY_EXTENSION = ".femb"
+MAGIC = b"FEMCOL\x00\x01"
+VERSION = 1
+ALIGN = 64
+
+
+def is_binary(filename):
+    """True si el fichero usa el formato binario (por extensión)."""
+    return str(filename).lower().endswith(BINARY_EXTENSION)
+
+
+def _align(offset):
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _ref_id(value):
+    """Id de una referencia (objeto, id o None -> -1)."""
+    if value is None:
+        return -1
+    value = getattr(value, "id", value)
+    if not isinstance(value, (int, np.integer)):
+        raise ValueError(f"Referencia no válida para el formato binario: {value!r}")
+    return int(value)
+
+
+def _ref_ids(values, count):
+    return np.fromiter((_ref_id(v) for v in values), dtype=np.int64, count=count)
+
+
+def _ids(items):
+    return np.fromiter((o.id for o in items), dtype=np.int64, count=len(items))
+
+
+def _categorical(values):
+    """Codifica una columna de valores repetidos (str, int, None...) como códigos + vocabulario."""
+    vocab = {}
+    codes = np.fromiter((vocab.setdefault(v, len(vocab)) for v in values), dtype=np.int32)
+    return codes, list(vocab)
+
+
+def _padded(rows, width, fill, dtype):
+    """Array (M,width) a partir de filas de longitud variable, rellenas con `fill`."""
+    out = np.full((len(rows), width), fill, dtype=dtype)
+    for i, row in enumerate(rows):
+        out[i, :len(row)] = row
+    return out
+
+
+def project_columns(project):
+    """
+    Convierte el proyecto en columnas: devuelve (cabecera, bloques), con los
+    bloques como dict nombre -> array y la cabecera con los datos no masivos.
+    """
+    blocks, categories = {}, {}
+
+    def categorical(name, values):
+        blocks[name], categories[name] = _categorical(values)
+
+    node_ids = project.nodes.ids
+    blocks["node.ids"] = node_ids
+    blocks["node.coords"] = project.nodes.coords
+    # Conectividad por ids de nodo a partir de la tabla cacheada en filas del NodeStore
+    for kind in ("bar", "shell", "solid"):
+        items = getattr(project, project.COLLECTIONS[kind])
+        table = project._elements(kind)
+        rows = table["rows"]
+        blocks[kind + ".ids"] = table["ids"]
+        blocks[kind + ".conn"] = np.where(rows >= 0, node_ids[rows], -1)
+        blocks[kind + ".material"] = _ref_ids((e.material for e in items), len(items))
+    blocks["bar.section"] = _ref_ids((b.section for b in project.bars), len(project.bars))
+    blocks["shell.thickness"] = np.fromiter((s.thickness for s in project.shells), dtype=np.float64,
+                                            count=len(project.shells))
+
+    loads = project.nodal_loads
+    blocks["nodal_load.ids"] = _ids(loads)
+    blocks["nodal_load.node"] = _ref_ids((l.node for l in loads), len(loads))
+    blocks["nodal_load.values"] = np.array([(l.fx, l.fy, l.fz, l.mx, l.my, l.mz) for l in loads],
+                                           dtype=np.float64).reshape(-1, 6)
+    categorical("nodal_load.case", [l.case for l in loads])
+
+    loads = project.bar_loads
+    blocks["bar_load.ids"] = _ids(loads)
+    blocks["bar_load.bar"] = _ref_ids((l.bar for l in loads), len(loads))
+    blocks["bar_load.q"] = np.array([(l.q1, l.q2) for l in loads], dtype=np.float64).reshape(-1, 2)
+    blocks["bar_load.point"] = np.array([(l.position, l.magnitude) for l in loads], dtype=np.float64).reshape(-1, 2)
+    for field in ("direction", "type", "distribution", "case"):
+        categorical("bar_load." + field, [getattr(l, field) for l in loads])
+
+    loads = project.shell_loads
+    blocks["shell_load.ids"] = _ids(loads)
+    blocks["shell_load.shell"] = _ref_ids((l.shell for l in loads), len(loads))
+    width = max((len(l.q) for l in loads), default=4)
+    blocks["shell_load.q"] = _padded([l.q for l in loads], width, np.nan, np.float64)
+    for field in ("direction", "type", "distribution", "case"):
+        categorical("shell_load." + field, [getattr(l, field) for l in loads])
+
+    supports = project.supports
+    blocks["support.ids"] = _ids(supports)
+    blocks["support.node"] = _ref_ids((s.node for s in supports), len(supports))
+    blocks["support.restraints"] = _padded([s.restraints for s in supports], 6, False, bool)
+    categorical("support.type", [s.type for s in supports])
+
+    header = {
+        "materials": [to_dict(m) for m in project.materials],
+        "sections": [to_dict(s) for s in project.sections],
+        "load_combinations": project.load_combinations,
+        "categories": categories,
+    }
+    return header, blocks
+
+
+def write_columns(filename, header, blocks):
+    """
+    Escribe la cabecera y los bloques en formato binario. Se escribe a un
+    fichero temporal que luego sustituye al destino, de modo que un fallo a
+    mitad de escritura no deja el fichero anterior corrupto.
+    """
+    specs, offset = {}, 0
+    arrays = {}
+    for name, arr in blocks.items():
+        arr = arrays[name] = np.ascontiguousarray(arr)
+        specs[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _align(offset + arr.nbytes)
+    header = dict(header, format="femcol", version=VERSION, blocks=specs)
+    raw = json.dumps(header, default=json_default, separators=(",", ":")).encode("utf-8")
+    start = _align(len(MAGIC) + 8 + len(raw))
+    tmp = str(filename) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(raw)))
+        f.write(raw)
+        for name, arr in arrays.items():
+            if arr.nbytes:
+                f.seek(start + specs[name]["offset"])
+                f.write(memoryview(arr).cast("B"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filename)
+
+
+def read_columns(filename, mode="c"):
+    """
+    Lee la cabecera y mapea en memoria los bloques de un fichero binario.
+    Devuelve (cabecera, dict nombre -> array). Con mode="c" (por defecto) los
+    arrays son copy-on-write: se pueden modificar sin tocar el fichero y solo
+    se leen del disco las páginas que se usan.
+    """
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} no es un proyecto en formato binario")
+        (size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(size).decode("utf-8"))
+    if header.get("version", 0) > VERSION:
+        raise ValueError(f"Versión de formato binario no soportada: {header['version']}")
+    start = _align(len(MAGIC) + 8 + size)
+    arrays = {}
+    for name, spec in header["blocks"].items():
+        dtype, shape = np.dtype(spec["dtype"]), tuple(spec["shape"])
+        if 0 in shape:
+            arrays[name] = np.empty(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(filename, dtype=dtype, mode=mode, offset=start + spec["offset"], shape=shape)
+    return header, arrays
+
+
+def decode(header, arrays, name):
+    """Valores de una columna de texto (códigos + vocabulario de la cabecera)."""
+    vocab = header["categories"][name]
+    return [vocab[c] for c in arrays[name].tolist()]
+
+
+def save_binary(project, filename):
+    """Guarda el proyecto en formato binario columnar."""
+    # Si los nodos están mapeados desde el propio destino, se copian a memoria antes de sustituirlo
+    path = getattr(project.nodes._xyz, "filename", None)
+    if path is not None and os.path.abspath(path) == os.path.abspath(filename):
+        project.nodes.own_buffers()
+    header, blocks = project_columns(project)
+    write_columns(filename, header, blocks)
@@ -0,0 +1,97 @@
+class ChangeSet:
+    """
+    Resumen de un cambio del modelo para los listeners: ids añadidos, eliminados
+    y modificados por tipo de entidad, y atributos modificados de cada entidad.
+    Se construye a partir de un Delta (invertido si el Delta se deshace) y solo
+    se calcula cuando alguien lo consulta. `full` indica que el modelo se ha
+    sustituido por completo (p. ej. al cargar un fichero) y hay que reconstruir.
+    """
+
+    COORDS = ("x", "y", "z")
+
+    def __init__(self, delta=None, reverse=False, full=False):
+        self.delta = delta
+        self.reverse = reverse
+        self.full = full
+        self._added = None
+
+    @classmethod
+    def everything(cls):
+        return cls(full=True)
+
+    def _build(self):
+        added, removed, modified, attributes = {}, {}, {}, {}
+        ops = self.delta.ops if self.delta is not None else []
+        for op in (reversed(ops) if self.reverse else ops):
+            action, kind = op[0], op[1]
+            if self.reverse and action in ("add", "remove"):
+                action = "remove" if action == "add" else "add"
+            if action == "add":
+                for o in op[2]:
+                    if o.id in removed.get(kind, ()):
+                        # Eliminado y vuelto a añadir: cuenta como modificado
+                        removed[kind].discard(o.id)
+                        modified.setdefault(kind, set()).add(o.id)
+                    else:
+                        added.setdefault(kind, set()).add(o.id)
+            elif action == "remove":
+                for o in op[2]:
+                    if o.id in added.get(kind, ()):
+                        added[kind].discard(o.id)
+                    else:
+                        removed.setdefault(kind, set()).add(o.id)
+                    modified.get(kind, set()).discard(o.id)
+                    attributes.pop((kind, o.id), None)
+            else:
+                objs = (op[2],) if action == "set" else op[2]
+                props = (op[3],) if action == "set" else self.COORDS
+                ids = modified.setdefault(kind, set())
+                new = added.get(kind, ())
+                for o in objs:
+                    if o.id not in new:
+                        ids.add(o.id)
+                        attributes.setdefault((kind, o.id), set()).update(props)
+        drop = lambda d: {k: v for k, v in d.items() if v}
+        self._added, self._removed, self._modified = drop(added), drop(removed), drop(modified)
+        self._attributes = attributes
+
+    @property
+    def added(self):
+        """Dict tipo -> conjunto de ids añadidos."""
+        if self._added is None:
+            self._build()
+        return self._added
+
+    @property
+    def removed(self):
+        """Dict tipo -> conjunto de ids eliminados."""
+        if self._added is None:
+            self._build()
+        return self._removed
+
+    @property
+    def modified(self):
+        """Dict tipo -> conjunto de ids de entidades existentes que han cambiado."""
+        if self._added is None:
+            self._build()
+        return self._modified
+
+    @property
+    def attributes(self):
+        """Dict (tipo, id) -> conjunto de atributos modificados."""
+        if self._added is None:
+            self._build()
+        return self._attributes
+
+    def kinds(self):
+        """Tipos de entidad afectados."""
+        return set(self.added) | set(self.removed) | set(self.modified)
+
+    def __bool__(self):
+        return self.full or bool(self.kinds())
+
+    def __repr__(self):
+        if self.full:
+            return "ChangeSet(full)"
+        count = lambda d: {k: len(v) for k, v in d.items()}
+        return f"ChangeSet(added={count(self.added)}, removed={count(self.removed)}, modified={count(self.modified)})"
@@ -0,0 +1,67 @@
+import sys
+
+
+def _sizeof(obj):
+    """Tamaño aproximado en memoria de una entidad (objeto + su __dict__ si lo tiene)."""
+    size = sys.getsizeof(obj)
+    d = getattr(obj, "__dict__", None)
+    return size + sys.getsizeof(d) if d is not None else size
+
+
+class Delta:
+    """
+    Cambios producidos por una operación del modelo (una transacción).
+    Solo guarda lo añadido, eliminado o modificado. Los objetos se comparten con
+    el modelo en lugar de copiarse, de modo que el coste en memoria y el de
+    deshacer/rehacer son proporcionales al tamaño de la edición.
+
+    Cada operación es una tupla:
+        ("add", kind, [objs])                    altas
+        ("remove", kind, [objs])                 bajas
+        ("set", kind, obj, prop, old, new)       cambio de un atributo
+        ("transform", "node", [nodes], matrix)   transformación afín 4x4 invertible
+        ("coords", "node", [nodes], old, new)    coordenadas (K,3) antes/después
+    Las transformaciones invertibles solo guardan la matriz; deshacerlas aplica la inversa.
+    """
+
+    def __init__(self, ops):
+        self.ops = ops
+        self.nbytes = self._estimate(ops)
+
+    @staticmethod
+    def _estimate(ops):
+        total = sys.getsizeof(ops)
+        for op in ops:
+            total += 64
+            action = op[0]
+            if action == "add":
+                # Solo referencias: los objetos siguen vivos en el modelo
+                total += 8 * len(op[2])
+            elif action == "remove":
+                # Los objetos eliminados solo los retiene el historial
+                objs = op[2]
+                total += len(objs) * (8 + _sizeof(objs[0]))
+            elif action == "transform":
+                total += 8 * len(op[2]) + op[3].nbytes
+            elif action == "coords":
+                total += 8 * len(op[2]) + op[3].nbytes + op[4].nbytes
+            else:
+                total += sys.getsizeof(op[4]) + sys.getsizeof(op[5])
+        return total
+
+    def touched(self):
+        """Entidades afectadas (añadidas, eliminadas o modificadas): dict objeto -> tipo."""
+        touched = {}
+        for op in self.ops:
+            if op[0] == "set":
+                touched[op[2]] = op[1]
+            else:
+                touched.update(dict.fromkeys(op[2], op[1]))
+        return touched
+
+    def __len__(self):
+        """Número de entidades afectadas."""
+        return sum(1 if op[0] == "set" else len(op[2]) for op in self.ops)
+
+    def __repr__(self):
+        return f"Delta(ops={len(self.ops)}, entities={len(self)}, nbytes={self.nbytes})"
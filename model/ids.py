@@ -0,0 +1,42 @@
+class IdAllocator:
+    """
+    Asignador de ids de un tipo de entidad dentro de un proyecto.
+    Reparte ids consecutivos a partir de 1, de modo que se mantienen densos y
+    sirven como índice de arrays. Los ids liberados no se reutilizan: así
+    deshacer un borrado puede restaurar los objetos con su id original.
+    """
+
+    def __init__(self, start=1):
+        self._next = start
+
+    @property
+    def next_id(self):
+        """Próximo id que se asignará (sin consumirlo)."""
+        return self._next
+
+    def next(self):
+        """Asigna un id nuevo."""
+        id_ = self._next
+        self._next += 1
+        return id_
+
+    def reserve(self, count):
+        """Reserva un bloque contiguo de `count` ids y devuelve el primero (alta masiva)."""
+        start = self._next
+        self._next += count
+        return start
+
+    def claim(self, id_):
+        """
+        Registra un id explícito (carga de ficheros, importación); los ids
+        automáticos posteriores continúan a partir del mayor registrado.
+        """
+        if id_ >= self._next:
+            self._next = id_ + 1
+        return id_
+
+    def reset(self, start=1):
+        self._next = start
+
+    def __repr__(self):
+        return f"IdAllocator(next_id={self._next})"
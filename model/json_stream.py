@@ -0,0 +1,144 @@
+import json
+
+from model.serialization import to_dict, json_default
+
+
+# Lectura y escritura en streaming del formato JSON del proyecto: un objeto
+# {"clave": [entidades...], ...} que se escribe y se lee entidad a entidad, de
+# modo que la memoria usada no depende del tamaño del modelo.
+
+CHUNK_SIZE = 1 << 20  # Caracteres leídos del fichero en cada lectura
+
+
+def json_reference(o):
+    """Hook `default` que guarda por id las entidades anidadas (material, sección...)."""
+    id_ = getattr(o, "id", None)
+    return id_ if id_ is not None else json_default(o)
+
+
+def project_sections(project):
+    """
+    Pares (clave, entidades) del proyecto en orden de dependencias: materiales
+    y secciones antes que los elementos que los usan, y los nodos antes que
+    los elementos, de modo que el lector puede resolver cada referencia al vuelo.
+    """
+    return [
+        ("materials", map(to_dict, project.materials)),
+        ("sections", map(to_dict, project.sections)),
+        ("nodes", _nodes(project.nodes)),
+        ("bars", map(to_dict, project.bars)),
+        ("shells", map(to_dict, project.shells)),
+        ("solids", map(to_dict, project.solids)),
+        ("nodal_loads", map(to_dict, project.nodal_loads)),
+        ("bar_loads", map(to_dict, project.bar_loads)),
+        ("shell_loads", map(to_dict, project.shell_loads)),
+        ("supports", map(to_dict, project.supports)),
+        ("load_combinations", project.load_combinations),
+    ]
+
+
+def _nodes(store, block=8192):
+    """Nodos como dicts, convirtiendo las columnas a listas por bloques de filas."""
+    coords, ids = store.coords, store.ids
+    for start in range(0, len(ids), block):
+        for (x, y, z), id_ in zip(coords[start:start + block].tolist(), ids[start:start + block].tolist()):
+            yield {"x": x, "y": y, "z": z, "id": id_}
+
+
+def write_json(f, sections):
+    """Escribe pares (clave, iterable) como un objeto JSON compacto, un elemento cada vez."""
+    encode = json.JSONEncoder(separators=(",", ":"), default=json_reference).encode
+    f.write("{")
+    for i, (key, items) in enumerate(sections):
+        f.write(("," if i else "") + encode(key) + ":[")
+        sep = ""
+        for item in items:
+            f.write(sep + encode(item))
+            sep = ","
+        f.write("]")
+    f.write("}")
+
+
+def save_json(project, filename):
+    """Guarda el proyecto en JSON escribiendo entidad a entidad."""
+    with open(filename, "w", encoding="utf-8") as f:
+        write_json(f, project_sections(project))
+
+
+class _Reader:
+    """Buffer deslizante sobre un fichero de texto para decodificar valores JSON sueltos."""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decode = json.JSONDecoder().raw_decode
+
+    def fill(self):
+        # Descarta lo ya consumido y lee al menos tanto como queda (crecimiento geométrico)
+        data = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        self.eof = not data
+
+    def peek(self):
+        """Primer carácter significativo (sin consumirlo); "" al final del fichero."""
+        while True:
+            buf, pos = self.buf, self.pos
+            while pos < len(buf) and buf[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < len(buf) or self.eof:
+                return buf[pos] if pos < len(buf) else ""
+            self.fill()
+
+    def expect(self, chars):
+        c = self.peek()
+        if c == "" or c not in chars:
+            raise ValueError(f"JSON no válido: se esperaba {chars!r} y se encontró {c!r}")
+        self.pos += 1
+        return c
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decode(self.buf, self.pos)
+                # Un valor que acaba justo al final del buffer puede estar cortado (p. ej. un número)
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def iter_json(f, chunk_size=CHUNK_SIZE):
+    """
+    Recorre en streaming un objeto JSON de primer nivel. Genera pares
+    (clave, elemento) por cada elemento de los arrays; los valores que no son
+    arrays se generan enteros como (clave, valor).
+    """
+    r = _Reader(f, chunk_size)
+    r.expect("{")
+    if r.peek() == "}":
+        return
+    while True:
+        key = r.value()
+        r.expect(":")
+        if r.peek() == "[":
+            r.pos += 1
+            if r.peek() == "]":
+                r.pos += 1
+            else:
+                while True:
+                    yield key, r.value()
+                    if r.expect(",]") == "]":
+                        break
+        else:
+            yield key, r.value()
+        if r.expect(",}") == "}":
+            return
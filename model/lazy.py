@@ -0,0 +1,75 @@
+class LazyList(list):
+    """
+    Lista que se rellena la primera vez que se usa (carga perezosa).
+    `loader` se llama una sola vez: puede devolver los elementos o rellenar la
+    lista con fill() (p. ej. si un mismo cargador rellena varias colecciones).
+    Es una list de verdad, así que el resto del modelo la usa sin cambios.
+    """
+    __slots__ = ("_loader",)
+
+    def __init__(self, loader):
+        super().__init__()
+        self._loader = loader
+
+    @property
+    def loaded(self):
+        return self._loader is None
+
+    def materialize(self):
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            items = loader()
+            if items is not None:
+                list.extend(self, items)
+        return self
+
+    def fill(self, items):
+        """Rellena la lista sin llamar al cargador."""
+        self._loader = None
+        list.extend(self, items)
+
+
+class LazyDict(dict):
+    """Diccionario que se rellena la primera vez que se usa (ver LazyList)."""
+    __slots__ = ("_loader",)
+
+    def __init__(self, loader):
+        super().__init__()
+        self._loader = loader
+
+    @property
+    def loaded(self):
+        return self._loader is None
+
+    def materialize(self):
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            items = loader()
+            if items is not None:
+                dict.update(self, items)
+        return self
+
+
+def _loading(cls, name):
+    method = getattr(cls.__mro__[1], name)
+
+    def wrapper(self, *args, **kwargs):
+        if self._loader is not None:
+            self.materialize()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+_COMMON = ("__iter__", "__len__", "__getitem__", "__setitem__", "__delitem__", "__contains__",
+           "__reversed__", "__eq__", "__ne__", "__repr__", "copy", "clear", "pop")
+for _name in _COMMON + ("__lt__", "__le__", "__gt__", "__ge__", "__add__", "__iadd__", "__mul__",
+                        "append", "extend", "insert", "remove", "index", "count", "sort", "reverse"):
+    setattr(LazyList, _name, _loading(LazyList, _name))
+for _name in _COMMON + ("get", "keys", "values", "items", "setdefault", "update", "popitem", "__or__", "__ior__"):
+    setattr(LazyDict, _name, _loading(LazyDict, _name))
+# Con __eq__ redefinido hay que declarar el hash explícitamente (list y dict no son hashables)
+LazyList.__hash__ = None
+LazyDict.__hash__ = None
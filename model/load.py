@@ -1,7 +1,7 @@
 class NodalLoad:
-    _id_seq = 1
+    __slots__ = ("node", "fx", "fy", "fz", "mx", "my", "mz", "case", "id")
 
-    def __init__(self, node, fx=0, fy=0, fz=0, mx=0, my=0, mz=0, case=None):
+    def __init__(self, node, fx=0, fy=0, fz=0, mx=0, my=0, mz=0, case=None, id_=None):
         self.node = node  # Node object
         self.fx = fx
         self.fy = fy
@@ -10,17 +10,17 @@ class NodalLoad:
         self.my = my
         self.mz = mz
         self.case = case  # str or int
-        self.id = NodalLoad._id_seq
-        NodalLoad._id_seq += 1
+        self.id = id_
 
     def __repr__(self):
         return f"NodalLoad(id={self.id}, node={self.node.id}, fx={self.fx}, fy={self.fy}, fz={self.fz}, mx={self.mx}, my={self.my}, mz={self.mz}, case={self.case})"
 
 
 class BarLoad:
-    _id_seq = 1
+    __slots__ = ("bar", "q1", "q2", "direction", "type", "distribution", "case", "position", "magnitude", "id")
 
-    def __init__(self, bar, q1=0, q2=0, direction='z', type_='force', distribution='uniform', case=None):
+    def __init__(self, bar, q1=0, q2=0, direction='z', type_='force', distribution='uniform', case=None,
+                 position=0.5, magnitude=0.0, id_=None):
         self.bar = bar  # Bar object
         self.q1 = q1
         self.q2 = q2
@@ -28,25 +28,25 @@ class BarLoad:
         self.type = type_  # 'force' or 'moment'
         self.distribution = distribution  # 'uniform' or 'trapezoidal'
         self.case = case
-        self.id = BarLoad._id_seq
-        BarLoad._id_seq += 1
+        self.position = position  # Carga puntual: posición relativa en la barra (0..1)
+        self.magnitude = magnitude  # Carga puntual: valor [kN]
+        self.id = id_
 
     def __repr__(self):
-        return f"BarLoad(id={self.id}, bar={self.bar.id}, q1={self.q1}, q2={self.q2}, dir={self.direction}, type={self.type}, distr={self.distribution}, case={self.case})"
+        return f"BarLoad(id={self.id}, bar={self.bar.id}, q1={self.q1}, q2={self.q2}, dir={self.direction}, type={self.type}, distr={self.distribution}, case={self.case}, pos={self.position}, P={self.magnitude})"
 
 
 class ShellLoad:
-    _id_seq = 1
+    __slots__ = ("shell", "q", "direction", "type", "distribution", "case", "id")
 
-    def __init__(self, shell, q=None, direction='z', type_='force', distribution='uniform', case=None):
+    def __init__(self, shell, q=None, direction='z', type_='force', distribution='uniform', case=None, id_=None):
         self.shell = shell  # Shell object
         self.q = q if q is not None else [0.0, 0.0, 0.0, 0.0]
         self.direction = direction  # 'x', 'y', 'z'
         self.type = type_  # 'force' or 'moment'
         self.distribution = distribution  # 'uniform' or 'lineal'
         self.case = case
-        self.id = ShellLoad._id_seq
-        ShellLoad._id_seq += 1
+        self.id = id_
 
     def __repr__(self):
         return f"ShellLoad(id={self.id}, shell={self.shell.id}, q={self.q}, dir={self.direction}, type={self.type}, distr={self.distribution}, case={self.case})"
\ No newline at end of file
@@ -1,18 +1,15 @@
 class Material:
-    _id_seq = 1
-
     # Lista de tipos soportados por OpenSees (puedes extenderla)
     OPENSEES_TYPES = [
         "Elastic", "Concrete01", "Concrete02", "Steel01", "Steel02", "SteelMPF", "ElasticPP", "Hysteretic",
         "Concrete04", "Concrete06", "Concrete07", "SAWS", "MinMax", "Parallel"
     ]
 
-    def __init__(self, name, type_, params=None):
+    def __init__(self, name, type_, params=None, id_=None):
         self.name = str(name)
         self.type = type_  # Must be one of OPENSEES_TYPES
         self.params = params if params is not None else {}
-        self.id = Material._id_seq
-        Material._id_seq += 1
+        self.id = id_
 
     @staticmethod
     def get_opensees_types():
@@ -1,16 +1,63 @@
+def _coord(axis):
+    """Propiedad de coordenada: lee/escribe en el NodeStore si el nodo pertenece a uno."""
+    def fget(self):
+        store = self._store
+        if store is None:
+            return self._local[axis]
+        return store._xyz.item(self._row, axis)
+
+    def fset(self, value):
+        store = self._store
+        if store is None:
+            self._local[axis] = float(value)
+        else:
+            store._xyz[self._row, axis] = value
+            store.version += 1
+
+    return property(fget, fset)
+
+
 class Node:
-    _id_seq = 1
+    """
+    Nodo del modelo. Mientras no pertenece a un NodeStore guarda sus coordenadas
+    localmente; al añadirse a uno pasa a ser una vista ligera sobre su fila.
+    El id lo asigna el Project al registrarlo (salvo que se indique uno explícito).
+    """
+    __slots__ = ("_store", "_row", "_local", "_id")
+
+    def __init__(self, x, y, z=0.0, id_=None):
+        self._store = None  # NodeStore al que pertenece (o None)
+        self._row = -1      # Fila dentro del NodeStore
+        self._local = [float(x), float(y), float(z)]
+        self._id = id_
 
-    def __init__(self, x, y, z=0.0):
-        self.x = float(x)
-        self.y = float(y)
-        self.z = float(z)
-        self.id = Node._id_seq
-        Node._id_seq += 1
-        self.selected = False
+    @classmethod
+    def _view(cls, store, row, id_):
+        """Crea un nodo ya vinculado a una fila de `store` (alta masiva)."""
+        n = cls.__new__(cls)
+        n._store = store
+        n._row = row
+        n._local = None
+        n._id = id_
+        return n
+
+    x = _coord(0)
+    y = _coord(1)
+    z = _coord(2)
+
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        self._id = value
+        if self._store is not None:
+            self._store._ids[self._row] = value
 
     def as_tuple(self):
         return (self.x, self.y, self.z)
 
     def __repr__(self):
-        return f"Node(id={self.id}, x={self.x}, y={self.y}, z={self.z})"
\ No newline at end of file
+        return f"Node(id={self.id}, x={self.x}, y={self.y}, z={self.z})"
+
@@ -0,0 +1,170 @@
+import numpy as np
+
+from model.node import Node
+
+
+class NodeStore:
+    """
+    Almacén columnar de nodos (struct-of-arrays).
+    Las coordenadas viven en un array contiguo float64 (N,3) y los ids en un array (N,).
+    Cada Node es una vista ligera sobre una fila, de modo que la API por atributos
+    (n.x, n.y, n.z) sigue funcionando y los consumidores masivos pueden tomar
+    directamente `coords` e `ids`.
+    Se comporta como una lista de Node: iteración, len, índices, append, remove...
+    """
+
+    def __init__(self, nodes=None, capacity=64):
+        self._xyz = np.empty((capacity, 3), dtype=np.float64)
+        self._ids = np.empty(capacity, dtype=np.int64)
+        self._nodes = []
+        self.version = 0  # Se incrementa con cada cambio de coordenadas o de filas
+        self.layout = 0   # Se incrementa solo cuando cambian las filas (altas y bajas)
+        if nodes:
+            self.extend(nodes)
+
+    @classmethod
+    def from_arrays(cls, coords, ids):
+        """
+        Crea un almacén que usa `coords` (N,3) e `ids` (N,) directamente como
+        buffers, sin copiarlos (p. ej. arrays mapeados en memoria desde fichero).
+        Si el almacén crece, los buffers se copian a memoria propia.
+        """
+        store = cls(capacity=0)
+        store._xyz, store._ids = coords, ids
+        view = Node._view
+        store._nodes = [view(store, row, nid) for row, nid in enumerate(ids.tolist())]
+        store.version += 1
+        store.layout += 1
+        return store
+
+    def own_buffers(self):
+        """Copia los buffers a memoria propia si son vistas de un fichero mapeado."""
+        if isinstance(self._xyz, np.memmap):
+            self._xyz = np.array(self._xyz)
+        if isinstance(self._ids, np.memmap):
+            self._ids = np.array(self._ids)
+
+    # Acceso columnar
+    @property
+    def coords(self):
+        """Vista (N,3) de las coordenadas de todos los nodos."""
+        return self._xyz[:len(self._nodes)]
+
+    @property
+    def ids(self):
+        """Vista (N,) de los ids de todos los nodos."""
+        return self._ids[:len(self._nodes)]
+
+    def rows(self, nodes):
+        """Índices de fila de una secuencia de nodos del almacén."""
+        return np.fromiter((n._row for n in nodes), dtype=np.intp)
+
+    def set_rows(self, rows, coords):
+        """Escribe de una vez las coordenadas (K,3) de las filas indicadas."""
+        self._xyz[rows] = coords
+        self.version += 1
+
+    def _reserve(self, size):
+        capacity = len(self._ids)
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity)
+        xyz = np.empty((capacity, 3), dtype=np.float64)
+        ids = np.empty(capacity, dtype=np.int64)
+        count = len(self._nodes)
+        xyz[:count] = self._xyz[:count]
+        ids[:count] = self._ids[:count]
+        self._xyz, self._ids = xyz, ids
+
+    # Interfaz de lista
+    def append(self, node):
+        if node._store is not None:
+            raise ValueError(f"El nodo {node.id} ya pertenece a un NodeStore")
+        row = len(self._nodes)
+        self._reserve(row + 1)
+        self._xyz[row] = node._local
+        self._ids[row] = node.id
+        node._store, node._row, node._local = self, row, None
+        self._nodes.append(node)
+        self.version += 1
+        self.layout += 1
+
+    def extend(self, nodes):
+        for n in nodes:
+            self.append(n)
+
+    def append_array(self, coords, ids):
+        """
+        Alta masiva: copia un bloque de coordenadas (M,3) e ids (M,) al final del
+        almacén y devuelve la lista de vistas Node creadas.
+        """
+        start = len(self._nodes)
+        count = len(ids)
+        self._reserve(start + count)
+        self._xyz[start:start + count] = coords
+        self._ids[start:start + count] = ids
+        view = Node._view
+        new = [view(self, row, nid) for row, nid in zip(range(start, start + count), ids.tolist())]
+        self._nodes.extend(new)
+        self.version += 1
+        self.layout += 1
+        return new
+
+    def remove(self, node):
+        if node._store is not self:
+            raise ValueError(f"{node!r} no está en el NodeStore")
+        self.remove_many([node])
+
+    def remove_many(self, nodes):
+        """Elimina varios nodos compactando los arrays una sola vez."""
+        count = len(self._nodes)
+        keep = np.ones(count, dtype=bool)
+        for n in nodes:
+            if n._store is self:
+                keep[n._row] = False
+                self._detach(n)
+        if keep.all():
+            return
+        # Las filas anteriores al primer nodo eliminado no cambian
+        first = int(np.argmin(keep))
+        kept = first + np.flatnonzero(keep[first:])
+        new_count = first + len(kept)
+        self._xyz[first:new_count] = self._xyz[kept]
+        self._ids[first:new_count] = self._ids[kept]
+        self._nodes[first:] = [self._nodes[i] for i in kept.tolist()]
+        for row in range(first, new_count):
+            self._nodes[row]._row = row
+        self.version += 1
+        self.layout += 1
+
+    def _detach(self, node):
+        # El nodo conserva sus coordenadas al salir del almacén (p. ej. para deshacer)
+        node._local = self._xyz[node._row].tolist()
+        node._store, node._row = None, -1
+
+    def clear(self):
+        for n in self._nodes:
+            self._detach(n)
+        self._nodes = []
+        self.version += 1
+        self.layout += 1
+
+    def index(self, node):
+        if node._store is not self:
+            raise ValueError(f"{node!r} no está en el NodeStore")
+        return node._row
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def __getitem__(self, i):
+        return self._nodes[i]
+
+    def __contains__(self, node):
+        return getattr(node, "_store", None) is self
+
+    def __repr__(self):
+        return f"NodeStore({self._nodes!r})"
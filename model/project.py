@@ -1,4 +1,5 @@
 from model.node import Node
+from model.node_store import NodeStore
 from model.bar import Bar
 from model.shell import Shell
 from model.solid import Solid
@@ -6,16 +7,67 @@ from model.material import Material
 from model.section import Section
 from model.load import NodalLoad, BarLoad, ShellLoad
 from model.support import Support
+from model.delta import Delta
+from model.changes import ChangeSet
+from model.ids import IdAllocator
+from model.json_stream import save_json, iter_json
+from model.binary_io import is_binary, save_binary, read_columns, decode
+from model.lazy import LazyList, LazyDict
+from utils.geometry import (translation_matrix, rotation_matrix, scale_matrix, apply_affine,
+                            bar_geometry, shell_geometry, solid_geometry)
+from utils.spatial import coincident_groups
 from core.export_opensees import OpenSeesExporter
+from core.import_opensees import OpenSeesImporter
+from core.import_tables import TableImporter
+
+import gc
+from contextlib import contextmanager
+
+import numpy as np
 
 from PySide6.QtCore import QObject, Signal
 
 class Project(QObject):
     model_changed = Signal()
+    # Delta de cada cambio confirmado, deshecho o rehecho (None: modelo sustituido por completo)
+    model_delta = Signal(object)
+    # Lo mismo para listeners de la GUI: ChangeSet con ids añadidos/eliminados/modificados
+    entities_changed = Signal(object)
+
+    # Tipo de entidad -> colección del proyecto que la contiene
+    COLLECTIONS = {
+        "node": "nodes",
+        "bar": "bars",
+        "shell": "shells",
+        "solid": "solids",
+        "material": "materials",
+        "section": "sections",
+        "nodal_load": "nodal_loads",
+        "bar_load": "bar_loads",
+        "shell_load": "shell_loads",
+        "support": "supports",
+    }
+    KINDS = {
+        Node: "node", Bar: "bar", Shell: "shell", Solid: "solid",
+        Material: "material", Section: "section",
+        NodalLoad: "nodal_load", BarLoad: "bar_load", ShellLoad: "shell_load",
+        Support: "support",
+    }
+    MISSING_ROW = -2  # Fila de un nodo que falta en element_rows (-1 es relleno)
+    # Atributos de cada tipo que referencian a otras entidades (conectividad)
+    REFERENCES = {
+        "bar": ("n1", "n2"),
+        "shell": ("nodes",),
+        "solid": ("nodes",),
+        "nodal_load": ("node",),
+        "bar_load": ("bar",),
+        "shell_load": ("shell",),
+        "support": ("node",),
+    }
 
     def __init__(self):
         super().__init__()
-        self.nodes = []
+        self.nodes = NodeStore()
         self.bars = []
         self.shells = []
         self.solids = []
@@ -26,231 +78,1190 @@ class Project(QObject):
         self.shell_loads = []
         self.supports = []
         self.load_combinations = []
+        # Historial de deshacer/rehacer: lista de Delta, con tope de memoria
         self.history = []
         self.future = []
+        self.history_max_bytes = 256 * 1024 * 1024
+        self._history_bytes = 0
+        # Índices id -> objeto por tipo de entidad y asignadores de ids propios del proyecto
+        self._index = {kind: {} for kind in self.COLLECTIONS}
+        self._ids = {kind: IdAllocator() for kind in self.COLLECTIONS}
+        # Versión de la topología de cada tipo (altas, bajas y cambios de referencias)
+        # y caché de resultados vectorizados que dependen de ella
+        self._topology = dict.fromkeys(self.COLLECTIONS, 0)
+        self._cache = {}
+        # Conectividad inversa: entidad referenciada -> conjunto de entidades que la usan
+        self._dependents = {}
+        # Estado de transacciones (batch)
+        self._batch_depth = 0
+        self._batch_dirty = False
+        self._tx_log = []    # Operaciones de la transacción en curso
+        self._tx_marks = []  # Inicio en _tx_log de cada batch anidado
+        self._recording = True
+
+    # Registro de operaciones (deltas)
+    def _record(self, action, kind, objs):
+        """Anota altas/bajas en la transacción en curso (agrupando las consecutivas)."""
+        if not self._recording:
+            return
+        log = self._tx_log
+        barrier = self._tx_marks[-1] if self._tx_marks else 0
+        if len(log) > barrier and log[-1][0] == action and log[-1][1] == kind:
+            log[-1][2].extend(objs)
+        else:
+            log.append((action, kind, list(objs)))
+        if not self._batch_depth:
+            self._commit()
+
+    def _record_set(self, kind, obj, prop, old, new):
+        self._record_op(("set", kind, obj, prop, old, new))
+
+    def _record_op(self, op):
+        if not self._recording:
+            return
+        self._tx_log.append(op)
+        if not self._batch_depth:
+            self._commit()
+
+    def _commit(self):
+        """Cierra la transacción en curso como un Delta del historial."""
+        if not self._tx_log:
+            return
+        delta = Delta(self._tx_log)
+        self._tx_log = []
+        self.model_delta.emit(delta)
+        self.entities_changed.emit(ChangeSet(delta))
+        self.history.append(delta)
+        self._history_bytes += delta.nbytes
+        self.future = []
+        # Tope de memoria: descarta los pasos más antiguos (siempre conserva el último)
+        while self._history_bytes > self.history_max_bytes and len(self.history) > 1:
+            self._history_bytes -= self.history.pop(0).nbytes
+
+    # Registro e índices
+    def _assign_id(self, kind, obj):
+        """Da id a un objeto nuevo, o registra el explícito que ya trae si no está en uso."""
+        if obj.id is None:
+            obj.id = self._ids[kind].next()
+        elif obj.id in self._index[kind]:
+            raise ValueError(f"El id {obj.id} ya está en uso ({kind})")
+        else:
+            self._ids[kind].claim(obj.id)
+
+    def _register(self, kind, obj):
+        """
+        Da de alta una entidad. Las entidades se crean sin id (id_=None) y es
+        aquí donde reciben uno del asignador de su tipo; un id explícito ya
+        asignado se conserva y se reserva en el asignador (ver _assign_id).
+        """
+        self._assign_id(kind, obj)
+        getattr(self, self.COLLECTIONS[kind]).append(obj)
+        self._index[kind][obj.id] = obj
+        self._topology[kind] += 1
+        self._link(kind, obj)
+        self._record("add", kind, (obj,))
+
+    def _register_many(self, kind, objs):
+        """Registra de una vez una lista de objetos de un mismo tipo."""
+        getattr(self, self.COLLECTIONS[kind]).extend(objs)
+        self._index_many(kind, objs)
+
+    def _index_many(self, kind, objs):
+        """Indexa objetos ya añadidos a su colección."""
+        self._index[kind].update((o.id, o) for o in objs)
+        self._topology[kind] += 1
+        if kind in self.REFERENCES:
+            self._link_many(kind, objs)
+        self._record("add", kind, objs)
+
+    def _unregister(self, kind, obj):
+        getattr(self, self.COLLECTIONS[kind]).remove(obj)
+        self._index[kind].pop(obj.id, None)
+        self._topology[kind] += 1
+        self._unlink(kind, obj)
+        self._record("remove", kind, (obj,))
+
+    def _unregister_many(self, kind, objs):
+        """Elimina varios objetos de un mismo tipo reconstruyendo la colección una sola vez."""
+        index = self._index[kind]
+        dead = set()
+        for o in objs:
+            if index.get(o.id) is o:
+                del index[o.id]
+                dead.add(o)
+        if not dead:
+            return
+        self._topology[kind] += 1
+        if kind in self.REFERENCES:
+            for o in dead:
+                self._unlink(kind, o)
+        coll = self.COLLECTIONS[kind]
+        if kind == "node":
+            self.nodes.remove_many(dead)
+        elif len(dead) <= 8:
+            items = getattr(self, coll)
+            for o in dead:
+                items.remove(o)
+        else:
+            setattr(self, coll, [o for o in getattr(self, coll) if o not in dead])
+        self._record("remove", kind, [o for o in objs if o in dead])
+
+    def _reindex(self):
+        """
+        Reconstruye los índices id -> objeto, la conectividad inversa y los
+        asignadores de ids a partir de las colecciones (sin materializar las
+        colecciones perezosas pendientes).
+        """
+        self._cache = {}
+        pending = False
+        for kind, coll in self.COLLECTIONS.items():
+            self._topology[kind] += 1
+            items = getattr(self, coll)
+            if isinstance(items, LazyList) and not items.loaded:
+                pending = True  # Índice y asignador ya preparados por la carga perezosa
+                continue
+            self._index[kind] = {o.id: o for o in items}
+            self._ids[kind] = IdAllocator(max(self._index[kind], default=0) + 1)
+        # Con colecciones pendientes, la conectividad inversa se construye al primer uso
+        self._dependents = LazyDict(self._link_all) if pending else {}
+        if not pending:
+            self._link_all()
+
+    def _link_all(self):
+        for kind in self.REFERENCES:
+            self._link_many(kind, getattr(self, self.COLLECTIONS[kind]))
+
+    # Conectividad inversa
+    def _targets(self, kind, obj):
+        """Entidades referenciadas por `obj` (nodos, barras o shells)."""
+        targets = []
+        for attr in self.REFERENCES.get(kind, ()):
+            value = getattr(obj, attr, None)
+            if isinstance(value, (list, tuple)):
+                targets.extend(value)
+            elif value is not None:
+                targets.append(value)
+        return targets
+
+    def _link(self, kind, obj):
+        deps = self._dependents
+        for t in self._targets(kind, obj):
+            s = deps.get(t)
+            if s is None:
+                s = deps[t] = set()
+            s.add(obj)
+
+    def _link_many(self, kind, objs):
+        """_link para muchos objetos de un tipo, recorriendo cada atributo de referencia una vez."""
+        deps = self._dependents
+        for attr in self.REFERENCES[kind]:
+            for o in objs:
+                value = getattr(o, attr, None)
+                for t in (value if isinstance(value, (list, tuple)) else (value,)):
+                    if t is not None:
+                        s = deps.get(t)
+                        if s is None:
+                            s = deps[t] = set()
+                        s.add(o)
+
+    def _unlink(self, kind, obj):
+        deps = self._dependents
+        for t in self._targets(kind, obj):
+            s = deps.get(t)
+            if s is not None:
+                s.discard(obj)
+                if not s:
+                    del deps[t]
+
+    def dependents(self, obj):
+        """Entidades que referencian directamente a `obj` (elementos, cargas, apoyos). O(grado)."""
+        return list(self._dependents.get(obj, ()))
+
+    def elements_at_node(self, node):
+        """Barras, shells y sólidos conectados a `node`."""
+        return [o for o in self._dependents.get(node, ()) if isinstance(o, (Bar, Shell, Solid))]
+
+    def connected_nodes(self, node):
+        """Nodos que comparten algún elemento con `node` (vecinos en la malla)."""
+        neighbors = set()
+        for e in self.elements_at_node(node):
+            neighbors.update(e.nodes if hasattr(e, "nodes") else (e.n1, e.n2))
+        neighbors.discard(node)
+        return list(neighbors)
+
+    def _set_attr(self, kind, obj, prop, value):
+        """Asigna un atributo manteniendo la conectividad inversa si es una referencia."""
+        if prop in self.REFERENCES.get(kind, ()):
+            self._unlink(kind, obj)
+            setattr(obj, prop, value)
+            self._link(kind, obj)
+            self._topology[kind] += 1
+        else:
+            setattr(obj, prop, value)
+
+    def _resolve_reference(self, prop, value):
+        """Convierte ids en objetos para los atributos de conectividad."""
+        lookup = {"n1": "node", "n2": "node", "node": "node", "nodes": "node",
+                  "bar": "bar", "shell": "shell"}.get(prop)
+        if lookup is None:
+            return value
+        index = self._index[lookup]
+        if isinstance(value, (list, tuple)):
+            return [index.get(v, v) if isinstance(v, int) else v for v in value]
+        return index.get(value, value) if isinstance(value, int) else value
+
+    def kind_of(self, obj):
+        """Tipo de entidad ('node', 'bar', ...) de un objeto del modelo, o None."""
+        return self.KINDS.get(type(obj))
+
+    # Transacciones
+    @contextmanager
+    def batch(self):
+        """
+        Transacción de modelo: dentro de `with project.batch():` las operaciones no
+        emiten model_changed; se emite una sola vez al salir de la transacción más externa.
+        Se pueden anidar. Si se produce una excepción, los cambios hechos dentro del
+        bloque se deshacen (rollback) y la excepción se propaga.
+        """
+        mark = len(self._tx_log)
+        next_ids = {kind: alloc.next_id for kind, alloc in self._ids.items()}
+        self._tx_marks.append(mark)
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._revert(self._tx_log[mark:])
+            del self._tx_log[mark:]
+            # Los ids asignados dentro del bloque vuelven a quedar libres
+            for kind, next_id in next_ids.items():
+                self._ids[kind].reset(next_id)
+            if self._batch_depth == 1:
+                self._batch_dirty = False  # El modelo queda como antes de la transacción
+            raise
+        finally:
+            self._batch_depth -= 1
+            self._tx_marks.pop()
+            if not self._batch_depth:
+                self._commit()
+                if self._batch_dirty:
+                    self._batch_dirty = False
+                    self.model_changed.emit()
+
+    def _revert(self, ops):
+        """Deshace, en orden inverso, una lista de operaciones (sin registrarlas)."""
+        self._recording = False
+        try:
+            for op in reversed(ops):
+                action, kind = op[0], op[1]
+                if action == "add":
+                    self._unregister_many(kind, op[2])
+                elif action == "remove":
+                    self._register_many(kind, op[2])
+                elif action == "transform":
+                    rows = self.nodes.rows(op[2])
+                    self.nodes.set_rows(rows, apply_affine(self.nodes.coords[rows], np.linalg.inv(op[3])))
+                elif action == "coords":
+                    self.nodes.set_rows(self.nodes.rows(op[2]), op[3])
+                else:
+                    self._set_attr(kind, op[2], op[3], op[4])
+        finally:
+            self._recording = True
+
+    def _apply(self, ops):
+        """Vuelve a aplicar, en orden, una lista de operaciones (sin registrarlas)."""
+        self._recording = False
+        try:
+            for op in ops:
+                action, kind = op[0], op[1]
+                if action == "add":
+                    self._register_many(kind, op[2])
+                elif action == "remove":
+                    self._unregister_many(kind, op[2])
+                elif action == "transform":
+                    rows = self.nodes.rows(op[2])
+                    self.nodes.set_rows(rows, apply_affine(self.nodes.coords[rows], op[3]))
+                elif action == "coords":
+                    self.nodes.set_rows(self.nodes.rows(op[2]), op[4])
+                else:
+                    self._set_attr(kind, op[2], op[3], op[5])
+        finally:
+            self._recording = True
+
+    def revert_delta(self, delta):
+        """Deshace un Delta del historial (o uno guardado por quien llama)."""
+        self._revert(delta.ops)
+        self.model_delta.emit(delta)
+        self.entities_changed.emit(ChangeSet(delta, reverse=True))
+        self._changed()
+
+    def apply_delta(self, delta):
+        """Vuelve a aplicar un Delta deshecho."""
+        self._apply(delta.ops)
+        self.model_delta.emit(delta)
+        self.entities_changed.emit(ChangeSet(delta))
+        self._changed()
+
+    def _changed(self):
+        """Notifica un cambio del modelo (diferido si hay una transacción abierta)."""
+        if self._batch_depth:
+            self._batch_dirty = True
+        else:
+            self.model_changed.emit()
 
     # Métodos de alta y consulta
     def add_node(self, x, y, z=0.0):
         n = Node(x, y, z)
-        self.nodes.append(n)
-        self.model_changed.emit()
+        self._register("node", n)
+        self._changed()
         return n
 
     def add_bar(self, n1, n2, section=None, material=None):
         b = Bar(n1, n2, section, material)
-        self.bars.append(b)
-        self.model_changed.emit()
+        self._register("bar", b)
+        self._changed()
         return b
 
     def add_shell(self, nodes, thickness=0.2, material=None):
         s = Shell(nodes, thickness, material)
-        self.shells.append(s)
-        self.model_changed.emit()
+        self._register("shell", s)
+        self._changed()
         return s
 
     def add_solid(self, nodes, material=None):
         so = Solid(nodes, material)
-        self.solids.append(so)
-        self.model_changed.emit()
+        self._register("solid", so)
+        self._changed()
         return so
 
     def add_material(self, name, type_, params=None):
         m = Material(name, type_, params)
-        self.materials.append(m)
-        self.model_changed.emit()
+        self._register("material", m)
+        self._changed()
         return m
 
     def add_section(self, name, type_, params=None, material=None):
         s = Section(name, type_, params, material)
-        self.sections.append(s)
-        self.model_changed.emit()
+        self._register("section", s)
+        self._changed()
         return s
 
     def add_nodal_load(self, node, fx=0, fy=0, fz=0, mx=0, my=0, mz=0, case=None):
         l = NodalLoad(node, fx, fy, fz, mx, my, mz, case)
-        self.nodal_loads.append(l)
-        self.model_changed.emit()
+        self._register("nodal_load", l)
+        self._changed()
         return l
 
-    def add_bar_load(self, bar, q1=0, q2=0, direction='z', type_='force', distribution='uniform', case=None):
-        l = BarLoad(bar, q1, q2, direction, type_, distribution, case)
-        self.bar_loads.append(l)
-        self.model_changed.emit()
+    def add_bar_load(self, bar, q1=0, q2=0, direction='z', type_='force', distribution='uniform', case=None,
+                     position=0.5, magnitude=0.0):
+        l = BarLoad(bar, q1, q2, direction, type_, distribution, case, position, magnitude)
+        self._register("bar_load", l)
+        self._changed()
         return l
 
     def add_shell_load(self, shell, q=None, direction='z', type_='force', distribution='uniform', case=None):
         l = ShellLoad(shell, q, direction, type_, distribution, case)
-        self.shell_loads.append(l)
-        self.model_changed.emit()
+        self._register("shell_load", l)
+        self._changed()
         return l
 
     def add_support(self, node, restraints=None, type_="fixed"):
         s = Support(node, restraints, type_)
-        self.supports.append(s)
-        self.model_changed.emit()
+        self._register("support", s)
+        self._changed()
         return s
 
-    # Métodos de consulta rápida
+    # Alta masiva a partir de arrays
+    def add_nodes(self, coords, ids=None):
+        """
+        Crea un nodo por fila de `coords` ((N,3), o (N,2) con z=0) en una sola operación.
+        `ids` permite fijar ids explícitos (importación); si no, se reserva un bloque
+        contiguo. Devuelve el array de ids asignados.
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.ndim != 2 or coords.shape[1] not in (2, 3):
+            raise ValueError("coords debe tener forma (N,3) o (N,2)")
+        if coords.shape[1] == 2:
+            coords = np.column_stack([coords, np.zeros(len(coords))])
+        count = len(coords)
+        if ids is None:
+            start = self._ids["node"].reserve(count)
+            ids = np.arange(start, start + count, dtype=np.int64)
+        else:
+            ids = self._explicit_ids("node", ids, count)
+        nodes = self.nodes.append_array(coords, ids)
+        self._index_many("node", nodes)
+        self._changed()
+        return ids
+
+    def _explicit_ids(self, kind, ids, count):
+        """Valida un array de ids explícitos para un alta masiva y los registra en el asignador."""
+        ids = np.asarray(ids, dtype=np.int64).ravel()
+        if len(ids) != count:
+            raise ValueError(f"Se esperaban {count} ids y se recibieron {len(ids)}")
+        if count:
+            if ids.min() < 1:
+                raise ValueError("Los ids deben ser positivos")
+            index = self._index[kind]
+            if len(np.unique(ids)) != count or any(i in index for i in ids.tolist()):
+                raise ValueError(f"Hay ids repetidos o ya en uso ({kind})")
+            self._ids[kind].claim(int(ids.max()))
+        return ids
+
+    def _set_ids(self, kind, objs, ids):
+        """Asigna ids a los objetos de un alta masiva (explícitos o un bloque nuevo)."""
+        if ids is None:
+            start = self._ids[kind].reserve(len(objs))
+            ids = range(start, start + len(objs))
+        else:
+            ids = self._explicit_ids(kind, ids, len(objs)).tolist()
+        for o, id_ in zip(objs, ids):
+            o.id = id_
+
+    def _nodes_from_ids(self, conn):
+        """Convierte un array de ids de nodo en lista de Node (los ids negativos son relleno)."""
+        index = self._index["node"]
+        try:
+            return [index[i] if i >= 0 else None for i in conn.ravel().tolist()]
+        except KeyError as e:
+            raise ValueError(f"El nodo {e.args[0]} no existe en el modelo") from None
+
+    def _connectivity(self, conn, sizes=None):
+        conn = np.asarray(conn, dtype=np.int64)
+        if conn.ndim != 2 or (sizes is not None and conn.shape[1] not in sizes):
+            raise ValueError(f"La conectividad debe tener forma (M,k) con k en {sizes}")
+        return conn
+
+    def add_bars(self, conn, section=None, material=None, ids=None):
+        """Crea una barra por fila de `conn` ((M,2) ids de nodo). Devuelve los ids."""
+        conn = self._connectivity(conn, (2,))
+        nodes = self._nodes_from_ids(conn)
+        bars = [Bar(n1, n2, section, material) for n1, n2 in zip(nodes[0::2], nodes[1::2])]
+        self._set_ids("bar", bars, ids)
+        self._register_many("bar", bars)
+        self._changed()
+        return np.fromiter((b.id for b in bars), dtype=np.int64, count=len(bars))
+
+    def add_shells(self, conn, thickness=0.2, material=None, ids=None):
+        """
+        Crea una shell por fila de `conn` ((M,k) ids de nodo, k >= 3).
+        Las posiciones con id negativo se ignoran, de modo que un array (M,4)
+        puede mezclar cuadriláteros y triángulos rellenos con -1. Devuelve los ids.
+        """
+        conn = self._connectivity(conn)
+        width = conn.shape[1]
+        if width < 3:
+            raise ValueError("Una shell necesita al menos 3 nodos por fila")
+        nodes = self._nodes_from_ids(conn)
+        shells = [Shell([n for n in nodes[i:i + width] if n is not None], thickness, material)
+                  for i in range(0, len(nodes), width)]
+        self._set_ids("shell", shells, ids)
+        self._register_many("shell", shells)
+        self._changed()
+        return np.fromiter((s.id for s in shells), dtype=np.int64, count=len(shells))
+
+    def add_solids(self, conn, material=None, ids=None):
+        """Crea un sólido por fila de `conn` ((M,4) tetraedros o (M,8) hexaedros). Devuelve los ids."""
+        conn = self._connectivity(conn, (4, 8))
+        width = conn.shape[1]
+        nodes = self._nodes_from_ids(conn)
+        solids = [Solid(nodes[i:i + width], material) for i in range(0, len(nodes), width)]
+        self._set_ids("solid", solids, ids)
+        self._register_many("solid", solids)
+        self._changed()
+        return np.fromiter((so.id for so in solids), dtype=np.int64, count=len(solids))
+
+    def delete_object(self, obj):
+        """Elimina un objeto (y lo que depende de él). Devuelve True si estaba en el modelo."""
+        return bool(self.delete_many([obj]))
+
+    def delete_many(self, objs, cascade=True):
+        """
+        Elimina una selección completa en una sola pasada.
+        Con `cascade` también elimina lo que depende de los objetos borrados
+        (barras, shells y sólidos de un nodo, cargas y apoyos...), siguiendo
+        la conectividad inversa. Cada colección se reconstruye una sola vez y
+        se emite un único model_changed. Devuelve la lista de objetos eliminados.
+        """
+        dead = {}  # objeto -> tipo
+        stack = []
+        for obj in objs:
+            kind = self.kind_of(obj)
+            if kind is not None and obj not in dead and self._index[kind].get(obj.id) is obj:
+                dead[obj] = kind
+                stack.append(obj)
+        if cascade:
+            while stack:
+                for dep in self._dependents.get(stack.pop(), ()):
+                    if dep not in dead:
+                        dead[dep] = self.kind_of(dep)
+                        stack.append(dep)
+        if not dead:
+            return []
+        by_kind = {}
+        for obj, kind in dead.items():
+            by_kind.setdefault(kind, []).append(obj)
+        with self.batch():
+            for kind, group in by_kind.items():
+                self._unregister_many(kind, group)
+            self._changed()
+        return list(dead)
+
+    # Transformaciones geométricas (vectorizadas sobre el NodeStore)
+    def _nodes_of(self, objs):
+        """Nodos (sin repetir y en orden) de una selección de nodos y elementos."""
+        nodes = {}
+        for obj in objs:
+            kind = self.kind_of(obj)
+            if kind == "node":
+                nodes[obj] = None
+            elif kind == "bar":
+                nodes[obj.n1] = None
+                nodes[obj.n2] = None
+            elif kind in ("shell", "solid"):
+                nodes.update(dict.fromkeys(obj.nodes))
+        return [n for n in nodes if n in self.nodes]
+
+    def transform_nodes(self, nodes, matrix):
+        """
+        Aplica una matriz afín 4x4 a un conjunto de nodos en una sola operación.
+        Si la matriz es invertible el historial solo guarda la matriz; si no
+        (p. ej. una escala nula) guarda las coordenadas previas.
+        """
+        nodes = list(nodes)
+        if not nodes:
+            return
+        rows = self.nodes.rows(nodes)
+        old = self.nodes.coords[rows]
+        new = apply_affine(old, matrix)
+        self.nodes.set_rows(rows, new)
+        if abs(np.linalg.det(matrix[:3, :3])) > 1e-12:
+            self._record_op(("transform", "node", nodes, matrix))
+        else:
+            self._record_op(("coords", "node", nodes, old, new))
+        self._changed()
+
+    def move_objects(self, objs, dx, dy, dz):
+        self.transform_nodes(self._nodes_of(objs), translation_matrix(dx, dy, dz))
+
+    def rotate_objects(self, objs, cx, cy, cz, angle, axis=(0.0, 0.0, 1.0)):
+        """Gira `angle` grados alrededor de un eje (por defecto Z) que pasa por (cx, cy, cz)."""
+        self.transform_nodes(self._nodes_of(objs), rotation_matrix(angle, (cx, cy, cz), axis))
+
+    def scale_objects(self, objs, sx, sy, sz, cx=0.0, cy=0.0, cz=0.0):
+        self.transform_nodes(self._nodes_of(objs), scale_matrix(sx, sy, sz, (cx, cy, cz)))
+
+    def copy_objects(self, objs, dx, dy, dz, n=1):
+        """
+        Crea `n` copias de la selección desplazadas k·(dx, dy, dz), k = 1..n.
+        Copia los nodos y los elementos seleccionados. Devuelve los objetos creados.
+        """
+        nodes = self._nodes_of(objs)
+        if not nodes:
+            return []
+        elements = [o for o in objs if self.kind_of(o) in ("bar", "shell", "solid")]
+        base = self.nodes.coords[self.nodes.rows(nodes)]
+        step = np.array([dx, dy, dz], dtype=np.float64)
+        created = []
+        with self.batch():
+            for k in range(1, n + 1):
+                ids = self.add_nodes(base + k * step)
+                mapping = dict(zip(nodes, map(self.get_node, ids.tolist())))
+                created.extend(mapping.values())
+                for e in elements:
+                    created.append(self._copy_element(e, mapping))
+        return created
+
+    def _copy_element(self, e, mapping):
+        kind = self.kind_of(e)
+        if kind == "bar":
+            return self.add_bar(mapping[e.n1], mapping[e.n2], e.section, e.material)
+        if kind == "shell":
+            return self.add_shell([mapping[n] for n in e.nodes], e.thickness, e.material)
+        return self.add_solid([mapping[n] for n in e.nodes], e.material)
+
+    # Fusión de nodos coincidentes
+    def find_coincident_nodes(self, tol=1e-6, nodes=None):
+        """
+        Grupos de nodos a distancia <= tol (rejilla hash, coste casi lineal).
+        Devuelve un dict nodo duplicado -> nodo superviviente (el primero del
+        grupo en el NodeStore). Si se pasa `nodes`, solo se consideran esos nodos.
+        """
+        if not tol > 0:
+            raise ValueError("tol debe ser > 0")
+        nodes = list(self.nodes) if nodes is None else [n for n in nodes if n in self.nodes]
+        if len(nodes) < 2:
+            return {}
+        rows = self.nodes.rows(nodes)
+        order = np.argsort(rows, kind="stable")
+        nodes = [nodes[i] for i in order.tolist()]
+        labels = coincident_groups(self.nodes.coords[rows[order]], tol)
+        dup = np.flatnonzero(labels != np.arange(len(labels)))
+        return {nodes[i]: nodes[labels[i]] for i in dup.tolist()}
+
+    def merge_nodes(self, tol=1e-6, nodes=None):
+        """
+        Fusiona los nodos coincidentes (ver find_coincident_nodes) en una sola operación:
+        barras, shells, sólidos, cargas y apoyos pasan a referenciar al nodo
+        superviviente y los duplicados se eliminan. Los elementos que quedan con
+        nodos repetidos (p. ej. una barra de longitud nula) se eliminan también.
+        Devuelve el dict nodo eliminado -> nodo superviviente.
+        """
+        mapping = self.find_coincident_nodes(tol, nodes)
+        if not mapping:
+            return mapping
+        collapsed = []
+        with self.batch():
+            for dup in mapping:
+                for obj in list(self._dependents.get(dup, ())):
+                    kind = self.kind_of(obj)
+                    for prop in self.REFERENCES[kind]:
+                        old = getattr(obj, prop)
+                        if isinstance(old, list):
+                            new = [mapping.get(n, n) for n in old]
+                        else:
+                            new = mapping.get(old, old)
+                        if new != old:
+                            self._set_attr(kind, obj, prop, new)
+                            self._record_set(kind, obj, prop, old, new)
+                    targets = self._targets(kind, obj)
+                    if kind in ("bar", "shell", "solid") and len(set(targets)) < len(targets):
+                        collapsed.append(obj)
+            self.delete_many(collapsed + list(mapping))
+            self._changed()
+        return mapping
+
+    # Elementos duplicados
+    def find_duplicate_elements(self, kinds=("bar", "shell", "solid"), tol=None):
+        """
+        Elementos que conectan el mismo conjunto de nodos (en cualquier orden) que
+        otro anterior de su colección. La clave canónica de cada elemento es su
+        conectividad ordenada; con `tol` se usa en su lugar el grupo de nodos
+        coincidentes, de modo que también se detectan elementos superpuestos sobre
+        nodos distintos en la misma posición. Devuelve un dict duplicado -> original.
+        """
+        labels = None
+        if tol is not None:
+            labels = coincident_groups(self.nodes.coords, tol)
+        duplicates = {}
+        for kind in kinds:
+            rows = self.element_rows(kind)
+            if len(rows) < 2:
+                continue
+            if labels is not None:
+                rows = np.where(rows >= 0, labels[rows], -1)
+            # Ordenación estable por clave: en cada grupo de claves iguales el primero es el original
+            keys = np.sort(rows, axis=1)
+            order = np.lexsort(keys.T[::-1])
+            sorted_keys = keys[order]
+            same = np.all(sorted_keys[1:] == sorted_keys[:-1], axis=1)
+            starts = np.flatnonzero(np.concatenate([[True], ~same]))
+            original = order[starts][np.cumsum(np.concatenate([[True], ~same])) - 1]
+            dup = np.flatnonzero(same) + 1
+            if len(dup):
+                items = getattr(self, self.COLLECTIONS[kind])
+                duplicates.update((items[i], items[j]) for i, j in zip(order[dup].tolist(), original[dup].tolist()))
+        return duplicates
+
+    def remove_duplicate_elements(self, kinds=("bar", "shell", "solid"), tol=None):
+        """
+        Elimina los elementos duplicados (ver find_duplicate_elements) en una sola
+        operación. Sus cargas pasan al elemento que se conserva.
+        Devuelve el dict elemento eliminado -> elemento conservado.
+        """
+        duplicates = self.find_duplicate_elements(kinds, tol)
+        if not duplicates:
+            return duplicates
+        with self.batch():
+            for dup, keep in duplicates.items():
+                for obj in list(self._dependents.get(dup, ())):
+                    kind = self.kind_of(obj)
+                    for prop in self.REFERENCES[kind]:
+                        if getattr(obj, prop) is dup:
+                            self._set_attr(kind, obj, prop, keep)
+                            self._record_set(kind, obj, prop, dup, keep)
+            self.delete_many(duplicates)
+            self._changed()
+        return duplicates
+
+    # Extrusiones
+    @staticmethod
+    def _extrusion_offsets(ndivs, length, direction):
+        """Desplazamientos (ndivs,3) de cada capa: `length` repartida en `ndivs` tramos."""
+        d = np.asarray(direction, dtype=np.float64)
+        norm = np.linalg.norm(d)
+        if ndivs < 1 or length <= 0 or norm < 1e-12:
+            raise ValueError("La extrusión necesita divisiones, longitud y dirección válidas")
+        steps = np.arange(1, ndivs + 1) * (length / ndivs)
+        return steps[:, None] * (d / norm)
+
+    def extrude_node_to_bars(self, node, ndivs, length, direction):
+        """Extruye un nodo en una cadena de `ndivs` barras. Devuelve las barras creadas."""
+        offsets = self._extrusion_offsets(ndivs, length, direction)
+        with self.batch():
+            chain = np.concatenate([[node.id], self.add_nodes(np.array(node.as_tuple()) + offsets)])
+            ids = self.add_bars(np.column_stack([chain[:-1], chain[1:]]))
+        return [self.get_bar(i) for i in ids.tolist()]
+
+    def extrude_bar_to_shells(self, bar, ndivs, length, direction, thickness=0.2):
+        """Extruye una barra en una tira de `ndivs` shells de 4 nodos. Devuelve las shells."""
+        offsets = self._extrusion_offsets(ndivs, length, direction)
+        with self.batch():
+            a = np.concatenate([[bar.n1.id], self.add_nodes(np.array(bar.n1.as_tuple()) + offsets)])
+            b = np.concatenate([[bar.n2.id], self.add_nodes(np.array(bar.n2.as_tuple()) + offsets)])
+            ids = self.add_shells(np.column_stack([a[:-1], b[:-1], b[1:], a[1:]]), thickness, bar.material)
+        return [self.get_shell(i) for i in ids.tolist()]
+
+    def extrude_shell_to_solids(self, shell, ndivs, length, direction):
+        """Extruye una shell de 4 nodos en `ndivs` hexaedros. Devuelve los sólidos."""
+        if len(shell.nodes) != 4:
+            raise ValueError("Solo se pueden extruir a sólidos shells de 4 nodos")
+        offsets = self._extrusion_offsets(ndivs, length, direction)
+        base = self.nodes.coords[self.nodes.rows(shell.nodes)]
+        layers = [np.array([n.id for n in shell.nodes])]
+        with self.batch():
+            for off in offsets:
+                layers.append(self.add_nodes(base + off))
+            conn = np.array([np.concatenate([layers[k], layers[k + 1]]) for k in range(ndivs)])
+            ids = self.add_solids(conn, shell.material)
+        return [self.get_solid(i) for i in ids.tolist()]
+
+    # Métodos de consulta rápida (O(1) por índice)
+    def get(self, kind, id_):
+        return self._index[kind].get(id_)
+
     def get_node(self, id_):
-        for n in self.nodes:
-            if n.id == id_:
-                return n
-        return None
+        return self._index["node"].get(id_)
 
     def get_bar(self, id_):
-        for b in self.bars:
-            if b.id == id_:
-                return b
-        return None
+        return self._index["bar"].get(id_)
 
     def get_shell(self, id_):
-        for s in self.shells:
-            if s.id == id_:
-                return s
-        return None
+        return self._index["shell"].get(id_)
 
     def get_solid(self, id_):
-        for so in self.solids:
-            if so.id == id_:
-                return so
-        return None
+        return self._index["solid"].get(id_)
+
+    # Geometría vectorizada: resultados cacheados hasta que cambian coordenadas o conectividad
+    def _cached(self, name, key, compute):
+        entry = self._cache.get(name)
+        if entry is None or entry[0] != key:
+            result = compute()
+            for value in result.values():
+                value.flags.writeable = False  # Compartidos entre llamadas: solo lectura
+            entry = self._cache[name] = (key, result)
+        return entry[1]
+
+    def element_rows(self, kind):
+        """
+        Conectividad (M,k) de barras, shells o sólidos como filas del NodeStore,
+        en el orden de su colección. Los elementos con menos nodos se rellenan con -1
+        y una referencia a un nodo que no existe (None, p. ej. un id desconocido al
+        cargar un fichero) se marca con MISSING_ROW (-2).
+        """
+        return self._elements(kind)["rows"]
 
-    # Undo/Redo simple
+    def _elements(self, kind):
+        """Ids (M,) y conectividad en filas (M,k) de un tipo de elemento (cacheados)."""
+        def compute():
+            items = getattr(self, self.COLLECTIONS[kind])
+            missing, pad = self.MISSING_ROW, object()
+            if kind == "bar":
+                width = 2
+                nodes = [n for b in items for n in (b.n1, b.n2)]
+            else:
+                # Solo los huecos de relleno son -1; un None dentro de la lista es un nodo que falta
+                width = max((len(e.nodes) for e in items), default=3 if kind == "shell" else 4)
+                nodes = [n for e in items for n in list(e.nodes) + [pad] * (width - len(e.nodes))]
+            rows = np.fromiter((missing if n is None else -1 if n is pad else n._row for n in nodes),
+                               dtype=np.intp, count=len(nodes))
+            ids = np.fromiter((e.id for e in items), dtype=np.int64, count=len(items))
+            return {"ids": ids, "rows": rows.reshape(len(items), width)}
+        return self._cached(("rows", kind), (self._topology[kind], self.nodes.layout), compute)
+
+    def bar_geometry(self):
+        """
+        Geometría de todas las barras en una pasada: dict con "ids" (M,),
+        "lengths" (M,), "centroids" (M,3) y "axes" (M,3,3) (matrices local-global
+        con los ejes locales en columnas, como Bar.local_system). Las barras con
+        un nodo que falta (None) no fallan: sus valores son NaN (el validador las
+        informa como dangling_node).
+        """
+        def compute():
+            table = self._elements("bar")
+            rows, xyz = table["rows"], self.nodes.coords
+            ok = (rows >= 0).all(axis=1)
+            if ok.all():
+                lengths, centroids, axes = bar_geometry(xyz[rows[:, 0]], xyz[rows[:, 1]])
+            else:
+                count = len(rows)
+                lengths, centroids, axes = np.full(count, np.nan), np.full((count, 3), np.nan), \
+                    np.full((count, 3, 3), np.nan)
+                lengths[ok], centroids[ok], axes[ok] = bar_geometry(xyz[rows[ok, 0]], xyz[rows[ok, 1]])
+            return {"ids": table["ids"], "lengths": lengths, "centroids": centroids, "axes": axes}
+        return self._cached("bar_geometry", (self._topology["bar"], self.nodes.version), compute)
+
+    def shell_geometry(self):
+        """
+        Geometría de todas las shells en una pasada: dict con "ids" (M,) y las
+        magnitudes de utils.geometry.shell_geometry (normales, áreas, centroides,
+        alabeo, bases locales, longitudes de lado y proyección 2D).
+        """
+        def compute():
+            table = self._elements("shell")
+            rows = table["rows"]
+            result = shell_geometry(self.nodes.coords[rows], rows >= 0)
+            self._missing_nan(result, rows)
+            result["ids"] = table["ids"]
+            return result
+        return self._cached("shell_geometry", (self._topology["shell"], self.nodes.version), compute)
+
+    def solid_geometry(self):
+        """
+        Métricas de todos los sólidos: dict con "ids" (M,) y las magnitudes de
+        utils.geometry.solid_geometry (volúmenes, superficies, centroides, tensores
+        de inercia y ejes principales). Se calcula por grupos de topología
+        (tetraedros y hexaedros) y se devuelve en el orden de project.solids.
+        """
+        def compute():
+            table = self._elements("solid")
+            rows = table["rows"]
+            count = len(rows)
+            result = {"ids": table["ids"],
+                      "volumes": np.empty(count), "surface_areas": np.empty(count),
+                      "centroids": np.empty((count, 3)), "inertia": np.empty((count, 3, 3)),
+                      "principal_moments": np.empty((count, 3)), "principal_axes": np.empty((count, 3, 3))}
+            hexa = rows[:, -1] >= 0 if rows.shape[1] == 8 else np.zeros(count, dtype=bool)
+            for group, width in ((~hexa, 4), (hexa, 8)):
+                if group.any():
+                    for name, values in solid_geometry(self.nodes.coords[rows[group, :width]]).items():
+                        result[name][group] = values
+            self._missing_nan(result, rows)
+            return result
+        return self._cached("solid_geometry", (self._topology["solid"], self.nodes.version), compute)
+
+    def _missing_nan(self, result, rows):
+        """Pone NaN en las magnitudes de los elementos con algún nodo que falta (MISSING_ROW)."""
+        missing = (rows == self.MISSING_ROW).any(axis=1)
+        if missing.any():
+            for values in result.values():
+                if values.dtype.kind == "f":
+                    values[missing] = np.nan
+
+    # Undo/Redo por deltas: el coste depende del tamaño de la edición, no del modelo
     def undo(self):
+        if self._batch_depth:
+            raise RuntimeError("No se puede deshacer dentro de una transacción")
         if self.history:
-            state = self.history.pop()
-            self.future.append(self._snapshot())
-            self._restore(state)
-            self.model_changed.emit()
+            delta = self.history.pop()
+            self._history_bytes -= delta.nbytes
+            self.future.append(delta)
+            self.revert_delta(delta)
 
     def redo(self):
+        if self._batch_depth:
+            raise RuntimeError("No se puede rehacer dentro de una transacción")
         if self.future:
-            state = self.future.pop()
-            self.history.append(self._snapshot())
-            self._restore(state)
-            self.model_changed.emit()
+            delta = self.future.pop()
+            self.history.append(delta)
+            self._history_bytes += delta.nbytes
+            self.apply_delta(delta)
 
-    def _snapshot(self):
-        import copy
-        return (
-            copy.deepcopy(self.nodes),
-            copy.deepcopy(self.bars),
-            copy.deepcopy(self.shells),
-            copy.deepcopy(self.solids),
-            copy.deepcopy(self.materials),
-            copy.deepcopy(self.sections),
-            copy.deepcopy(self.nodal_loads),
-            copy.deepcopy(self.bar_loads),
-            copy.deepcopy(self.shell_loads),
-            copy.deepcopy(self.supports),
-            copy.deepcopy(self.load_combinations)
-        )
-
-    def _restore(self, state):
-        (
-            self.nodes, self.bars, self.shells, self.solids, self.materials, self.sections,
-            self.nodal_loads, self.bar_loads, self.shell_loads, self.supports, self.load_combinations
-        ) = state
-
-    # Guardar/Cargar (serialización simple JSON)
+    def clear_history(self):
+        self.history = []
+        self.future = []
+        self._history_bytes = 0
+
+    # Guardar/Cargar: JSON (intercambio) o binario columnar (.femb, ver model/binary_io.py)
     def save(self, filename):
-        import json
-        def default(o):
-            if hasattr(o, '__dict__'):
-                d = dict(o.__dict__)
-                # serializa nodos por id
-                if "n1" in d and hasattr(d["n1"], "id"):
-                    d["n1"] = d["n1"].id
-                if "n2" in d and hasattr(d["n2"], "id"):
-                    d["n2"] = d["n2"].id
-                if "nodes" in d:
-                    d["nodes"] = [n.id if hasattr(n, "id") else n for n in d["nodes"]]
-                if "node" in d and hasattr(d["node"], "id"):
-                    d["node"] = d["node"].id
-                if "bar" in d and hasattr(d["bar"], "id"):
-                    d["bar"] = d["bar"].id
-                if "shell" in d and hasattr(d["shell"], "id"):
-                    d["shell"] = d["shell"].id
-                if "solid" in d and hasattr(d["solid"], "id"):
-                    d["solid"] = d["solid"].id
-                return d
+        if is_binary(filename):
+            save_binary(self, filename)
+        else:
+            save_json(self, filename)
+
+    def load(self, filename, lazy=False):
+        """
+        Carga un proyecto (JSON o binario según la extensión). Con lazy=True y
+        formato binario se abre primero la geometría y el resto se crea al
+        primer acceso (ver _load_binary); en JSON se ignora.
+        """
+        # Se crean millones de objetos sin ciclos: el recolector cíclico solo añade pausas
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if is_binary(filename):
+                self._load_binary(filename, lazy)
             else:
-                return str(o)
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump({
-                "nodes": self.nodes,
-                "bars": self.bars,
-                "shells": self.shells,
-                "solids": self.solids,
-                "materials": self.materials,
-                "sections": self.sections,
-                "nodal_loads": self.nodal_loads,
-                "bar_loads": self.bar_loads,
-                "shell_loads": self.shell_loads,
-                "supports": self.supports,
-                "load_combinations": self.load_combinations
-            }, f, indent=2, default=default)
-
-    def load(self, filename):
-        import json
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        # Nota: esta carga es simplificada. Para producción, deberías tener un sistema robusto de deserialización.
-        self.nodes = [Node(**n) for n in data.get("nodes", [])]
-        self.bars = [Bar(self.get_node(b["n1"]), self.get_node(b["n2"]),
-                         b.get("section"), b.get("material")) for b in data.get("bars", [])]
-        self.shells = [Shell([self.get_node(nid) for nid in s["nodes"]],
-                             s.get("thickness", 0.2), s.get("material")) for s in data.get("shells", [])]
-        self.solids = [Solid([self.get_node(nid) for nid in so["nodes"]],
-                             so.get("material")) for so in data.get("solids", [])]
-        self.materials = [Material(**m) for m in data.get("materials", [])]
-        self.sections = [Section(**s) for s in data.get("sections", [])]
-        # Loads y supports requieren vinculación por id
-        self.nodal_loads = []
-        for l in data.get("nodal_loads", []):
-            n = self.get_node(l["node"])
-            self.nodal_loads.append(NodalLoad(n, l["fx"], l["fy"], l["fz"], l["mx"], l["my"], l["mz"], l.get("case")))
-        self.bar_loads = []
-        for l in data.get("bar_loads", []):
-            b = self.get_bar(l["bar"])
-            self.bar_loads.append(BarLoad(b, l["q1"], l["q2"], l["direction"], l["type"], l["distribution"], l.get("case")))
-        self.shell_loads = []
-        for l in data.get("shell_loads", []):
-            s = self.get_shell(l["shell"])
-            self.shell_loads.append(ShellLoad(s, l["q"], l["direction"], l["type"], l["distribution"], l.get("case")))
-        self.supports = []
-        for s in data.get("supports", []):
-            n = self.get_node(s["node"])
-            self.supports.append(Support(n, s["restraints"], s["type"]))
-        self.load_combinations = data.get("load_combinations", [])
+                self._load_json(filename)
+            self._reloaded()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _reloaded(self):
+        """Reconstruye índices e historial y avisa de que el modelo se ha sustituido por completo."""
+        self._reindex()
+        self.clear_history()
+        self.model_delta.emit(None)
+        self.entities_changed.emit(ChangeSet.everything())
         self.model_changed.emit()
 
+    # Bloque de nodos que se acumula antes de añadirlo al NodeStore al leer JSON
+    JSON_NODE_CHUNK = 65536
+    # Referencias a materiales y secciones que se resuelven al crear una entidad leída de fichero
+    LOADED_REFS = {"section": ("material",), "bar": ("section", "material"),
+                   "shell": ("material",), "solid": ("material",)}
+
+    def _load_json(self, filename):
+        """
+        Carga un proyecto JSON en streaming: cada entidad se construye según se
+        lee, sin tener el documento entero en memoria. Se conservan los ids del
+        fichero: todas las referencias se resuelven por id.
+        """
+        self.nodes = NodeStore()
+        for kind, coll in self.COLLECTIONS.items():
+            if kind != "node":
+                setattr(self, coll, [])
+            self._index[kind] = {}
+        self.load_combinations = []
+        kinds = {coll: kind for kind, coll in self.COLLECTIONS.items() if kind != "node"}
+        coords, ids = [], []
+        pending = []  # (objeto, atributo) con referencias a materiales/secciones aún no leídos
+        with open(filename, "r", encoding="utf-8") as f:
+            for key, item in iter_json(f):
+                if key == "nodes":
+                    coords.append((item["x"], item["y"], item.get("z", 0.0)))
+                    ids.append(item["id"])
+                    if len(ids) >= self.JSON_NODE_CHUNK:
+                        self._json_nodes(coords, ids)
+                    continue
+                if ids:
+                    self._json_nodes(coords, ids)
+                kind = kinds.get(key)
+                if kind is not None:
+                    obj = self._from_dict(kind, item)
+                    pending.extend((obj, attr) for attr in self._resolve_loaded(kind, obj))
+                    getattr(self, key).append(obj)
+                    self._index[kind][obj.id] = obj
+                elif key == "load_combinations":
+                    self.load_combinations.append(item)
+        if ids:
+            self._json_nodes(coords, ids)
+        for obj, attr in pending:
+            setattr(obj, attr, self._loaded_ref(attr, getattr(obj, attr)))
+
+    def _json_nodes(self, coords, ids):
+        """Añade al NodeStore el bloque de nodos leído y vacía las listas."""
+        new = self.nodes.append_array(np.array(coords, dtype=np.float64).reshape(-1, 3),
+                                      np.array(ids, dtype=np.int64))
+        self._index["node"].update(zip(ids, new))
+        coords.clear()
+        ids.clear()
+
+    def _from_dict(self, kind, d):
+        """
+        Crea una entidad a partir de su dict serializado. Nodos, barras y shells
+        referenciados se buscan por id; materiales y secciones quedan tal como
+        vienen hasta _resolve_loaded().
+        """
+        node, get = self._index["node"].get, d.get
+        if kind == "node":
+            return Node(d["x"], d["y"], get("z", 0.0), d["id"])
+        if kind == "material":
+            return Material(d["name"], d["type"], get("params"), d["id"])
+        if kind == "section":
+            return Section(d["name"], d["type"], get("params"), get("material"), d["id"])
+        if kind == "bar":
+            return Bar(node(d["n1"]), node(d["n2"]), get("section"), get("material"), d["id"])
+        if kind == "shell":
+            return Shell([node(nid) for nid in d["nodes"]], get("thickness", 0.2), get("material"), d["id"])
+        if kind == "solid":
+            return Solid([node(nid) for nid in d["nodes"]], get("material"), d["id"])
+        if kind == "nodal_load":
+            return NodalLoad(node(d["node"]), d["fx"], d["fy"], d["fz"], d["mx"], d["my"], d["mz"], get("case"), d["id"])
+        if kind == "bar_load":
+            return BarLoad(self._index["bar"].get(d["bar"]), d["q1"], d["q2"], d["direction"], d["type"],
+                           d["distribution"], get("case"), get("position", 0.5), get("magnitude", 0.0), d["id"])
+        if kind == "shell_load":
+            return ShellLoad(self._index["shell"].get(d["shell"]), d["q"], d["direction"], d["type"],
+                             d["distribution"], get("case"), d["id"])
+        if kind == "support":
+            return Support(node(d["node"]), d["restraints"], d["type"], d["id"])
+        raise ValueError(f"Tipo de entidad desconocido: {kind}")
+
+    def _resolve_loaded(self, kind, obj):
+        """Resuelve las referencias a materiales y secciones; devuelve las que siguen sin resolver."""
+        unresolved = []
+        for attr in self.LOADED_REFS.get(kind, ()):
+            value = self._loaded_ref(attr, getattr(obj, attr))
+            setattr(obj, attr, value)
+            if isinstance(value, int):
+                unresolved.append(attr)
+        return unresolved
+
+    def _load_binary(self, filename, lazy=False):
+        """
+        Carga un proyecto binario. Las coordenadas quedan mapeadas en memoria
+        (copy-on-write) como buffers del NodeStore, sin copiarse; el resto de
+        entidades se crea en bloque a partir de las columnas mapeadas.
+        Con lazy=True solo se crea la geometría (nodos y elementos): materiales,
+        secciones, cargas y apoyos quedan en colecciones perezosas (LazyList)
+        que se crean al primer acceso, igual que sus índices por id. Hasta que
+        se accede a materiales o secciones, los elementos guardan sus ids.
+        """
+        header, a = read_columns(filename)
+        self.nodes = NodeStore.from_arrays(a["node.coords"], a["node.ids"])
+        # Solo se indexa lo que resuelven las referencias siguientes; load() reindexa todo al final
+        self._index["node"] = dict(zip(a["node.ids"].tolist(), self.nodes))
+        self.load_combinations = header.get("load_combinations", [])
+        if lazy:
+            # Los elementos guardan los ids de material y sección hasta que se materializan
+            properties = lambda: self._binary_properties(header, resolve=True)
+            self._lazy("material", properties, [m["id"] for m in header["materials"]])
+            self._lazy("section", properties, [s["id"] for s in header["sections"]])
+            refs = lambda kind, ids: [None if i < 0 else i for i in ids.tolist()]
+        else:
+            self._binary_properties(header)
+            refs = self._loaded_refs
+        nodes = self._nodes_from_ids(a["bar.conn"])
+        self.bars = [Bar(n1, n2, sec, mat, id_) for n1, n2, sec, mat, id_ in zip(
+            nodes[0::2], nodes[1::2], refs("section", a["bar.section"]),
+            refs("material", a["bar.material"]), a["bar.ids"].tolist())]
+        width = a["shell.conn"].shape[1]
+        nodes = self._nodes_from_ids(a["shell.conn"])
+        self.shells = [Shell([n for n in nodes[i * width:(i + 1) * width] if n is not None], t, mat, id_)
+                       for i, (t, mat, id_) in enumerate(zip(a["shell.thickness"].tolist(),
+                                                             refs("material", a["shell.material"]),
+                                                             a["shell.ids"].tolist()))]
+        width = a["solid.conn"].shape[1]
+        nodes = self._nodes_from_ids(a["solid.conn"])
+        self.solids = [Solid([n for n in nodes[i * width:(i + 1) * width] if n is not None], mat, id_)
+                       for i, (mat, id_) in enumerate(zip(refs("material", a["solid.material"]),
+                                                          a["solid.ids"].tolist()))]
+        self._index["bar"] = dict(zip(a["bar.ids"].tolist(), self.bars))
+        self._index["shell"] = dict(zip(a["shell.ids"].tolist(), self.shells))
+        for kind, loader in (("nodal_load", self._binary_nodal_loads), ("bar_load", self._binary_bar_loads),
+                             ("shell_load", self._binary_shell_loads), ("support", self._binary_supports)):
+            if lazy:
+                self._lazy(kind, lambda loader=loader: loader(header, a), a[kind + ".ids"].tolist())
+            else:
+                setattr(self, self.COLLECTIONS[kind], loader(header, a))
+
+    def _lazy(self, kind, loader, ids):
+        """Deja la colección de un tipo pendiente de cargar, con su índice y asignador de ids."""
+        coll = self.COLLECTIONS[kind]
+        setattr(self, coll, LazyList(loader))
+        self._index[kind] = LazyDict(lambda: {o.id: o for o in getattr(self, coll)})
+        self._ids[kind] = IdAllocator(max(ids, default=0) + 1)
+
+    def _binary_properties(self, header, resolve=False):
+        """
+        Crea los materiales y secciones de un fichero binario. Con resolve=True
+        (carga perezosa) rellena sus LazyList y sustituye los ids de material y
+        sección que guardan los elementos por los objetos.
+        """
+        materials = [Material(m["name"], m["type"], m.get("params"), m["id"]) for m in header["materials"]]
+        by_id = {m.id: m for m in materials}
+        sections = [Section(s["name"], s["type"], s.get("params"), self._loaded_ref("material", s.get("material"), by_id),
+                            s["id"]) for s in header["sections"]]
+        if not resolve:
+            self.materials, self.sections = materials, sections
+            self._index["material"], self._index["section"] = by_id, {s.id: s for s in sections}
+            return
+        self.materials.fill(materials)
+        self.sections.fill(sections)
+        index = {"material": by_id, "section": {s.id: s for s in sections}}
+        for kind in ("bar", "shell", "solid"):
+            for attr in self.LOADED_REFS[kind]:
+                lookup = index[attr]
+                for e in getattr(self, self.COLLECTIONS[kind]):
+                    value = getattr(e, attr)
+                    if isinstance(value, int):
+                        setattr(e, attr, lookup.get(value, value))
+
+    def _binary_nodal_loads(self, header, a):
+        nodes = self._nodes_from_ids(a["nodal_load.node"])
+        return [NodalLoad(n, *values, case, id_) for n, values, case, id_ in zip(
+            nodes, a["nodal_load.values"].tolist(), decode(header, a, "nodal_load.case"), a["nodal_load.ids"].tolist())]
+
+    def _binary_bar_loads(self, header, a):
+        bars = self._index["bar"]
+        # Ficheros anteriores a las cargas puntuales: posición 0.5 y magnitud 0
+        point = a["bar_load.point"].tolist() if "bar_load.point" in a else [(0.5, 0.0)] * len(a["bar_load.ids"])
+        return [BarLoad(bars[b], q1, q2, *fields, *p, id_) for b, (q1, q2), *fields, p, id_ in zip(
+            a["bar_load.bar"].tolist(), a["bar_load.q"].tolist(),
+            *(decode(header, a, "bar_load." + f) for f in ("direction", "type", "distribution", "case")),
+            point, a["bar_load.ids"].tolist())]
+
+    def _binary_shell_loads(self, header, a):
+        shells = self._index["shell"]
+        return [ShellLoad(shells[s], [v for v in q if v == v], *fields, id_) for s, q, *fields, id_ in zip(
+            a["shell_load.shell"].tolist(), a["shell_load.q"].tolist(),
+            *(decode(header, a, "shell_load." + f) for f in ("direction", "type", "distribution", "case")),
+            a["shell_load.ids"].tolist())]
+
+    def _binary_supports(self, header, a):
+        nodes = self._nodes_from_ids(a["support.node"])
+        return [Support(n, r, type_, id_) for n, r, type_, id_ in zip(
+            nodes, a["support.restraints"].tolist(), decode(header, a, "support.type"), a["support.ids"].tolist())]
+
+    def materialize(self):
+        """Crea todo lo pendiente de una carga perezosa (p. ej. en un momento ocioso de la interfaz)."""
+        for coll in self.COLLECTIONS.values():
+            items = getattr(self, coll)
+            if isinstance(items, LazyList):
+                items.materialize()
+        for lazy in (self._dependents, *self._index.values()):
+            if isinstance(lazy, LazyDict):
+                lazy.materialize()
+
+    def _loaded_refs(self, kind, ids):
+        """Versión masiva de _loaded_ref para un array de ids (-1: sin referencia)."""
+        values, inverse = np.unique(np.asarray(ids), return_inverse=True)
+        objs = [None if v < 0 else self._loaded_ref(kind, v) for v in values.tolist()]
+        return [objs[i] for i in inverse.ravel().tolist()]
+
+    def _loaded_ref(self, kind, value, index=None):
+        """
+        Resuelve una referencia leída de fichero (objeto serializado o id) al
+        objeto del modelo, o al de `index` (dict id -> objeto) si se indica.
+        """
+        if isinstance(value, dict):
+            value = value.get("id")
+        if index is None:
+            index = self._index[kind]
+        return index.get(value, value) if isinstance(value, int) else value
+
     # Edición de propiedades desde el panel
     def set_property(self, element_id, prop, value):
         typ, idx = element_id
-        if typ == 'node':
-            n = self.get_node(idx)
-            if n:
-                setattr(n, prop, value)
-        elif typ == 'bar':
-            b = self.get_bar(idx)
-            if b:
-                setattr(b, prop, value)
-        elif typ == 'shell':
-            s = self.get_shell(idx)
-            if s:
-                setattr(s, prop, value)
-        elif typ == 'solid':
-            so = self.get_solid(idx)
-            if so:
-                setattr(so, prop, value)
-        # ...otros tipos...
-        self.model_changed.emit()
+        obj = self._index[typ].get(idx) if typ in self._index else None
+        if obj is not None:
+            value = self._resolve_reference(prop, value)
+            old = getattr(obj, prop, None)
+            self._set_attr(typ, obj, prop, value)
+            self._record_set(typ, obj, prop, old, value)
+        self._changed()
 
     def export_to_opensees_tcl(self, filepath, only_geometry=False, comments=True, groups=False):
         exporter = OpenSeesExporter(self)
-        exporter.export_to_tcl(filepath, only_geometry, comments, groups)
+        return exporter.export_to_tcl(filepath, only_geometry, comments, groups)
 
-    def export_to_opensees_json(self, filepath, only_geometry=False, comments=True, groups=False):
+    def export_to_opensees_json(self, filepath, only_geometry=False, comments=True, groups=False, columnar=False):
         exporter = OpenSeesExporter(self)
-        exporter.export_to_json(filepath, only_geometry, comments, groups)
\ No newline at end of file
+        return exporter.export_to_json(filepath, only_geometry, comments, groups, columnar)
+
+    def import_from_opensees_tcl(self, filepath):
+        """Importa un script TCL de OpenSees en una sola transacción. Devuelve la lista de avisos."""
+        return OpenSeesImporter(self).import_tcl(filepath)
+
+    def import_from_opensees_json(self, filepath):
+        """Importa el JSON de export_to_opensees_json en una sola transacción. Devuelve la lista de avisos."""
+        return OpenSeesImporter(self).import_json(filepath)
+
+    def import_tables(self, nodes=None, bars=None, shells=None, solids=None, delimiter=None, progress=None):
+        """
+        Importa tablas de texto delimitado de nodos y de conectividad en una sola
+        transacción (ver TableImporter). Devuelve el número de entidades creadas por tipo.
+        """
+        return TableImporter(self, progress).import_tables(nodes, bars, shells, solids, delimiter)
+
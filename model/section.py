@@ -1,18 +1,15 @@
 class Section:
-    _id_seq = 1
-
     # Tipos de sección predefinidos
     TYPES = [
         "Rectangular", "Circular", "IPE", "HEB", "Custom"
     ]
 
-    def __init__(self, name, type_, params=None, material=None):
+    def __init__(self, name, type_, params=None, material=None, id_=None):
         self.name = str(name)
         self.type = type_  # One of TYPES
         self.params = params if params is not None else {}
         self.material = material
-        self.id = Section._id_seq
-        Section._id_seq += 1
+        self.id = id_
 
     @staticmethod
     def get_section_types():
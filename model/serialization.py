@@ -0,0 +1,46 @@
+from functools import lru_cache
+
+from model.node import Node
+
+
+# Atributos que referencian a otras entidades: se guardan por id
+REFERENCE_FIELDS = ("n1", "n2", "node", "nodes", "bar", "shell", "solid")
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls):
+    """Nombres de los __slots__ de una clase y sus bases (en orden de declaración)."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend([slots] if isinstance(slots, str) else slots)
+    return tuple(n for n in names if n not in ("__dict__", "__weakref__"))
+
+
+def entity_fields(obj):
+    """Atributos de una entidad como dict, tanto si usa __slots__ como __dict__."""
+    if isinstance(obj, Node):
+        return {"x": obj.x, "y": obj.y, "z": obj.z, "id": obj.id}
+    d = {name: getattr(obj, name) for name in _slot_names(type(obj)) if hasattr(obj, name)}
+    if hasattr(obj, "__dict__"):
+        d.update(obj.__dict__)
+    return d
+
+
+def to_dict(obj):
+    """Representación serializable de una entidad, con las referencias convertidas en ids."""
+    d = entity_fields(obj)
+    for name in REFERENCE_FIELDS:
+        value = d.get(name)
+        if isinstance(value, (list, tuple)):
+            d[name] = [getattr(v, "id", v) for v in value]
+        elif hasattr(value, "id"):
+            d[name] = value.id
+    return d
+
+
+def json_default(o):
+    """Hook `default` de json.dump para entidades del modelo."""
+    if isinstance(o, Node) or hasattr(o, "__dict__") or _slot_names(type(o)):
+        return to_dict(o)
+    return str(o)
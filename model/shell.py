@@ -1,16 +1,14 @@
 import numpy as np
 
 class Shell:
-    _id_seq = 1
+    __slots__ = ("nodes", "thickness", "material", "id")
 
-    def __init__(self, nodes, thickness=0.2, material=None):
+    def __init__(self, nodes, thickness=0.2, material=None, id_=None):
         assert len(nodes) >= 3, "A shell needs at least 3 nodes"
         self.nodes = nodes  # list of Node objects
         self.thickness = thickness
         self.material = material
-        self.id = Shell._id_seq
-        Shell._id_seq += 1
-        self.selected = False
+        self.id = id_
 
     def as_tuple(self):
         return tuple(n.id for n in self.nodes)
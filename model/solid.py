@@ -1,9 +1,9 @@
 import numpy as np
 
 class Solid:
-    _id_seq = 1
+    __slots__ = ("nodes", "material", "id")
 
-    def __init__(self, nodes, material=None):
+    def __init__(self, nodes, material=None, id_=None):
         """
         nodes: list of Node objects (length 4 for tetrahedron, 8 for hexahedron)
         material: Material object or identifier
@@ -11,9 +11,7 @@ class Solid:
         assert len(nodes) in (4, 8), "Solid must have 4 (tetrahedron) or 8 (hexahedron) nodes"
         self.nodes = nodes
         self.material = material
-        self.id = Solid._id_seq
-        Solid._id_seq += 1
-        self.selected = False
+        self.id = id_
 
     def get_points(self):
         """Returns list of np.array([x, y, z]) of the nodes."""
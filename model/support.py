@@ -1,7 +1,7 @@
 class Support:
-    _id_seq = 1
+    __slots__ = ("node", "type", "restraints", "id")
 
-    def __init__(self, node, restraints=None, type_="fixed"):
+    def __init__(self, node, restraints=None, type_="fixed", id_=None):
         self.node = node  # Node object
         self.type = type_  # 'fixed', 'pinned', 'roller-x', etc.
         if restraints is None:
@@ -9,8 +9,7 @@ class Support:
             self.restraints = [True]*6 if type_ == "fixed" else [True, True, True, False, False, False]
         else:
             self.restraints = restraints
-        self.id = Support._id_seq
-        Support._id_seq += 1
+        self.id = id_
 
     def is_fixed(self):
         return all(self.restraints)
@@ -0,0 +1,99 @@
+import gc
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from core.autosave import Autosave
+from model.project import Project
+
+
+def test_recover_after_cascade_delete_and_undo(tmp_path):
+    """Deshacer un borrado en cascada reañade barras y cargas después de sus nodos."""
+    project = Project()
+    material = project.add_material("Acero", "steel")
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [2, 0, 0]]))
+    project.add_bars(np.column_stack([ids[:-1], ids[1:]]), material=material)
+    middle = project.get_node(int(ids[1]))
+    project.add_nodal_load(middle, fz=-1.0)
+    project.add_support(middle)
+
+    autosave = Autosave(project, str(tmp_path))
+    autosave.start()
+    project.delete_object(middle)
+    project.undo()
+    autosave.flush()
+    autosave.stop(discard=False)  # Cierre inesperado: quedan el punto de control y el diario
+
+    recovered = Project()
+    assert Autosave.recover(recovered, str(tmp_path)) == 2
+    assert sorted(recovered.nodes.ids.tolist()) == sorted(project.nodes.ids.tolist())
+    assert sorted((b.id, b.n1.id, b.n2.id) for b in recovered.bars) == \
+        sorted((b.id, b.n1.id, b.n2.id) for b in project.bars)
+    assert [l.node.id for l in recovered.nodal_loads] == [middle.id]
+    assert [s.node.id for s in recovered.supports] == [middle.id]
+    assert recovered.bars[0].material is recovered.materials[0]
+
+
+def test_journal_compaction_runs_in_writer_thread(tmp_path, monkeypatch):
+    """Al crecer el diario se compacta en segundo plano, sin copiar el proyecto de la interfaz."""
+    project = Project()
+    autosave = Autosave(project, str(tmp_path), max_journal_bytes=2000)
+    autosave.start()
+    snapshots, gc_calls = [], []
+    monkeypatch.setattr(autosave, "checkpoint", lambda: snapshots.append(1))
+    monkeypatch.setattr(gc, "disable", lambda: gc_calls.append(1))  # Es global al proceso
+    with project.batch():
+        ids = project.add_nodes(np.random.rand(50, 3))
+    for i in range(40):
+        project.add_bars(np.array([[ids[i], ids[i + 1]]]))
+    autosave.flush()
+    assert snapshots == []
+    assert gc_calls == []
+    assert autosave.error is None
+    assert (tmp_path / Autosave.JOURNAL).stat().st_size < 2000
+    autosave.stop(discard=False)
+
+    recovered = Project()
+    Autosave.recover(recovered, str(tmp_path))
+    assert np.array_equal(recovered.nodes.coords, project.nodes.coords)
+    assert [(b.id, b.n1.id, b.n2.id) for b in recovered.bars] == [(b.id, b.n1.id, b.n2.id) for b in project.bars]
+
+
+def test_start_keeps_unrecovered_session(tmp_path):
+    """Un autoguardado de una sesión cerrada mal no se borra hasta que se ofrece recuperarlo."""
+    project = Project()
+    autosave = Autosave(project, str(tmp_path))
+    autosave.start()
+    project.add_nodes(np.zeros((2, 3)))
+    autosave.stop(discard=False)
+    journal = (tmp_path / Autosave.JOURNAL).read_bytes()
+    assert Autosave.needs_recovery(str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        Autosave(Project(), str(tmp_path)).start()
+    assert (tmp_path / Autosave.JOURNAL).read_bytes() == journal
+
+    autosave = Autosave(Project(), str(tmp_path))
+    autosave.start(discard=True)
+    autosave.flush()
+    assert (tmp_path / Autosave.JOURNAL).stat().st_size == 0
+    autosave.stop()
+
+
+def test_start_refuses_directory_of_live_process(tmp_path):
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    try:
+        (tmp_path / Autosave.LOCK).write_text(str(other.pid))
+        (tmp_path / Autosave.JOURNAL).write_text('{"seq":1,"ops":[]}\n', encoding="utf-8")
+        assert Autosave.lock_owner(str(tmp_path)) == other.pid
+        assert not Autosave.needs_recovery(str(tmp_path))  # Esa sesión sigue viva
+        with pytest.raises(RuntimeError):
+            Autosave(Project(), str(tmp_path)).start(discard=True)
+        assert os.path.getsize(tmp_path / Autosave.JOURNAL) > 0
+    finally:
+        other.kill()
+        other.wait()
+    assert Autosave.lock_owner(str(tmp_path)) is None
@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+
+from model.project import Project
+
+
+@pytest.mark.parametrize("name", ["modelo.json", "modelo.femb"])
+def test_point_load_round_trip(tmp_path, name):
+    """La posición y la magnitud de una carga puntual se guardan y se recuperan."""
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [4, 0, 0]]))
+    project.add_bars(ids.reshape(1, 2))
+    project.add_bar_load(project.bars[0], type_="Puntual", position=0.25, magnitude=-12.5)
+    path = str(tmp_path / name)
+    project.save(path)
+
+    loaded = Project()
+    loaded.load(path)
+    load = loaded.bar_loads[0]
+    assert (load.position, load.magnitude) == (0.25, -12.5)
+    assert load.bar is loaded.bars[0]
@@ -0,0 +1,34 @@
+import numpy as np
+
+from core.commands import AddNodeCommand, DeleteCommand, MoveCommand, run_command
+from core.undo_redo_manager import UndoRedoManager
+from model.project import Project
+
+
+def test_commands_share_the_project_history():
+    """Los comandos de la interfaz quedan en Project.history: un solo historial."""
+    project = Project()
+    manager = UndoRedoManager(project)
+    node = run_command(AddNodeCommand(project, 0, 0, 0), manager)
+    run_command(MoveCommand(project, [node], 1, 0, 0), manager)
+    project.add_node(5, 5, 5)  # Edición directa, fuera de los comandos
+    assert len(project.history) == 3
+
+    manager.undo()
+    assert len(project.nodes) == 1 and manager.can_redo()
+    manager.undo()
+    assert node.x == 0
+    manager.redo()
+    assert node.x == 1
+
+
+def test_command_history_respects_memory_cap():
+    project = Project()
+    manager = UndoRedoManager(project)
+    with project.batch():
+        project.add_nodes(np.random.rand(200, 3))
+    project.history_max_bytes = 1
+    for node in list(project.nodes)[:20]:
+        run_command(DeleteCommand(project, [node]), manager)
+    assert len(project.history) == 1
+    assert project._history_bytes == project.history[0].nbytes
@@ -0,0 +1,22 @@
+import numpy as np
+
+from core.export_opensees import load_columnar_json
+from model.project import Project
+
+
+def test_columnar_json_keeps_2d_shapes(tmp_path):
+    """Las columnas de ancho fijo o declarado son (n, ancho) aunque estén vacías."""
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]))
+    project.add_shells(ids.reshape(1, 4))
+    path = str(tmp_path / "modelo.json")
+    project.export_to_opensees_json(path, columnar=True)
+
+    data = load_columnar_json(path)
+    assert data["nodes"]["xyz"].shape == (4, 3)
+    assert data["bars"]["conn"].shape == (0, 2)
+    assert data["shells"]["conn"].shape == (1, 4)
+    assert data["solids"]["conn"].ndim == 2 and len(data["solids"]["conn"]) == 0
+    assert data["supports"]["restraints"].shape == (0, 6)
+    assert data["loads"]["values"].shape == (0, 6)
+    assert "widths" not in data
@@ -0,0 +1,34 @@
+import json
+
+import numpy as np
+
+from model.project import Project
+
+
+def test_bar_with_missing_node_has_nan_geometry(tmp_path):
+    """Una barra con un nodo desconocido en el fichero no toma las coordenadas de otro nodo."""
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [1.5, 0.5, 0.5]]))
+    project.add_bars(np.column_stack([ids[:-1], ids[1:]]))
+    path = tmp_path / "modelo.json"
+    project.save(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["bars"][1]["n2"] = 999
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    loaded = Project()
+    loaded.load(str(path))
+    assert loaded.element_rows("bar")[1, 1] == Project.MISSING_ROW
+    g = loaded.bar_geometry()
+    assert g["lengths"][0] == 1.0
+    assert np.isnan(g["lengths"][1])
+    assert np.isnan(g["centroids"][1]).all() and np.isnan(g["axes"][1]).all()
+
+
+def test_shell_padding_is_not_missing():
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]))
+    project.add_shells(np.array([[ids[0], ids[1], ids[2], ids[3]], [ids[0], ids[1], ids[2], -1]]))
+    rows = project.element_rows("shell")
+    assert rows[1, 3] == -1
+    assert np.allclose(project.shell_geometry()["areas"], [1.0, 0.5])
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from model.project import Project
+
+
+def _model():
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]))
+    project.add_bars(np.column_stack([ids[:-1], ids[1:]]))
+    project.add_shells(ids.reshape(1, 4))
+    first = project.get_node(int(ids[0]))
+    project.add_support(first)
+    project.add_nodal_load(first, fz=-1.0)
+    return project
+
+
+@pytest.mark.parametrize("ext", ["tcl", "json"])
+def test_import_into_populated_project(tmp_path, ext):
+    """Los ids del fichero se traducen a ids nuevos: importar dos veces duplica el modelo."""
+    source = _model()
+    path = str(tmp_path / f"modelo.{ext}")
+    getattr(source, f"export_to_opensees_{ext}")(path)
+
+    project = _model()
+    getattr(project, f"import_from_opensees_{ext}")(path)
+
+    assert len(project.nodes) == 8
+    assert len(project.bars) == 6
+    assert len(project.shells) == 2
+    assert len(project.supports) == 2
+    imported = set(project.nodes.ids.tolist()) - set(source.nodes.ids.tolist())
+    assert len(imported) == 4
+    assert {b.n1.id for b in project.bars[3:]} <= imported
+    assert {n.id for n in project.shells[1].nodes} == imported
+    assert project.supports[1].node.id in imported
+    assert project.nodal_loads[1].node is project.supports[1].node
+
+
+def test_import_columnar_into_populated_project(tmp_path):
+    source = _model()
+    path = str(tmp_path / "modelo.json")
+    source.export_to_opensees_json(path, columnar=True)
+
+    project = _model()
+    project.import_from_opensees_json(path)
+
+    assert len(project.nodes) == 8
+    assert len(project.bars) == 6
+    assert {n.id for n in project.shells[1].nodes}.isdisjoint(n.id for n in project.shells[0].nodes)
+
+
+def test_import_unknown_node_leaves_model_untouched(tmp_path):
+    path = tmp_path / "modelo.tcl"
+    path.write_text("node 1 0 0 0\nnode 2 1 0 0\nelement truss 1 1 3 None None\n", encoding="utf-8")
+    project = _model()
+    with pytest.raises(ValueError):
+        project.import_from_opensees_tcl(str(path))
+    assert len(project.nodes) == 4
+    assert len(project.bars) == 3
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from model.project import Project
+from utils.spatial import close_pairs, coincident_groups
+
+
+def test_close_pairs_finds_neighbors_across_cells():
+    coords = np.array([[0.0, 0, 0], [0.9, 0, 0], [5, 5, 5], [5.5, 5, 5]])
+    first, second = close_pairs(coords, 1.0)
+    assert sorted(tuple(sorted(p)) for p in zip(first.tolist(), second.tolist())) == [(0, 1), (2, 3)]
+    assert coincident_groups(coords, 1.0).tolist() == [0, 0, 2, 2]
+
+
+@pytest.mark.parametrize("tol", [0, -1e-6, float("nan")])
+def test_tol_must_be_positive(tol):
+    coords = np.zeros((3, 3))
+    with pytest.raises(ValueError, match="tol debe ser > 0"):
+        close_pairs(coords, tol)
+    project = Project()
+    project.add_nodes(np.zeros((1, 3)))
+    with pytest.raises(ValueError, match="tol debe ser > 0"):
+        project.find_coincident_nodes(tol)
+    with pytest.raises(ValueError, match="tol debe ser > 0"):
+        project.merge_nodes(tol)
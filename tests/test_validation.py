@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+
+from core.validation import ModelValidator
+from model.project import Project
+
+
+def test_closed_validator_stops_listening():
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0]]))
+    validator = ModelValidator(project)
+    assert validator.run() == []
+
+    validator.close()
+    validator.close()  # Idempotente
+    project.add_bars(ids.reshape(1, 2))
+    assert validator._dirty == {}
+
+
+def test_missing_node_in_file_is_dangling(tmp_path):
+    """Un id de nodo del fichero que no existe se carga como None y se informa como referencia colgante."""
+    project = Project()
+    ids = project.add_nodes(np.array([[0.0, 0, 0], [1, 0, 0], [2, 0, 0]]))
+    project.add_bars(np.column_stack([ids[:-1], ids[1:]]))
+    project.add_bar_load(project.bars[1], q1=-1.0)
+    path = tmp_path / "modelo.json"
+    project.save(str(path))
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["bars"][1]["n2"] = 999
+    data["bar_loads"][0]["bar"] = 999
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    loaded = Project()
+    loaded.load(str(path))
+    assert loaded.bars[1].n2 is None
+    issues = ModelValidator(loaded).run()
+    assert sorted((i.code, i.obj.id) for i in issues) == [
+        ("dangling_node", loaded.bars[1].id), ("orphan_load", loaded.bar_loads[0].id)]
@@ -0,0 +1,154 @@
+import numpy as np
+
+
+# Matrices afines 4x4 para transformar coordenadas de nodos
+
+def translation_matrix(dx, dy, dz):
+    """Matriz de traslación."""
+    m = np.eye(4)
+    m[:3, 3] = (dx, dy, dz)
+    return m
+
+
+def rotation_matrix(angle, center=(0.0, 0.0, 0.0), axis=(0.0, 0.0, 1.0)):
+    """
+    Matriz de rotación de `angle` grados alrededor del eje `axis` que pasa por `center`
+    (fórmula de Rodrigues). Por defecto gira en el plano XY.
+    """
+    k = np.asarray(axis, dtype=np.float64)
+    k = k / np.linalg.norm(k)
+    t = np.radians(angle)
+    kx = np.array([[0, -k[2], k[1]],
+                   [k[2], 0, -k[0]],
+                   [-k[1], k[0], 0]])
+    r = np.eye(3) + np.sin(t) * kx + (1 - np.cos(t)) * (kx @ kx)
+    return _about_center(r, center)
+
+
+def scale_matrix(sx, sy, sz, center=(0.0, 0.0, 0.0)):
+    """Matriz de escalado respecto a `center`."""
+    return _about_center(np.diag([sx, sy, sz]).astype(np.float64), center)
+
+
+def _about_center(linear, center):
+    c = np.asarray(center, dtype=np.float64)
+    m = np.eye(4)
+    m[:3, :3] = linear
+    m[:3, 3] = c - linear @ c
+    return m
+
+
+def apply_affine(coords, matrix):
+    """Aplica una matriz afín 4x4 a un array de coordenadas (N,3)."""
+    return coords @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+
+# Kernels vectorizados de geometría de elementos
+
+def _normalize(v, tol=1e-12):
+    """Normaliza las filas de un array (M,3); las de norma casi nula se dejan igual."""
+    norm = np.sqrt(np.einsum("ij,ij->i", v, v))
+    return v / np.where(norm > tol, norm, 1.0)[:, None]
+
+
+def bar_geometry(p1, p2):
+    """
+    Geometría de M barras a partir de las coordenadas (M,3) de sus extremos.
+    Devuelve longitudes (M,), centroides (M,3) y matrices local-global (M,3,3)
+    con los ejes locales X, Y, Z en columnas, con el mismo criterio que
+    Bar.local_system (Y = X × Z global, o X × Y global si la barra es casi vertical).
+    """
+    d = p2 - p1
+    lengths = np.sqrt(np.einsum("ij,ij->i", d, d))
+    x = _normalize(d)
+    tmp = np.where((np.abs(x[:, 2]) < 0.9)[:, None], (0.0, 0.0, 1.0), (0.0, 1.0, 0.0))
+    y = _normalize(np.cross(x, tmp))
+    z = np.cross(x, y)
+    return lengths, 0.5 * (p1 + p2), np.stack([x, y, z], axis=-1)
+
+
+
+def shell_geometry(points, valid):
+    """
+    Geometría de M shells (triángulos, cuadriláteros...) a partir de un array
+    relleno de vértices (M,k,3) y su máscara de vértices válidos (M,k).
+    Devuelve un dict con:
+        "normals"       (M,3)   normal unitaria (vector área de Newell), como Shell.normal
+        "areas"         (M,)    área del polígono
+        "centroids"     (M,3)   media de los vértices, como Shell.centroid
+        "warping"       (M,)    máxima distancia de un vértice al plano medio (0 si es plana)
+        "bases"         (M,3,3) base local con u, v, n en columnas (u según el primer lado)
+        "edge_lengths"  (M,k)   longitud de cada lado (NaN en el relleno)
+        "coords2d"      (M,k,2) vértices en la base local con origen en el primero, como Shell.as_2d
+    """
+    k = valid.shape[1]
+    counts = np.maximum(valid.sum(axis=1), 1)
+    mask = valid[..., None]
+    centroids = np.where(mask, points, 0.0).sum(axis=1) / counts[:, None]
+    # Coordenadas relativas al centroide (0 en el relleno) y vértice siguiente de cada lado
+    local = np.where(mask, points - centroids[:, None, :], 0.0)
+    following = np.take_along_axis(local, ((np.arange(k) + 1) % counts[:, None])[..., None], axis=1)
+    vector_area = 0.5 * np.cross(local, following).sum(axis=1)
+    areas = np.sqrt(np.einsum("ij,ij->i", vector_area, vector_area))
+    normals = _normalize(vector_area)
+    warping = np.abs(np.einsum("mkj,mj->mk", local, normals)).max(axis=1)
+    edges = following - local
+    edge_lengths = np.where(valid, np.sqrt(np.einsum("mkj,mkj->mk", edges, edges)), np.nan)
+    # Base local: u según el primer lado (proyectado sobre el plano), v = n × u
+    u = points[:, 1] - points[:, 0]
+    u = _normalize(u - np.einsum("ij,ij->i", u, normals)[:, None] * normals)
+    v = np.cross(normals, u)
+    bases = np.stack([u, v, normals], axis=-1)
+    coords2d = np.einsum("mkj,mjc->mkc", points - points[:, :1], bases[:, :, :2])
+    coords2d[~valid] = np.nan
+    return {"normals": normals, "areas": areas, "centroids": centroids, "warping": warping,
+            "bases": bases, "edge_lengths": edge_lengths, "coords2d": coords2d}
+
+
+
+# Topologías de sólidos (mismo orden de nodos que Solid.faces y Solid.volume)
+TET_FACES = np.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+HEX_FACES = np.array([[0, 1, 2, 3], [4, 5, 6, 7], [0, 1, 5, 4],
+                      [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]])
+HEX_TETS = np.array([[0, 1, 3, 4], [1, 2, 3, 6], [1, 3, 4, 6], [4, 5, 6, 1], [3, 4, 6, 7]])
+
+
+def _tet_volumes(a, b, c, d):
+    """Volumen (sin signo) de tetraedros dados por sus vértices (..., 3)."""
+    return np.abs(np.einsum("...j,...j->...", b - a, np.cross(c - a, d - a))) / 6.0
+
+
+def _triangle_areas(a, b, c):
+    n = np.cross(b - a, c - a)
+    return 0.5 * np.sqrt(np.einsum("...j,...j->...", n, n))
+
+
+def solid_geometry(points):
+    """
+    Geometría de M sólidos de una misma topología a partir de sus vértices
+    (M,4,3) tetraedros o (M,8,3) hexaedros. Devuelve un dict con:
+        "volumes"           (M,)     tetraedro exacto; hexaedro en cinco tetraedros, como Solid.volume
+        "surface_areas"     (M,)     suma de las caras (cuadriláteros en dos triángulos)
+        "centroids"         (M,3)    media de los vértices
+        "inertia"           (M,3,3)  tensor de inercia de los vértices (masa unitaria) respecto al centroide
+        "principal_moments" (M,3)    momentos principales (ascendentes)
+        "principal_axes"    (M,3,3)  ejes principales en columnas, como Solid.principal_axes
+    """
+    if points.shape[1] == 4:
+        volumes = _tet_volumes(*(points[:, i] for i in range(4)))
+        f = points[:, TET_FACES]
+        surface_areas = _triangle_areas(f[..., 0, :], f[..., 1, :], f[..., 2, :]).sum(axis=1)
+    else:
+        t = points[:, HEX_TETS]
+        volumes = _tet_volumes(t[..., 0, :], t[..., 1, :], t[..., 2, :], t[..., 3, :]).sum(axis=1)
+        f = points[:, HEX_FACES]
+        surface_areas = (_triangle_areas(f[..., 0, :], f[..., 1, :], f[..., 2, :]) +
+                         _triangle_areas(f[..., 0, :], f[..., 3, :], f[..., 2, :])).sum(axis=1)
+    centroids = points.mean(axis=1)
+    x = points - centroids[:, None, :]
+    second = np.einsum("mki,mkj->mij", x, x)
+    inertia = np.trace(second, axis1=1, axis2=2)[:, None, None] * np.eye(3) - second
+    moments, axes = np.linalg.eigh(inertia)
+    return {"volumes": volumes, "surface_areas": surface_areas, "centroids": centroids,
+            "inertia": inertia, "principal_moments": moments, "principal_axes": axes}
@@ -0,0 +1,89 @@
+import numpy as np
+
+
+# Desplazamientos a celdas vecinas: la propia y media vecindad (13 de 26), para
+# que cada par de celdas adyacentes se visite una sola vez
+_HALF_NEIGHBORS = np.array([(0, 0, 0)] + [
+    (dx, dy, dz)
+    for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+    if (dx, dy, dz) > (0, 0, 0)
+], dtype=np.int64)
+
+
+def _cell_hash(cells):
+    """Hash entero de celdas (N,3). Las colisiones solo añaden candidatos que luego se descartan."""
+    c = cells.astype(np.uint64)
+    return (c[:, 0] * np.uint64(73856093)) ^ (c[:, 1] * np.uint64(19349663)) ^ (c[:, 2] * np.uint64(83492791))
+
+
+def close_pairs(coords, tol):
+    """
+    Pares (i, j), i != j, de puntos a distancia <= tol usando una rejilla hash de
+    lado `tol`. Coste casi lineal en el número de puntos (más el de pares hallados).
+    Devuelve dos arrays de índices (K,).
+    """
+    if not tol > 0:
+        raise ValueError("tol debe ser > 0")
+    coords = np.asarray(coords, dtype=np.float64)
+    count = len(coords)
+    empty = np.empty(0, dtype=np.intp)
+    if count < 2:
+        return empty, empty
+    cells = np.floor(coords / tol).astype(np.int64)
+    keys = _cell_hash(cells)
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    firsts, seconds = [], []
+    for offset in _HALF_NEIGHBORS:
+        target = _cell_hash(cells + offset)
+        # Buscar las claves ordenadas es mucho más rápido (acceso a memoria secuencial)
+        by_target = np.argsort(target)
+        start = np.empty(count, dtype=np.intp)
+        stop = np.empty(count, dtype=np.intp)
+        start[by_target] = np.searchsorted(sorted_keys, target[by_target], side="left")
+        stop[by_target] = np.searchsorted(sorted_keys, target[by_target], side="right")
+        sizes = stop - start
+        total = int(sizes.sum())
+        if not total:
+            continue
+        # Expande cada punto i contra todos los puntos de la celda vecina
+        i = np.repeat(np.arange(count), sizes)
+        within = np.arange(total) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        j = order[np.repeat(start, sizes) + within]
+        keep = i < j if not offset.any() else i != j
+        i, j = i[keep], j[keep]
+        d = coords[i] - coords[j]
+        close = np.einsum("ij,ij->i", d, d) <= tol * tol
+        firsts.append(i[close])
+        seconds.append(j[close])
+    if not firsts:
+        return empty, empty
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def cluster_labels(count, first, second):
+    """
+    Componentes conexas del grafo de pares (first, second) sobre `count` puntos.
+    Devuelve para cada punto el menor índice de su grupo (los aislados, el suyo).
+    """
+    labels = np.arange(count)
+    if not len(first):
+        return labels
+    while True:
+        low = np.minimum(labels[first], labels[second])
+        before = labels.copy()
+        np.minimum.at(labels, first, low)
+        np.minimum.at(labels, second, low)
+        labels = labels[labels]  # Salto de punteros: acorta las cadenas
+        if np.array_equal(labels, before):
+            return labels
+
+
+def coincident_groups(coords, tol):
+    """
+    Agrupa puntos coincidentes: dos puntos están en el mismo grupo si están a
+    distancia <= tol, directamente o a través de otros (enlace simple).
+    Devuelve, para cada punto, el índice del representante de su grupo (el menor).
+    """
+    first, second = close_pairs(coords, tol)
+    return cluster_labels(len(coords), first, second)